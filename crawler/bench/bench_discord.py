@@ -0,0 +1,100 @@
+import argparse
+import http.server
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 실행: python ./bench/bench_discord.py [--posts 30] [--bucket 5] [--reset 1.0]
+
+# nexon_crawler의 config 모듈과 프로젝트 루트를 파이썬 경로에 추가
+CRAWLER_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(CRAWLER_DIR / "nexon_crawler"))
+sys.path.append(str(CRAWLER_DIR.parent))
+
+from crawler.nexon_crawler.utils.discord_dispatcher import DiscordDispatcher
+
+
+class _FakeWebhook(http.server.BaseHTTPRequestHandler):
+    """디스코드 웹훅 흉내: 고정 크기 버킷을 쓰고, 버킷이 비면 429와 Retry-After를 돌려줍니다."""
+
+    bucket = 5
+    reset_after = 1.0
+    lock = threading.Lock()
+    remaining = bucket
+    reset_at = 0.0
+    requests = 0
+    embeds = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        cls = type(self)
+        with cls.lock:
+            now = time.monotonic()
+            if now >= cls.reset_at:
+                cls.remaining, cls.reset_at = cls.bucket, now + cls.reset_after
+            cls.requests += 1
+            if cls.remaining == 0:
+                retry_after = cls.reset_at - now
+                self.send_response(429)
+                self.send_header("Retry-After", f"{retry_after:.3f}")
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(json.dumps({"retry_after": retry_after}).encode())
+                return
+            cls.remaining -= 1
+            cls.embeds += body.count(b'"title"')
+            remaining, reset_after = cls.remaining, cls.reset_at - now
+        self.send_response(204)
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Reset-After", f"{reset_after:.3f}")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run(url: str, posts: int, image: Path, batch_window: float, digest_threshold: int) -> None:
+    _FakeWebhook.requests = _FakeWebhook.embeds = 0
+    started = time.perf_counter()
+    with DiscordDispatcher(url, batch_window=batch_window, digest_threshold=digest_threshold) as dispatcher:
+        for i in range(posts):
+            post = {"id": str(i), "title": f"테스트 글 {i}", "content": "본문 " * 30}
+            dispatcher.submit(post, f"https://example.com/{i}", "공지사항", str(image))
+        dispatcher.flush()
+        stats = dict(dispatcher.stats)
+    elapsed = time.perf_counter() - started
+    print(f"window={batch_window:<4} digest>={digest_threshold:<4}: {elapsed:6.2f}s  "
+          f"server requests={_FakeWebhook.requests:<4} 429={stats['rate_limited']:<3} "
+          f"delivered={stats['delivered']}/{stats['submitted']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="디스코드 발송기 벤치마크 (로컬 가짜 웹훅)")
+    parser.add_argument("--posts", type=int, default=30)
+    parser.add_argument("--bucket", type=int, default=5, help="리셋 주기마다 허용하는 요청 수")
+    parser.add_argument("--reset", type=float, default=1.0, help="버킷 리셋 주기 (초)")
+    args = parser.parse_args()
+
+    _FakeWebhook.bucket, _FakeWebhook.reset_after = args.bucket, args.reset
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _FakeWebhook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/webhook"
+    print(f"{args.posts} posts, bucket {args.bucket} per {args.reset}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        image = Path(tmp) / "shot.png"
+        image.write_bytes(b"\x89PNG" + b"\0" * 64 * 1024)
+        try:
+            # 묶지 않으면 글마다 요청 하나 (기존 DiscordNotifier와 같은 요청 수)
+            run(url, args.posts, image, batch_window=0, digest_threshold=args.posts + 1)
+            run(url, args.posts, image, batch_window=0.5, digest_threshold=args.posts + 1)
+            run(url, args.posts, image, batch_window=0.5, digest_threshold=15)
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import functools
+import http.server
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 실행: python ./bench/bench_fetch.py [--fixture ../debug_first_page.html] [--pages 50] [--selenium]
+
+# dc_crawler의 config 모듈과 프로젝트 루트를 파이썬 경로에 추가
+CRAWLER_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(CRAWLER_DIR / "dc_crawler"))
+sys.path.append(str(CRAWLER_DIR.parent))
+
+from crawler.dc_crawler.fetcher import Fetcher, FixtureFetcher, HostRateLimiter, HttpFetcher, SeleniumFetcher
+
+DEFAULT_FIXTURE = CRAWLER_DIR.parent / "debug_first_page.html"
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixture_dir(directory: Path) -> http.server.ThreadingHTTPServer:
+    """픽스처 디렉토리를 로컬 HTTP 서버로 띄웁니다 (실제 사이트 대신 사용)."""
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(fetcher: Fetcher, url: str, pages: int) -> None:
+    total_bytes = 0
+    started = time.perf_counter()
+    for _ in range(pages):
+        total_bytes += len(fetcher.fetch(url) or "")
+    elapsed = time.perf_counter() - started
+    fetcher.close()
+    print(f"{fetcher.name:>10}: {pages / elapsed:8.1f} pages/s  {elapsed / pages * 1000:7.2f} ms/page  {total_bytes / pages / 1024:.0f} KiB/page")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="DC 페치 백엔드 벤치마크")
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--selenium", action="store_true", help="크롬 백엔드도 측정합니다 (느림)")
+    args = parser.parse_args()
+
+    fixture = args.fixture.resolve()
+    server = serve_fixture_dir(fixture.parent)
+    url = f"http://127.0.0.1:{server.server_address[1]}/{fixture.name}"
+    print(f"fixture: {fixture} ({os.path.getsize(fixture) / 1024:.0f} KiB), {args.pages} pages")
+
+    try:
+        run(FixtureFetcher(fixture), url, args.pages)
+        run(HttpFetcher(rate_limiter=HostRateLimiter(min_interval=0)), url, args.pages)
+        if args.selenium:
+            run(SeleniumFetcher(), url, args.pages)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# 실행: python ./bench/bench_parse.py [--fixture ../debug_first_page.html ...] [--repeat 20]
+
+# 프로젝트 루트를 파이썬 경로에 추가
+CRAWLER_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(CRAWLER_DIR.parent))
+
+from crawler.common.html_parser import available_backends, parse_html
+
+DEFAULT_FIXTURES = [CRAWLER_DIR.parent / "debug_first_page.html"] + sorted((CRAWLER_DIR / "nexon_crawler" / "debug").glob("debug_*_page.html"))
+
+
+def run_selectors(doc) -> int:
+    """크롤러가 실제로 쓰는 셀렉터들을 실행하고 찾은 행 수를 반환합니다."""
+    rows = 0
+    # DC 갤러리 목록
+    for article in doc.select("tr.ub-content"):
+        title_link = article.select_one("td.gall_tit a")
+        gall_num = article.select_one("td.gall_num")
+        subject = article.select_one("td.gall_subject")
+        date_td = article.select_one("td.gall_date")
+        if title_link and gall_num and subject and date_td:
+            title_link.text, gall_num.text, subject.text, date_td.get("title", "")
+            rows += 1
+    # 넥슨 게시판 목록
+    list_area = doc.select_one(".list_area[data-mm-boardlist]")
+    if list_area:
+        for item in list_area.select("li.item[data-mm-listitem]"):
+            title = item.select_one(".title span")
+            date = item.select_one(".date span")
+            if title and date:
+                item.get("data-threadid"), title.text, date.text
+                rows += 1
+    return rows
+
+
+def bench_backend(backend: str, fixtures: List[Path], repeat: int) -> dict:
+    pages = [fixture.read_text(encoding="utf-8") for fixture in fixtures]
+    rows = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            rows += run_selectors(parse_html(html, backend))
+    elapsed = time.perf_counter() - started
+    parsed = repeat * len(pages)
+    return {
+        "backend": backend,
+        "pages_per_sec": parsed / elapsed,
+        "ms_per_page": elapsed / parsed * 1000,
+        "rows_per_page": rows / parsed,
+        # 리눅스에서 ru_maxrss 단위는 KiB
+        "peak_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTML 파서 백엔드 벤치마크")
+    parser.add_argument("--fixture", type=Path, action="append", help="벤치마크할 HTML 파일 (여러 번 지정 가능)")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--backend", help="지정한 백엔드 하나만 현재 프로세스에서 측정합니다 (내부용)")
+    args = parser.parse_args()
+    fixtures = [fixture.resolve() for fixture in (args.fixture or DEFAULT_FIXTURES)]
+
+    if args.backend:
+        print(json.dumps(bench_backend(args.backend, fixtures, args.repeat)))
+        return
+
+    print(f"fixtures: {', '.join(fixture.name for fixture in fixtures)} x {args.repeat}")
+    print(f"{'backend':>12} {'pages/s':>9} {'ms/page':>9} {'rows/page':>10} {'peak RSS':>10}")
+    # 백엔드마다 별도 프로세스에서 실행해야 peak RSS가 서로 섞이지 않습니다.
+    for backend in available_backends():
+        command = [sys.executable, __file__, "--backend", backend, "--repeat", str(args.repeat)]
+        for fixture in fixtures:
+            command += ["--fixture", str(fixture)]
+        result = json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout)
+        print(f"{result['backend']:>12} {result['pages_per_sec']:9.1f} {result['ms_per_page']:9.2f} "
+              f"{result['rows_per_page']:10.1f} {result['peak_rss_mib']:8.1f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+크롤러 공통 유틸리티 패키지
+"""
@@ -0,0 +1,87 @@
+from bs4 import BeautifulSoup
+from typing import Any, List, Optional, Union
+import importlib.util
+
+# 사용 가능한 파서 백엔드 (빠른 순서)
+#   selectolax: lexbor 기반 C 파서, bs4와 같은 select/select_one 호출을 어댑터로 제공
+#   lxml: bs4 + lxml 트리 빌더
+#   html.parser: bs4 기본 순수 파이썬 파서 (의존성 없음)
+PARSER_BACKENDS = ("selectolax", "lxml", "html.parser")
+
+
+def available_backends() -> List[str]:
+    """현재 환경에 설치된 파서 백엔드 목록을 반환합니다."""
+    return [
+        backend for backend in PARSER_BACKENDS
+        if backend == "html.parser" or importlib.util.find_spec(backend) is not None
+    ]
+
+
+def resolve_backend(backend: str = "auto") -> str:
+    """'auto'면 설치된 백엔드 중 가장 빠른 것을 고릅니다."""
+    if backend == "auto":
+        return available_backends()[0]
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"알 수 없는 파서 백엔드: {backend} (가능: {', '.join(PARSER_BACKENDS)})")
+    return backend
+
+
+class LexborNode:
+    """selectolax 노드를 크롤러가 쓰는 BeautifulSoup Tag 호출 형태로 감싼 어댑터"""
+    __slots__ = ("_node",)
+
+    def __init__(self, node: Any):
+        self._node = node
+
+    def select(self, selector: str) -> List["LexborNode"]:
+        return [LexborNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional["LexborNode"]:
+        node = self._node.css_first(selector)
+        return LexborNode(node) if node is not None else None
+
+    def get(self, attr: str, default: Any = None) -> Any:
+        value = self._node.attributes.get(attr, default)
+        return default if value is None else value
+
+    def __getitem__(self, attr: str) -> str:
+        value = self._node.attributes.get(attr)
+        if value is None:
+            raise KeyError(attr)
+        return value
+
+    @property
+    def text(self) -> str:
+        return self._node.text(deep=True)
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    def decompose(self) -> None:
+        self._node.decompose()
+
+    def prettify(self) -> str:
+        # lexbor에는 들여쓰기 출력이 없으므로 원본 HTML을 그대로 돌려줍니다.
+        return self._node.html or ""
+
+
+# parse_html이 돌려주는 문서 타입
+Document = Union[BeautifulSoup, LexborNode]
+
+
+def parse_html(html: str, backend: str = "auto") -> Document:
+    """
+    HTML을 파싱해서 select/select_one/get/text를 지원하는 문서 객체를 반환합니다.
+
+    Args:
+        html: 파싱할 HTML 문자열
+        backend: "auto", "selectolax", "lxml", "html.parser" 중 하나
+
+    Returns:
+        Document: BeautifulSoup 객체 또는 LexborNode
+    """
+    backend = resolve_backend(backend)
+    if backend == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        return LexborNode(LexborHTMLParser(html).root)
+    return BeautifulSoup(html, backend)
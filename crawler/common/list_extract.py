@@ -0,0 +1,105 @@
+import re
+from typing import List, NamedTuple, Optional, Pattern
+
+from crawler.common.html_parser import parse_html
+
+# 목록 컨테이너 시작 태그
+#   DC: <table class="gall_list">
+#   넥슨: <div class="list_area ..." data-mm-boardlist ...>
+DC_LIST_PATTERN: Pattern = re.compile(r'<(table)\b[^>]*\bclass="gall_list[" ][^>]*>')
+NEXON_LIST_PATTERN: Pattern = re.compile(
+    r'<(\w+)\b(?=[^>]*\bclass="[^"]*\blist_area\b)(?=[^>]*\bdata-mm-boardlist\b)[^>]*>'
+)
+THREAD_ID_PATTERN: Pattern = re.compile(r'\bdata-threadid="(\d+)"')
+
+
+class ListRow(NamedTuple):
+    """목록 페이지의 한 행 (전체 DOM 대신 필요한 값만 보관)"""
+    id: str
+    title: str
+    subject: str
+    date: str
+    href: Optional[str]
+
+
+def slice_element(html: str, start_pattern: Pattern) -> Optional[str]:
+    """
+    시작 태그 패턴과 짝이 맞는 닫는 태그까지의 HTML 조각만 잘라냅니다.
+
+    전체 페이지를 파싱하지 않고 문자열을 한 번 훑어서 같은 이름의 태그 깊이만 셉니다.
+    컨테이너를 찾지 못하면 None을 반환합니다.
+    """
+    match = start_pattern.search(html)
+    if not match:
+        return None
+    tag = match.group(1)
+    depth = 1
+    for tag_match in re.compile(rf'<(/?){tag}\b[^>]*>', re.IGNORECASE).finditer(html, match.end()):
+        depth += -1 if tag_match.group(1) else 1
+        if depth == 0:
+            return html[match.start():tag_match.end()]
+    # 닫는 태그가 없으면 (잘린 응답 등) 끝까지 사용합니다.
+    return html[match.start():]
+
+
+def _text(node) -> str:
+    return node.text.strip() if node else ""
+
+
+def extract_dc_rows(html: str, backend: str = "auto") -> Optional[List[ListRow]]:
+    """DC 갤러리 목록에서 tr.ub-content 행만 뽑아 ListRow로 반환합니다."""
+    fragment = slice_element(html, DC_LIST_PATTERN)
+    if fragment is None:
+        return None
+    rows = []
+    for article in parse_html(fragment, backend).select("tr.ub-content"):
+        title_link = article.select_one("td.gall_tit a")
+        if not title_link:
+            continue
+        # 제목에서 아이콘 제거
+        icon = title_link.select_one("em.icon_img")
+        if icon:
+            icon.decompose()
+        subject_td = article.select_one("td.gall_subject")
+        subject = subject_td.select_one("b") if subject_td else None
+        date_td = article.select_one("td.gall_date")
+        rows.append(ListRow(
+            id=_text(article.select_one("td.gall_num")),
+            title=_text(title_link),
+            subject=_text(subject or subject_td),
+            date=date_td.get("title", "") if date_td else "",
+            href=title_link.get("href"),
+        ))
+    return rows
+
+
+def extract_nexon_rows(html: str, backend: str = "auto") -> Optional[List[ListRow]]:
+    """
+    넥슨 게시판 목록에서 li.item 행만 뽑아 ListRow로 반환합니다.
+
+    Returns:
+        목록 영역이 없으면 None, 목록이 비어 있으면 빈 리스트
+    """
+    fragment = slice_element(html, NEXON_LIST_PATTERN)
+    if fragment is None:
+        return None
+    list_area = parse_html(fragment, backend)
+    if list_area.select_one(".list_empty"):
+        return []
+    rows = []
+    for item in list_area.select("li.item[data-mm-listitem]"):
+        link = item.select_one("a[href]")
+        rows.append(ListRow(
+            id=item.get("data-threadid") or "",
+            title=_text(item.select_one(".title span")),
+            subject=_text(item.select_one(".type span")),
+            date=_text(item.select_one(".date span")),
+            href=link.get("href") if link else None,
+        ))
+    return rows
+
+
+def scan_thread_ids(html: str) -> List[int]:
+    """넥슨 목록 컨테이너에서 data-threadid 값만 정규식으로 추출합니다 (변경 감지용)."""
+    fragment = slice_element(html, NEXON_LIST_PATTERN)
+    return [int(thread_id) for thread_id in THREAD_ID_PATTERN.findall(fragment or "")]
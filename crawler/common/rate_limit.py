@@ -0,0 +1,233 @@
+import math
+import random
+import threading
+import time
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# 응답 분류
+OK = "ok"
+THROTTLED = "throttled"  # 429/503: 너무 빠르다는 명시적 신호
+BLOCKED = "blocked"      # 403 또는 봇 체크/차단 페이지
+ERROR = "error"          # 연결 오류, 그 밖의 5xx
+
+THROTTLE_STATUS_CODES = (429, 503)
+BLOCK_STATUS_CODES = (403,)
+
+# 봇 체크/차단 페이지에서 볼 수 있는 문구들
+BLOCK_PAGE_MARKERS = (
+    "정상적인 접근이 아닙니다",
+    "자동입력 방지",
+    "kcaptcha",
+    "g-recaptcha",
+    "cf-browser-verification",
+    "challenge-platform",
+    "Just a moment...",
+)
+
+
+def classify_response(status_code: int, html: str = "") -> str:
+    """상태 코드와 본문으로 응답을 OK/THROTTLED/BLOCKED/ERROR 중 하나로 분류합니다."""
+    if status_code in THROTTLE_STATUS_CODES:
+        return THROTTLED
+    if status_code in BLOCK_STATUS_CODES:
+        return BLOCKED
+    if status_code >= 500:
+        return ERROR
+    # 정상 페이지는 충분히 길기 때문에 앞부분만 검사합니다.
+    head = html[:20000]
+    if any(marker in head for marker in BLOCK_PAGE_MARKERS):
+        return BLOCKED
+    return OK
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 단위)를 읽습니다. 없거나 날짜 형식이면 None"""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+class BlockedResponse(Exception):
+    """요청 제한(429/503)이나 차단 페이지 응답을 받았을 때 발생합니다."""
+
+    def __init__(self, message: str, outcome: str = BLOCKED):
+        super().__init__(message)
+        self.outcome = outcome
+
+
+class CircuitOpenError(Exception):
+    """호스트의 회로 차단기가 열려 있어 요청을 보내지 않을 때 발생합니다."""
+
+
+class DeadlineExceeded(Exception):
+    """크롤링 시간 예산 안에 요청을 보낼 수 없을 때 발생합니다."""
+
+
+class _HostState:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.latency: Optional[float] = None   # 응답 시간 지수 이동 평균
+        self.baseline: Optional[float] = None  # 평소 응답 시간 (천천히 따라가는 최솟값)
+        self.last_decrease = 0.0
+        self.failures = 0
+        self.open_until = 0.0
+        # 회로가 열린 뒤 시험 요청을 보낸 경우 그 결과를 기다리는 시한 (이때까지 record()가 없으면 다른 요청을 시험으로 보냄)
+        self.probe_until = 0.0
+
+
+class AdaptiveHostLimiter:
+    """
+    호스트별 토큰 버킷 리미터 (여러 스레드/크롤러가 공유).
+
+    요청 속도는 AIMD로 조절합니다.
+    - 정상 응답이고 응답 시간이 평소의 latency_factor배 이내면 초당 additive_step만큼 올립니다.
+    - 429/503, 차단 페이지, 또는 응답 시간이 눈에 띄게 늘어나면 decrease_factor배로 줄입니다.
+      Retry-After가 있으면 그 시간 동안 해당 호스트 요청을 멈춥니다.
+    연속 실패가 breaker_threshold번이면 breaker_cooldown초 동안 회로를 열어 요청을 막고,
+    그 뒤 요청 하나만 시험 삼아 보내서 성공하면 다시 닫습니다.
+    """
+
+    def __init__(self, initial_rate: float = 1.0, min_rate: float = 0.2, max_rate: float = 5.0,
+                 burst: float = 1.0, additive_step: float = 0.1, decrease_factor: float = 0.5,
+                 latency_factor: float = 2.0, breaker_threshold: int = 5, breaker_cooldown: float = 60.0):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, initial_rate)
+        self.burst = burst
+        self.additive_step = additive_step
+        self.decrease_factor = decrease_factor
+        self.latency_factor = latency_factor
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, host: str) -> _HostState:
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(self.initial_rate, self.burst)
+        return self._hosts[host]
+
+    def rate(self, url: str) -> float:
+        """현재 허용하는 초당 요청 수"""
+        with self._lock:
+            return self._state(urlsplit(url).netloc).rate
+
+    def acquire(self, url: str, deadline: Optional[float] = None) -> None:
+        """
+        요청을 보낼 차례가 될 때까지 기다립니다.
+
+        Raises:
+            CircuitOpenError: 회로가 열려 있을 때
+            DeadlineExceeded: 차례가 deadline(time.monotonic 기준) 이후일 때 (슬롯을 예약하지 않음)
+        """
+        host = urlsplit(url).netloc
+        # 슬롯만 잠금 안에서 예약하고, 대기는 잠금 밖에서 합니다.
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            if now < state.open_until:
+                raise CircuitOpenError(f"{host} 회로 차단 중 ({state.open_until - now:.0f}초 남음)")
+            # 쿨다운이 끝났으면 요청 하나만 통과시켜 회복 여부를 봅니다.
+            probing = state.failures >= self.breaker_threshold
+            if probing and now < state.probe_until:
+                raise CircuitOpenError(f"{host} 회로 시험 요청 진행 중")
+
+            if math.isinf(state.rate):
+                slot = now
+            else:
+                state.tokens = min(self.burst, state.tokens + (now - state.updated) * state.rate)
+                state.updated = now
+                slot = max(now + max(0.0, (1 - state.tokens) / state.rate), state.paused_until)
+            # 시간 예산을 넘으면 시험 요청 자리도 토큰도 차지하지 않고 포기합니다.
+            if deadline is not None and slot > deadline:
+                raise DeadlineExceeded(f"{host} 요청 차례({slot - now:.1f}초 후)가 시간 예산을 넘습니다")
+            if probing:
+                # 시험 요청이 결과를 기록하지 않고 사라져도 쿨다운이 지나면 다음 요청이 다시 시험합니다.
+                state.probe_until = slot + self.breaker_cooldown
+            if not math.isinf(state.rate):
+                state.tokens -= 1
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record(self, url: str, outcome: str, latency: Optional[float] = None,
+               retry_after: Optional[float] = None) -> None:
+        """응답 결과를 반영해서 속도와 회로 상태를 조절합니다."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            state.probe_until = 0.0
+
+            if outcome == OK:
+                if state.failures >= self.breaker_threshold:
+                    logger.info(f"{host} 회로 복구")
+                state.failures = 0
+                if latency is not None and self._latency_degraded(state, latency):
+                    self._decrease(state, host, now, f"응답 시간 증가 ({state.latency:.2f}초, 평소 {state.baseline:.2f}초)")
+                elif not math.isinf(state.rate):
+                    state.rate = min(self.max_rate, state.rate + self.additive_step)
+                return
+
+            if outcome in (THROTTLED, BLOCKED):
+                self._decrease(state, host, now, "요청 제한" if outcome == THROTTLED else "차단 페이지", force=True)
+                pause = retry_after if retry_after is not None else 1 / state.rate
+                state.paused_until = max(state.paused_until, now + pause)
+
+            state.failures += 1
+            if state.failures >= self.breaker_threshold:
+                state.open_until = now + self.breaker_cooldown
+                logger.warning(f"{host} 연속 실패 {state.failures}회, {self.breaker_cooldown:.0f}초 동안 회로 차단")
+
+    def _latency_degraded(self, state: _HostState, latency: float) -> bool:
+        state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+        if state.baseline is None or state.latency < state.baseline:
+            state.baseline = state.latency
+        else:
+            # 서버 쪽 평소 응답 시간이 바뀌는 것을 천천히 따라갑니다.
+            state.baseline += 0.01 * (state.latency - state.baseline)
+        return state.latency > state.baseline * self.latency_factor
+
+    def _decrease(self, state: _HostState, host: str, now: float, reason: str, force: bool = False) -> None:
+        # 응답 시간 신호는 한 번 줄인 뒤 현재 간격만큼은 다시 줄이지 않습니다 (연속 감소로 바닥까지 떨어지는 것 방지).
+        rate = self.initial_rate if math.isinf(state.rate) else state.rate
+        if not force and now - state.last_decrease < 1 / rate:
+            return
+        state.rate = max(self.min_rate, rate * self.decrease_factor)
+        state.last_decrease = now
+        logger.warning(f"{host} {reason} → 초당 {state.rate:.2f}회로 감속")
+
+
+class RetryPolicy:
+    """지수 백오프(full jitter)와 크롤링 단위 시간 예산을 가진 재시도 정책"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 budget: float = 300.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def deadline(self) -> float:
+        """지금부터 시간 예산이 끝나는 시각 (time.monotonic 기준)"""
+        return time.monotonic() + self.budget
+
+    def next_delay(self, attempt: int, deadline: Optional[float] = None) -> Optional[float]:
+        """
+        attempt번째(0부터) 시도가 실패한 뒤 기다릴 시간을 반환합니다.
+
+        더 시도할 수 없거나 기다리면 시간 예산을 넘으면 None
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if deadline is not None and time.monotonic() + delay > deadline:
+            return None
+        return delay
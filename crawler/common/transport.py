@@ -0,0 +1,254 @@
+import http.client
+import logging
+import threading
+from collections import deque
+from datetime import timedelta
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Deque, Dict, Iterable, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
+
+try:  # httpx[http2]가 있으면 지정한 호스트는 HTTP/2로 보냅니다
+    import httpx
+    import h2  # noqa: F401
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+if httpx is not None:
+    # 요청마다 남기는 httpx 로그는 끕니다 (시간 기록은 timing_stats로 봅니다).
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+def http2_available() -> bool:
+    return httpx is not None
+
+
+class RequestTiming(NamedTuple):
+    """요청 하나의 구간별 시간 (초)"""
+    connect: float   # DNS 조회 + TCP 연결 + TLS 핸드셰이크 (연결을 재사용하면 0)
+    ttfb: float      # 요청 시작부터 응답 헤더 수신까지 (connect 포함)
+    download: float  # 응답 헤더 이후 본문 수신까지
+    total: float
+    reused: bool
+    http_version: str
+
+
+class TimingStats:
+    """호스트별 최근 요청 시간 기록 (여러 세션/스레드가 공유)"""
+
+    def __init__(self, samples: int = 500):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._timings: Dict[str, Deque[RequestTiming]] = {}
+
+    def record(self, url: str, timing: RequestTiming) -> None:
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._timings.setdefault(host, deque(maxlen=self.samples)).append(timing)
+
+    def summary(self) -> Dict[str, Dict]:
+        with self._lock:
+            timings = {host: list(values) for host, values in self._timings.items()}
+        result = {}
+        for host, values in timings.items():
+            count = len(values)
+            ttfb = sorted(timing.ttfb for timing in values)
+            result[host] = {
+                "count": count,
+                "reused": sum(timing.reused for timing in values),
+                "http_versions": sorted({timing.http_version for timing in values}),
+                "connect_avg": round(sum(timing.connect for timing in values if not timing.reused)
+                                     / max(1, sum(not timing.reused for timing in values)), 3),
+                "ttfb_p50": round(ttfb[count // 2], 3),
+                "ttfb_p95": round(ttfb[min(count - 1, int(count * 0.95))], 3),
+                "download_avg": round(sum(timing.download for timing in values) / count, 3),
+            }
+        return result
+
+    def log(self) -> None:
+        for host, stats in self.summary().items():
+            logger.info(
+                f"{host}: 요청 {stats['count']}회 (연결 재사용 {stats['reused']}회, {'/'.join(stats['http_versions'])}), "
+                f"연결 평균 {stats['connect_avg']:.3f}초, TTFB p50 {stats['ttfb_p50']:.3f}초 / p95 {stats['ttfb_p95']:.3f}초, "
+                f"본문 평균 {stats['download_avg']:.3f}초"
+            )
+
+
+timing_stats = TimingStats()
+
+# 새 연결을 맺는 데 걸린 시간 (요청을 보내는 스레드별로 기록)
+_local = threading.local()
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = perf_counter()
+        super().connect()
+        _local.connect = getattr(_local, "connect", 0.0) + perf_counter() - started
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        started = perf_counter()
+        super().connect()
+        _local.connect = getattr(_local, "connect", 0.0) + perf_counter() - started
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """
+    HTTP/1.1 keep-alive 어댑터.
+
+    연결 풀 크기를 크롤러 동시성에 맞추고, timeout을 주지 않은 요청에는 기본 (연결, 읽기) 타임아웃을 씁니다.
+    응답마다 연결/TTFB/본문 시간을 response.timing에 붙이고 timing_stats에 기록합니다.
+    """
+
+    def __init__(self, pool_maxsize: int, timeout: Timeout, stats: TimingStats = timing_stats):
+        self.timeout = timeout
+        self.stats = stats
+        # 재시도는 호출하는 쪽의 RetryPolicy가 맡습니다.
+        super().__init__(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        _local.connect = 0.0
+        started = perf_counter()
+        response = super().send(request, stream=stream, timeout=timeout or self.timeout, **kwargs)
+        ttfb = perf_counter() - started
+        if not stream:
+            response.content
+        total = perf_counter() - started
+        connect = _local.connect
+        response.timing = RequestTiming(connect, ttfb, total - ttfb, total, connect == 0.0, "HTTP/1.1")
+        self.stats.record(request.url, response.timing)
+        return response
+
+
+_HOP_BY_HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}
+
+
+class Http2Adapter(BaseAdapter):
+    """
+    httpx로 HTTP/2 요청을 보내는 requests 어댑터.
+
+    한 호스트로 가는 동시 요청을 연결 하나에 다중화합니다. 응답은 requests.Response로 바꿔서 돌려주므로
+    호출하는 쪽 코드(상태 코드, 헤더, 쿠키, 예외 처리)는 그대로 동작합니다.
+    """
+
+    def __init__(self, max_connections: int, timeout: Timeout, stats: TimingStats = timing_stats):
+        super().__init__()
+        self.timeout = timeout
+        self.stats = stats
+        self.client = httpx.Client(
+            http2=True,
+            follow_redirects=False,  # 리다이렉트는 requests 세션이 처리합니다
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    @staticmethod
+    def _http2_headers(headers) -> Dict[str, str]:
+        # HTTP/2는 연결 단위 헤더(Connection: keep-alive 등)를 허용하지 않습니다.
+        return {name: value for name, value in headers.items() if name.lower() not in _HOP_BY_HOP_HEADERS}
+
+    @staticmethod
+    def _httpx_timeout(timeout: Timeout):
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        return httpx.Timeout(connect=connect, read=read, write=read, pool=read)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        phases: Dict[str, float] = {}
+
+        def trace(event: str, info: Dict) -> None:
+            phases[event] = perf_counter()
+
+        started = perf_counter()
+        try:
+            with self.client.stream(
+                request.method, request.url, headers=self._http2_headers(request.headers), content=request.body,
+                timeout=self._httpx_timeout(timeout or self.timeout), extensions={"trace": trace},
+            ) as response:
+                ttfb = perf_counter() - started
+                content = response.read()
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e, request=request)
+        except (httpx.ConnectError, httpx.RemoteProtocolError) as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        except httpx.HTTPError as e:
+            raise requests.exceptions.RequestException(e, request=request)
+        total = perf_counter() - started
+
+        connect = sum(
+            phases.get(f"{phase}.complete", 0.0) - phases.get(f"{phase}.started", 0.0)
+            for phase in ("connection.connect_tcp", "connection.start_tls")
+        )
+        timing = RequestTiming(connect, ttfb, total - ttfb, total, connect == 0.0, response.http_version)
+        self.stats.record(request.url, timing)
+        return self._build_response(request, response, content, ttfb, timing)
+
+    @staticmethod
+    def _build_response(request, response, content: bytes, ttfb: float, timing: RequestTiming) -> requests.Response:
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.reason = response.reason_phrase
+        result.headers = CaseInsensitiveDict(response.headers)
+        # httpx가 이미 압축을 풀었으므로 본문을 그대로 넣습니다.
+        result._content = content
+        result._content_consumed = True
+        result.encoding = get_encoding_from_headers(result.headers)
+        result.url = str(response.url)
+        result.request = request
+        result.elapsed = timedelta(seconds=ttfb)
+        result.timing = timing
+        # requests 세션이 Set-Cookie를 쿠키 저장소에 반영할 수 있도록 원본 헤더만 흉내 냅니다.
+        message = http.client.HTTPMessage()
+        for value in response.headers.get_list("set-cookie"):
+            message.add_header("Set-Cookie", value)
+        result.raw = SimpleNamespace(_original_response=SimpleNamespace(msg=message))
+        return result
+
+    def close(self):
+        self.client.close()
+
+
+def create_session(headers: Dict[str, str], pool_size: int, timeout: Timeout,
+                   http2_hosts: Iterable[str] = (), http2: bool = True) -> requests.Session:
+    """
+    크롤러용 requests 세션을 만듭니다.
+
+    - Accept-Encoding은 이 환경에서 풀 수 있는 압축(br은 brotli가 설치된 경우)만 알립니다.
+    - 연결 풀은 pool_size개까지 keep-alive로 재사용하고, timeout은 (연결, 읽기) 기본값으로 씁니다.
+    - http2_hosts는 httpx[http2]가 설치되어 있고 http2=True일 때 HTTP/2로 보냅니다.
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    adapter = TimedHTTPAdapter(pool_maxsize=pool_size, timeout=timeout)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if http2 and http2_available():
+        for host in http2_hosts:
+            session.mount(f"https://{host}", Http2Adapter(max_connections=pool_size, timeout=timeout))
+    return session
@@ -0,0 +1,113 @@
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Union
+
+
+def atomic_write_json(path: Union[str, Path], data: Dict) -> None:
+    """임시 파일에 쓰고 fsync한 뒤 rename해서, 중간에 죽어도 이전 파일이나 새 파일 중 하나만 남게 합니다."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    # rename 자체도 디스크에 남도록 디렉토리를 fsync합니다 (지원하지 않는 OS는 건너뜀).
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class CrawlCheckpoint:
+    """
+    DC 크롤링 진행 상황 체크포인트.
+
+    목록 페이지마다 넣은 게시글이 모두 저장(또는 실패 처리)되면 그 페이지를 완료로 보고,
+    완료된 마지막 페이지와 지금까지 저장한 가장 오래된 게시글 id를 파일에 원자적으로 기록합니다.
+    --resume 실행은 완료된 마지막 페이지부터 다시 읽고 이미 저장된 게시글은 건너뜁니다.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._page_of: Dict[str, int] = {}
+        self._pending: Dict[int, int] = {}
+        self._listed: Set[int] = set()
+        self.page = 0
+        self.last_post_id: Optional[int] = None
+
+    def load(self) -> Optional[Dict]:
+        """저장된 체크포인트를 반환합니다. 없거나 깨졌으면 None"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def resume_from(self, state: Dict) -> int:
+        """체크포인트 상태를 이어받고 다시 시작할 페이지 번호를 반환합니다."""
+        start_page = max(int(state.get("page", 0)), 1)
+        with self._lock:
+            # 시작 페이지를 다시 완료해야 체크포인트가 앞으로 나아갑니다.
+            self.page = start_page - 1
+            self.last_post_id = state.get("last_post_id")
+        return start_page
+
+    def submitted(self, page: int, gall_id: str) -> None:
+        """게시글 하나를 파이프라인에 넣었음을 기록합니다."""
+        with self._lock:
+            self._page_of[gall_id] = page
+            self._pending[page] = self._pending.get(page, 0) + 1
+
+    def page_listed(self, page: int) -> None:
+        """목록 페이지의 게시글을 모두 넣었음을 기록합니다."""
+        with self._lock:
+            self._listed.add(page)
+        self._advance()
+
+    def completed(self, gall_ids: Iterable[str]) -> None:
+        """게시글들이 저장되었거나 실패로 끝났음을 기록합니다."""
+        with self._lock:
+            for gall_id in gall_ids:
+                page = self._page_of.pop(gall_id, None)
+                if page is None:
+                    continue
+                self._pending[page] -= 1
+                if gall_id.isdigit() and (self.last_post_id is None or int(gall_id) < self.last_post_id):
+                    self.last_post_id = int(gall_id)
+        self._advance()
+
+    def _advance(self) -> None:
+        with self._lock:
+            advanced = False
+            while (self.page + 1) in self._listed and self._pending.get(self.page + 1, 0) == 0:
+                self.page += 1
+                self._listed.discard(self.page)
+                self._pending.pop(self.page, None)
+                advanced = True
+            if not advanced:
+                return
+            state = {
+                "page": self.page,
+                "last_post_id": self.last_post_id,
+                "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            atomic_write_json(self.path, state)
+
+    def clear(self) -> None:
+        """크롤링이 끝까지 완료되면 체크포인트를 지웁니다."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -19,10 +19,47 @@ END_DATE: Final[datetime] = datetime.now() - timedelta(minutes=3)
 SLEEP_TIME: Final[float] = 1.0
 MAX_RETRIES: Final[int] = 3
 
+# 페치 백엔드 설정 (http: requests + 봇 체크 시 Selenium 폴백, http-only, selenium: 항상 크롬 사용)
+FETCH_BACKEND: Final[str] = os.getenv("DC_FETCH_BACKEND", "http")
+# 요청 타임아웃 (연결, 읽기) 초. 연결 시간에는 DNS 조회도 포함됩니다.
+REQUEST_TIMEOUT: Final[tuple] = (3.05, 10.0)
+# 호스트별 요청 속도: 처음엔 HTTP_MIN_INTERVAL 간격으로 시작해서 응답 시간, 429/503, 봇 체크를 보고 조절합니다 (AIMD).
+HTTP_MIN_INTERVAL: Final[float] = 0.3
+HTTP_MIN_RATE: Final[float] = 0.2
+HTTP_MAX_RATE: Final[float] = float(os.getenv("DC_HTTP_MAX_RATE", "6.0"))
+# 재시도: SLEEP_TIME * 2부터 지수 백오프(jitter 포함), 한 번의 크롤링이 재시도에 쓸 수 있는 시간 예산 (초)
+RETRY_MAX_DELAY: Final[float] = 30.0
+CRAWL_DEADLINE: Final[float] = float(os.getenv("DC_CRAWL_DEADLINE", "3600"))
+# 연속 실패가 이만큼이면 BREAKER_COOLDOWN초 동안 HTTP 요청을 멈춤 (그동안은 Selenium 폴백)
+BREAKER_THRESHOLD: Final[int] = 5
+BREAKER_COOLDOWN: Final[float] = 120.0
+# HTML 파서 백엔드 (auto | selectolax | lxml | html.parser)
+HTML_PARSER: Final[str] = os.getenv("HTML_PARSER", "auto")
+USER_AGENT: Final[str] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# 게시글 파이프라인 설정 (동시 게시글 요청 수, 단계 간 큐 크기)
+FETCH_WORKERS: Final[int] = 4
+# 목록 페이지와 게시글 워커들이 한 세션의 연결 풀을 나눠 씁니다. HTTP/2는 httpx[http2]가 설치된 경우에만 사용
+HTTP_POOL_SIZE: Final[int] = FETCH_WORKERS + 1
+HTTP2_ENABLED: Final[bool] = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP2_HOSTS: Final[tuple] = ("gall.dcinside.com",)
+PIPELINE_QUEUE_SIZE: Final[int] = 32
+
 # 파일 경로
 OUTPUT_DIR: Final[str] = "dc_crawler/output"
 CONTENTS_FILE: Final[str] = f"{OUTPUT_DIR}/contents.csv"
 REPLIES_FILE: Final[str] = f"{OUTPUT_DIR}/replies.csv"
+POSTS_DB_FILE: Final[str] = f"{OUTPUT_DIR}/posts.db"
+STORE_BATCH_SIZE: Final[int] = 20
+CHECKPOINT_FILE: Final[str] = f"{OUTPUT_DIR}/crawl_checkpoint.json"
+BADWORD_INDEX_FILE: Final[str] = f"{OUTPUT_DIR}/badword_index.pkl"
+DATASET_CACHE_DIR: Final[str] = f"{OUTPUT_DIR}/dataset_cache"
 
 # 필터링 설정
+FILTER_CHUNK_SIZE: Final[int] = 10000
+MALICIOUS_DATASET_URL: Final[str] = os.getenv(
+    "MALICIOUS_DATASET_URL",
+    "https://raw.githubusercontent.com/ZIZUN/korean-malicious-comments-dataset/master/Dataset.csv"
+)
+DATASET_TIMEOUT: Final[float] = 10.0
 GPT_API_KEY: Final[str] = os.getenv("GPT_API_KEY", "")
\ No newline at end of file
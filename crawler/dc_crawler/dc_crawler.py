@@ -1,26 +1,32 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import requests
 from time import sleep
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import Callable, List, Optional
 import logging
 import sys
 import os
 
-# 실행: python ./dc_crawler/dc_crawler.py 
+# 실행: python ./dc_crawler/dc_crawler.py [--resume]
 
 # 상위 디렉토리를 파이썬 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import (
     END_DATE, GALLERY_TYPE, TARGET_GALLERY, 
-    BASE_URL, SLEEP_TIME, MAX_RETRIES
+    BASE_URL, FETCH_BACKEND, FETCH_WORKERS, HTML_PARSER,
+    POSTS_DB_FILE, CHECKPOINT_FILE
 )
-from crawler.dc_crawler.save import save_data
+from crawler.dc_crawler.save import ensure_output_dir
+from crawler.dc_crawler.post_store import PostStore
+from crawler.dc_crawler.checkpoint import CrawlCheckpoint
+from crawler.dc_crawler.fetcher import (
+    Fetcher, SeleniumFetcher, BotCheckDetected, HostRateLimiter, create_fetcher, create_retry_policy, setup_http_session
+)
+from crawler.common.transport import timing_stats
+from crawler.common.rate_limit import CircuitOpenError
+from crawler.dc_crawler.pipeline import ArticleJob, ArticlePipeline
+from crawler.common.list_extract import ListRow, extract_dc_rows
 
 # 로깅 설정
 logging.basicConfig(
@@ -30,147 +36,154 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class DcCrawler:
-    def __init__(self):
-        self.driver = self._setup_driver()
-        self.posts: List[Tuple] = []
-        self.comments: List[Tuple] = []
-        
-    def _setup_driver(self) -> webdriver.Chrome:
-        logger.info("크롬 드라이버 설정 시작")
-        options = Options()
-        # 헤드리스 옵션 완전 비활성화
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=options
+    def __init__(self, fetcher_factory: Optional[Callable[[], Fetcher]] = None):
+        # 목록 페이지와 게시글 워커들이 호스트별 요청 간격과 HTTP 연결 풀을 공유합니다.
+        self.rate_limiter = HostRateLimiter()
+        self.session = setup_http_session()
+        # 봇 체크 때 쓰는 크롬도 하나만 두고 공유합니다 (처음 필요할 때 띄움, selenium 백엔드는 모든 요청이 이 크롬을 씀).
+        self.selenium_fallback = SeleniumFetcher()
+        self.fetcher_factory = fetcher_factory or (
+            lambda: create_fetcher(FETCH_BACKEND, self.rate_limiter, self.session, self.selenium_fallback)
         )
-        # navigator.webdriver 속성 우회
-        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-            'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
-        })
-        return driver
+        self.retry_policy = create_retry_policy()
+        self.deadline: Optional[float] = None
+        self.fetcher = self.fetcher_factory()
+        logger.info(f"페치 백엔드: {self.fetcher.name}")
+        # 크롬은 무겁기 때문에 selenium 백엔드에서는 워커를 하나만 둡니다.
+        self.workers = 1 if FETCH_BACKEND == "selenium" else FETCH_WORKERS
+        self.pipeline: Optional[ArticlePipeline] = None
+        self.store: Optional[PostStore] = None
+        self.checkpoint = CrawlCheckpoint(CHECKPOINT_FILE)
+        self.resume = False
     
-    def _get_page_with_retry(self, url: str, retries: int = MAX_RETRIES) -> Optional[BeautifulSoup]:
+    def _get_html_with_retry(self, url: str) -> Optional[str]:
         logger.info(f"페이지 로드 시도: {url}")
-        for i in range(retries):
+        attempts = self.retry_policy.max_attempts
+        for i in range(attempts):
             try:
-                self.driver.get(url)
-                sleep(SLEEP_TIME)
-                return BeautifulSoup(self.driver.page_source, "html.parser")
-            except WebDriverException as e:
-                logger.error(f"페이지 로드 실패 (시도 {i+1}/{retries}): {str(e)}")
-                if i == retries - 1:
+                return self.fetcher.fetch(url)
+            except CircuitOpenError as e:
+                logger.error(f"페이지 로드 중단: {str(e)}")
+                return None
+            except (requests.RequestException, WebDriverException, BotCheckDetected) as e:
+                logger.error(f"페이지 로드 실패 (시도 {i+1}/{attempts}): {str(e)}")
+                delay = self.retry_policy.next_delay(i, self.deadline)
+                if delay is None:
                     return None
-                sleep(SLEEP_TIME * 2)
+                sleep(delay)
     
-    def crawl(self):
+    def crawl(self, resume: bool = False):
         logger.info("크롤링 시작")
         logger.info(f"종료시간 : {END_DATE}")
         
         page = 1
-        while True:
-            url = f"{BASE_URL}/{GALLERY_TYPE}/board/lists/?id={TARGET_GALLERY}&page={page}"
-            soup = self._get_page_with_retry(url)
-            if not soup:
-                logger.error("페이지 로드 실패 - soup이 없습니다")
-                break
-                
-            # 첫 페이지 HTML 저장 (디버깅용)
-            if page == 1:
-                with open("debug/debug_first_page.html", "w", encoding="utf-8") as f:
-                    f.write(soup.prettify())
-                
-            # 게시글 목록 찾기
-            article_list = soup.select("tr.ub-content")
-            if not article_list:
-                logger.error("게시글을 찾을 수 없습니다")
-                break
+        self.resume = resume
+        self.deadline = self.retry_policy.deadline()
+        if resume:
+            state = self.checkpoint.load()
+            if state:
+                page = self.checkpoint.resume_from(state)
+                logger.info(f"체크포인트에서 이어서 크롤링: {page}페이지부터 (마지막 게시글 ID: {state.get('last_post_id')})")
+            else:
+                logger.info("저장된 체크포인트가 없어 1페이지부터 시작합니다")
+        
+        ensure_output_dir()
+        # 게시글은 작은 배치로 바로 저장하고, 배치가 커밋될 때마다 체크포인트를 갱신합니다.
+        self.store = PostStore(POSTS_DB_FILE, on_flush=lambda posts: self.checkpoint.completed(post[0] for post in posts))
+        finished = False
+        try:
+            # 목록 페이지는 여기서 읽고, 게시글 본문은 파이프라인 워커들이 동시에 가져옵니다.
+            with ArticlePipeline(self.fetcher_factory, self.store.add_post, workers=self.workers,
+                                 retry_policy=self.retry_policy, deadline=self.deadline,
+                                 on_failed=lambda job: self.checkpoint.completed([job.gall_id])) as pipeline:
+                self.pipeline = pipeline
+                while True:
+                    url = f"{BASE_URL}/{GALLERY_TYPE}/board/lists/?id={TARGET_GALLERY}&page={page}"
+                    html = self._get_html_with_retry(url)
+                    if not html:
+                        logger.error("페이지 로드 실패 - html이 없습니다")
+                        break
+                        
+                    # 첫 페이지 HTML 저장 (디버깅용)
+                    if page == 1:
+                        with open("debug/debug_first_page.html", "w", encoding="utf-8") as f:
+                            f.write(html)
+                        
+                    # 게시글 목록 찾기 (전체 DOM 대신 목록 테이블만 파싱)
+                    article_list = extract_dc_rows(html, HTML_PARSER)
+                    if article_list is None:
+                        # 목록 테이블이 없으면 봇 체크/오류 페이지일 수 있으므로 실패로 보고 체크포인트를 남깁니다.
+                        logger.error("게시글 목록을 찾을 수 없습니다 - 체크포인트를 남기고 중단합니다")
+                        break
+                    if not article_list:
+                        # 목록 테이블은 읽었지만 글이 없으면 마지막 페이지를 지난 것입니다.
+                        logger.info(f"{page}페이지에 게시글이 없습니다 - 마지막 페이지까지 크롤링했습니다")
+                        finished = True
+                        break
 
-            logger.info(f"url: {url}")
-            logger.info(f"게시글 수: {len(article_list)}개")
-                
-            # 현재 페이지의 게시글 처리
-            self._process_articles(article_list)
-            page += 1
-                
-        self.driver.quit()
-        save_data(self.posts, self.comments)
+                    logger.info(f"url: {url}")
+                    logger.info(f"게시글 수: {len(article_list)}개")
+                        
+                    # 현재 페이지의 게시글 처리 (END_DATE 이전 게시글을 만나면 종료)
+                    keep_going = self._process_articles(article_list, page)
+                    self.checkpoint.page_listed(page)
+                    if not keep_going:
+                        finished = True
+                        break
+                    page += 1
+        finally:
+            self.fetcher.close()
+            self.selenium_fallback.close()
+            self.session.close()
+            timing_stats.log()
+            self.store.close()
+            
+        # 끝까지 완료한 경우에만 체크포인트를 지웁니다 (페이지 로드 실패 등은 --resume으로 이어서 실행)
+        if finished:
+            self.checkpoint.clear()
+        logger.info(f"✅ 저장 완료 ({POSTS_DB_FILE}): {self.pipeline.stats}")
         
-    def _process_articles(self, article_list):
+    def _process_articles(self, article_list: List[ListRow], page: int) -> bool:
+        """목록의 게시글을 파이프라인에 넣습니다. 크롤링을 계속할지 여부를 반환합니다."""
         logger.info(f"게시글 목록 처리 시작: {len(article_list)}개")
         for article in article_list:
             try:
-                # 게시글 제목 찾기
-                title_td = article.select_one("td.gall_tit")
-                if not title_td:
-                    logger.error("gall_tit를 찾을 수 없습니다")
-                    continue
-                    
-                title_link = title_td.select_one("a")
-                if not title_link:
+                if not article.href:
                     logger.error("제목 링크를 찾을 수 없습니다")
                     continue
                 
                 # 설문 게시글 체크
-                if title_link.get('href', '').startswith('javascript:;'):
+                if article.href.startswith('javascript:;'):
                     logger.info("설문 게시글 건너뜁니다")
                     continue
                 
-                # 제목에서 아이콘 제거
-                icon = title_link.select_one("em.icon_img")
-                if icon:
-                    icon.decompose()
-                    
-                title = title_link.text.strip()
-                
                 # 게시글 번호 찾기
-                gall_id = article.select_one("td.gall_num")
-                if not gall_id:
+                if not article.id:
                     logger.error("게시글 번호를 찾을 수 없습니다")
                     continue
-                    
-                gall_id = gall_id.text.strip()
-                post_url = BASE_URL + title_link['href']
                 
                 # 게시글 종류 확인 (공지, 일반 등)
-                subject_td = article.select_one("td.gall_subject")
-                if not subject_td:
-                    logger.error("gall_subject를 찾을 수 없습니다")
-                    continue
-                    
-                subject = subject_td.select_one("b")
-                if subject:
-                    subject = subject.text.strip()
-                else:
-                    subject = subject_td.text.strip()
-                    
-                if subject in ["공지", "AD", "설문"]:
-                    logger.info(f"제외 게시글 건너뜁니다: {subject}")
+                if article.subject in ["공지", "AD", "설문"]:
+                    logger.info(f"제외 게시글 건너뜁니다: {article.subject}")
                     continue
                 
-                logger.info(f"게시글 발견: {title} (ID: {gall_id})")
-                self._process_single_article(gall_id, title, post_url, article)
+                logger.info(f"게시글 발견: {article.title} (ID: {article.id})")
+                if not self._process_single_article(article, page):
+                    return False
             except Exception as e:
                 logger.error(f"게시글 처리 실패: {str(e)}")
+        return True
                 
-    def _process_single_article(self, gall_id: str, title: str, post_url: str, article):
+    def _process_single_article(self, article: ListRow, page: int) -> bool:
         logger.info(f"단일 게시글 처리 시작")
         
         # 날짜 체크
         try:
-            date_td = article.select_one("td.gall_date")
-            if not date_td:
-                logger.error("날짜 정보를 찾을 수 없습니다")
-                return
-                
-            # title 속성에서 날짜 가져오기
-            post_date = date_td.get('title', '')
+            # gall_date의 title 속성에서 가져온 날짜
+            post_date = article.date
             if not post_date:
                 logger.error("날짜 title 속성을 찾을 수 없습니다")
-                return
+                return True
                 
             logger.info(f"post_date: {post_date}")
             post_time = datetime.strptime(post_date, "%Y-%m-%d %H:%M:%S")
@@ -178,22 +191,21 @@ class DcCrawler:
             # 게시글이 post_time의 DESC 기준으로 정렬되어있기 떄문에 종료시간보다 이전 게시글 발견 시 크롤링 종료
             if  post_time < END_DATE:
                 logger.info(f"END_DATE({END_DATE})보다 이전 게시글 발견, 크롤링 종료")
-                self.driver.quit()
-                save_data(self.posts, self.comments)
-                exit(0)
+                return False
         except Exception as e:
             logger.error(f"날짜 파싱 실패: {str(e)}")
-            return
+            return True
             
-        post_soup = self._get_page_with_retry(post_url)
-        if not post_soup:
-            return            
-        try:            
-            content = post_soup.select_one("div.write_div").text.strip()
-        except:
-            content = ""
+        # 이어서 실행할 때는 이미 저장된 게시글을 다시 요청하지 않습니다.
+        if self.resume and self.store.has_post(article.id):
+            logger.info(f"이미 저장된 게시글 건너뜁니다: {article.id}")
+            return True
             
-        self.posts.append((gall_id, title, content, post_date))
+        # 본문 요청/파싱/저장은 파이프라인에서 처리합니다.
+        post_url = BASE_URL + article.href
+        self.checkpoint.submitted(page, article.id)
+        self.pipeline.submit(ArticleJob(article.id, article.title, post_url, post_date, page))
+        return True
         
         # TODO: 댓글 처리 추가
         # self._process_comments(post_soup, gall_id)
@@ -213,4 +225,4 @@ class DcCrawler:
 
 if __name__ == "__main__":
     crawler = DcCrawler()
-    crawler.crawl()
+    crawler.crawl(resume="--resume" in sys.argv)
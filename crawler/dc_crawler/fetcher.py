@@ -0,0 +1,230 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+from pathlib import Path
+from time import sleep, monotonic
+from typing import Dict, Optional, Union
+import math
+import threading
+import requests
+import logging
+
+from config import (
+    SLEEP_TIME, MAX_RETRIES, REQUEST_TIMEOUT, HTTP_MIN_INTERVAL, HTTP_MIN_RATE, HTTP_MAX_RATE, USER_AGENT,
+    RETRY_MAX_DELAY, CRAWL_DEADLINE, BREAKER_THRESHOLD, BREAKER_COOLDOWN,
+    HTTP_POOL_SIZE, HTTP2_ENABLED, HTTP2_HOSTS
+)
+from crawler.common.rate_limit import (
+    AdaptiveHostLimiter, RetryPolicy, BlockedResponse, CircuitOpenError, ERROR, THROTTLED, BLOCKED,
+    classify_response, parse_retry_after
+)
+from crawler.common.transport import create_session
+
+logger = logging.getLogger(__name__)
+
+
+class HostRateLimiter(AdaptiveHostLimiter):
+    """DC 설정값으로 만든 호스트별 적응형 리미터 (여러 워커가 공유). min_interval=0이면 제한하지 않습니다."""
+
+    def __init__(self, min_interval: float = HTTP_MIN_INTERVAL):
+        initial_rate = 1 / min_interval if min_interval > 0 else math.inf
+        super().__init__(initial_rate=initial_rate, min_rate=HTTP_MIN_RATE, max_rate=HTTP_MAX_RATE,
+                         breaker_threshold=BREAKER_THRESHOLD, breaker_cooldown=BREAKER_COOLDOWN)
+
+
+def setup_http_session() -> requests.Session:
+    """연결 풀, 기본 (연결, 읽기) 타임아웃, br/gzip, 가능하면 HTTP/2를 쓰는 세션"""
+    return create_session({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
+        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+        'Connection': 'keep-alive',
+    }, pool_size=HTTP_POOL_SIZE, timeout=REQUEST_TIMEOUT, http2_hosts=HTTP2_HOSTS, http2=HTTP2_ENABLED)
+
+
+def create_retry_policy() -> RetryPolicy:
+    """목록 페이지와 게시글 워커가 함께 쓰는 재시도 정책 (지수 백오프 + 크롤링 시간 예산)"""
+    return RetryPolicy(max_attempts=MAX_RETRIES, base_delay=SLEEP_TIME * 2, max_delay=RETRY_MAX_DELAY,
+                       budget=CRAWL_DEADLINE)
+
+
+class BotCheckDetected(BlockedResponse):
+    """HTTP 응답이 봇 체크 페이지로 보일 때 발생합니다."""
+
+
+def looks_like_bot_check(status_code: int, html: str) -> bool:
+    """응답 상태 코드와 본문으로 봇 체크 페이지 여부를 판단합니다."""
+    return classify_response(status_code, html) in (THROTTLED, BLOCKED)
+
+
+class Fetcher:
+    """페이지 HTML을 가져오는 백엔드의 공통 인터페이스"""
+    name = "base"
+
+    def fetch(self, url: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class HttpFetcher(Fetcher):
+    """keep-alive 세션을 공유하는 requests 기반 백엔드"""
+    name = "http"
+
+    def __init__(self, session: Optional[requests.Session] = None, rate_limiter: Optional[HostRateLimiter] = None):
+        # 세션을 넘겨받으면 여러 워커가 연결 풀을 함께 쓰고, 닫는 것은 넘겨준 쪽이 맡습니다.
+        self._owns_session = session is None
+        self.session = session or self._setup_session()
+        # 고정 sleep 대신 호스트별 토큰 버킷으로 대기하고, 응답을 보고 속도를 조절합니다.
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+
+    @staticmethod
+    def _setup_session() -> requests.Session:
+        return setup_http_session()
+
+    def fetch(self, url: str) -> Optional[str]:
+        self.rate_limiter.acquire(url)
+        started = monotonic()
+        try:
+            response = self.session.get(url)
+        except requests.RequestException:
+            self.rate_limiter.record(url, ERROR)
+            raise
+        # charset이 없으면 requests가 ISO-8859-1로 추정하므로 UTF-8로 고정합니다.
+        if 'charset' not in response.headers.get('Content-Type', ''):
+            response.encoding = 'utf-8'
+        outcome = classify_response(response.status_code, response.text)
+        self.rate_limiter.record(url, outcome, monotonic() - started, parse_retry_after(response.headers.get("Retry-After")))
+        if outcome in (THROTTLED, BLOCKED):
+            raise BotCheckDetected(f"봇 체크 페이지 감지 ({response.status_code}): {url}", outcome)
+        response.raise_for_status()
+        return response.text
+
+    def close(self) -> None:
+        if self._owns_session:
+            self.session.close()
+
+
+class SeleniumFetcher(Fetcher):
+    """
+    크롬을 띄워서 페이지를 렌더링하는 백엔드 (드라이버는 첫 요청 시 생성).
+
+    여러 워커가 하나를 공유할 수 있도록 드라이버 생성과 요청은 잠금으로 한 번에 하나씩 처리합니다.
+    """
+    name = "selenium"
+
+    def __init__(self):
+        self._driver: Optional[webdriver.Chrome] = None
+        self._lock = threading.RLock()
+
+    @property
+    def driver(self) -> webdriver.Chrome:
+        with self._lock:
+            if self._driver is None:
+                self._driver = self._setup_driver()
+            return self._driver
+
+    def _setup_driver(self) -> webdriver.Chrome:
+        logger.info("크롬 드라이버 설정 시작")
+        options = Options()
+        # 헤드리스 옵션 완전 비활성화
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument(f'--user-agent={USER_AGENT}')
+        driver = webdriver.Chrome(
+            service=Service(ChromeDriverManager().install()),
+            options=options
+        )
+        # navigator.webdriver 속성 우회
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+            'source': 'Object.defineProperty(navigator, "webdriver", {get: () => undefined})'
+        })
+        return driver
+
+    def fetch(self, url: str) -> Optional[str]:
+        with self._lock:
+            self.driver.get(url)
+            sleep(SLEEP_TIME)
+            return self.driver.page_source
+
+    def cookies(self) -> list:
+        with self._lock:
+            return self._driver.get_cookies() if self._driver else []
+
+    def close(self) -> None:
+        with self._lock:
+            if self._driver is not None:
+                self._driver.quit()
+                self._driver = None
+
+
+class FallbackFetcher(Fetcher):
+    """HTTP로 먼저 시도하고, 봇 체크 페이지일 때만 Selenium으로 다시 가져옵니다."""
+    name = "fallback"
+
+    def __init__(self, primary: Optional[HttpFetcher] = None, fallback: Optional[SeleniumFetcher] = None):
+        self.primary = primary or HttpFetcher()
+        # fallback을 넘겨받으면 여러 워커가 크롬 하나를 함께 쓰고, 닫는 것은 넘겨준 쪽이 맡습니다.
+        self._owns_fallback = fallback is None
+        self.fallback = fallback or SeleniumFetcher()
+
+    def fetch(self, url: str) -> Optional[str]:
+        try:
+            return self.primary.fetch(url)
+        except (BotCheckDetected, CircuitOpenError) as e:
+            # HTTP 회로가 열려 있는 동안에도 Selenium으로 계속 진행합니다.
+            logger.warning(f"{str(e)} - Selenium으로 재시도합니다")
+            html = self.fallback.fetch(url)
+            self._share_cookies()
+            return html
+
+    def _share_cookies(self) -> None:
+        # 브라우저가 통과한 쿠키를 HTTP 세션에 복사해서 이후 요청은 다시 HTTP로 처리합니다.
+        for cookie in self.fallback.cookies():
+            self.primary.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+
+    def close(self) -> None:
+        self.primary.close()
+        if self._owns_fallback:
+            self.fallback.close()
+
+
+class FixtureFetcher(Fetcher):
+    """저장된 HTML 파일을 돌려주는 백엔드 (벤치마크/테스트용)"""
+    name = "fixture"
+
+    def __init__(self, fixtures: Union[str, Path, Dict[str, Union[str, Path]]]):
+        # 경로 하나를 주면 모든 URL에 같은 파일을, dict를 주면 URL별 파일을 돌려줍니다.
+        if isinstance(fixtures, dict):
+            self._pages = {url: Path(path).read_text(encoding="utf-8") for url, path in fixtures.items()}
+            self._default = None
+        else:
+            self._pages = {}
+            self._default = Path(fixtures).read_text(encoding="utf-8")
+
+    def fetch(self, url: str) -> Optional[str]:
+        return self._pages.get(url, self._default)
+
+
+FETCH_BACKENDS = ("http", "http-only", "selenium")
+
+
+def create_fetcher(backend: str, rate_limiter: Optional[HostRateLimiter] = None,
+                   session: Optional[requests.Session] = None, fallback: Optional[SeleniumFetcher] = None) -> Fetcher:
+    """
+    설정 이름으로 페치 백엔드를 생성합니다.
+
+    rate_limiter를 주면 여러 Fetcher가 요청 간격을, session을 주면 연결 풀과 쿠키를,
+    fallback을 주면 봇 체크 때 띄우는 크롬 하나를 공유합니다 (닫는 것은 넘겨준 쪽이 맡음).
+    selenium 백엔드도 fallback을 주면 새 크롬을 띄우지 않고 그 인스턴스를 그대로 씁니다.
+    """
+    if backend == "http":
+        return FallbackFetcher(primary=HttpFetcher(session=session, rate_limiter=rate_limiter), fallback=fallback)
+    if backend == "http-only":
+        return HttpFetcher(session=session, rate_limiter=rate_limiter)
+    if backend == "selenium":
+        return fallback or SeleniumFetcher()
+    raise ValueError(f"알 수 없는 페치 백엔드: {backend} (가능: {', '.join(FETCH_BACKENDS)})")
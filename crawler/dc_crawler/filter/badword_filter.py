@@ -1,72 +1,175 @@
 import pandas as pd
+import numpy as np
 import json
 import sys
 import os
 import re
-from typing import List, Set
-import requests
-import io
+import time
+from typing import Dict, Iterable, List, Set
 
-# 상위 디렉토리를 파이썬 경로에 추가
+# 상위 디렉토리와 프로젝트 루트를 파이썬 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
 
-from config import GPT_API_KEY, OUTPUT_DIR, CONTENTS_FILE, REPLIES_FILE
+from config import (
+    GPT_API_KEY, OUTPUT_DIR, CONTENTS_FILE, REPLIES_FILE,
+    POSTS_DB_FILE, BADWORD_INDEX_FILE, FILTER_CHUNK_SIZE,
+    MALICIOUS_DATASET_URL, DATASET_CACHE_DIR, DATASET_TIMEOUT
+)
+from crawler.dc_crawler.filter.badword_index import BadWordIndex
+from crawler.dc_crawler.filter.dataset_cache import MaliciousDatasetCache
+from crawler.dc_crawler.post_store import PostStore
 
 class BadWordFilter:
-    def __init__(self):
-        # 악성댓글 데이터셋 로드
-        self.malicious_dataset = self._load_malicious_dataset()
+    def __init__(self, index_path: str = BADWORD_INDEX_FILE, rebuild: bool = False,
+                 dataset_source: str = MALICIOUS_DATASET_URL, revalidate: bool = False):
+        # 악성댓글 데이터셋 로컬 캐시 (dataset_source에 로컬 CSV 경로나 테스트용 URL을 줄 수 있음)
+        self.dataset_cache = MaliciousDatasetCache(dataset_source, DATASET_CACHE_DIR, timeout=DATASET_TIMEOUT)
+        # 컴파일된 악성 문구 인덱스 로드 (없거나 데이터셋 버전이 다르면 다시 빌드 후 저장)
+        self.index_path = index_path
+        self.index = self._load_index(rebuild, revalidate)
     
-    def _load_malicious_dataset(self) -> pd.DataFrame:
-        """악성댓글 데이터셋 로드"""
-        try:
-            # GitHub raw URL에서 데이터셋 다운로드
-            url = "https://raw.githubusercontent.com/ZIZUN/korean-malicious-comments-dataset/master/Dataset.csv"
-            response = requests.get(url)
-            df = pd.read_csv(io.StringIO(response.text))
-            return df
-        except Exception as e:
-            print(f"악성댓글 데이터셋 로드 실패: {str(e)}")
-            return pd.DataFrame()
+    def _load_index(self, rebuild: bool, revalidate: bool) -> BadWordIndex:
+        """저장된 인덱스를 로드하거나, 캐시된 데이터셋으로 새로 빌드합니다."""
+        # 데이터셋 캐시가 없거나 재검증을 요청한 경우에만 원본을 확인합니다.
+        phrases = None
+        if revalidate or self.dataset_cache.cached_version() is None:
+            phrases = self.dataset_cache.load(revalidate=revalidate)
+        version = self.dataset_cache.cached_version() or ""
+        
+        if not rebuild and version and os.path.exists(self.index_path):
+            try:
+                index = BadWordIndex.load(self.index_path)
+                if index.version == version:
+                    return index
+                print("데이터셋 버전이 달라 악성 문구 인덱스를 다시 빌드합니다")
+            except Exception as e:
+                print(f"악성 문구 인덱스 로드 실패, 다시 빌드합니다: {str(e)}")
+        
+        # 악성댓글(label == 0) 문구만 캐시에 저장되어 있습니다.
+        if phrases is None:
+            phrases = self.dataset_cache.load()
+        index = BadWordIndex(phrases, version=version)
+        if version:
+            try:
+                index.save(self.index_path)
+            except Exception as e:
+                print(f"악성 문구 인덱스 저장 실패: {str(e)}")
+        return index
+    
+    def find_bad_words(self, text: str) -> List[str]:
+        """게시글과 일치하는 악성 문구 목록 반환"""
+        return self.index.find(text)
     
     def contains_bad_word(self, text: str) -> bool:
         """악성댓글 포함 여부 확인"""
-        if self.malicious_dataset.empty:
-            return False
-            
-        # 악성댓글 데이터셋과 유사도 체크
-        for _, row in self.malicious_dataset.iterrows():
-            if row['label'] == 0:  # 악성댓글인 경우
-                if text in row['text'] or row['text'] in text:
-                    return True
-        return False
+        # 게시글에 악성 문구가 포함되거나 게시글이 악성 문구에 포함되는 경우
+        return self.index.contains(text)
+    
+    def contains_bad_word_batch(self, texts: Iterable[str]) -> np.ndarray:
+        """여러 게시글의 악성댓글 포함 여부를 bool 배열로 반환"""
+        # 같은 본문은 한 번만 검사하고 결과를 다시 펼칩니다.
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=True)
+        unique_flags = np.fromiter((self.index.contains(text) for text in uniques), dtype=bool, count=len(uniques))
+        # NaN(-1)은 정상 게시글로 봅니다.
+        return np.append(unique_flags, False)[codes]
+    
+    def bad_word_scores(self, texts: Iterable[str]) -> np.ndarray:
+        """여러 게시글 각각에 일치한 악성 문구 수를 정수 배열로 반환"""
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=True)
+        unique_scores = np.fromiter((len(self.index.find(text)) for text in uniques), dtype=np.int32, count=len(uniques))
+        return np.append(unique_scores, 0)[codes]
     
     def filter_contents(self, csv_path: str, output_path: str = None) -> pd.DataFrame:
         """CSV 파일에서 악성댓글이 포함된 게시물 필터링"""
         try:
+            started = time.perf_counter()
             df = pd.read_csv(csv_path)
             
             # 악성댓글 필터링
-            df['contains_bad_word'] = df['content'].apply(self.contains_bad_word)
+            df['contains_bad_word'] = self.contains_bad_word_batch(df['content'])
             filtered_df = df[~df['contains_bad_word']]
             
             # 결과 저장
             if output_path:
                 filtered_df.to_csv(output_path, index=False)
             
+            self._print_throughput(len(df), len(filtered_df), time.perf_counter() - started)
             return filtered_df
             
         except Exception as e:
             print(f"Error processing CSV file: {str(e)}")
             return pd.DataFrame()
+    
+    def filter_contents_streaming(self, csv_path: str, output_path: str, chunksize: int = FILTER_CHUNK_SIZE) -> Dict[str, float]:
+        """
+        CSV 파일을 chunksize 행씩 읽어 필터링하고 결과를 바로 이어서 씁니다.
+        
+        전체 파일을 메모리에 올리지 않기 때문에 누적된 대용량 게시글도 일정한 메모리로 처리합니다.
+        결과는 임시 파일에 쓴 뒤 마지막에 output_path로 교체합니다.
+        """
+        started = time.perf_counter()
+        total, kept = 0, 0
+        tmp_path = f"{output_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as out:
+                for chunk_index, chunk in enumerate(pd.read_csv(csv_path, chunksize=chunksize)):
+                    mask = self.contains_bad_word_batch(chunk['content'])
+                    filtered = chunk[~mask]
+                    filtered.to_csv(out, index=False, header=chunk_index == 0)
+                    total += len(chunk)
+                    kept += len(filtered)
+            os.replace(tmp_path, output_path)
+        except Exception as e:
+            print(f"Error processing CSV file: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        
+        elapsed = time.perf_counter() - started
+        self._print_throughput(total, kept, elapsed)
+        return {"total": total, "kept": kept, "seconds": elapsed, "posts_per_sec": total / elapsed if elapsed else 0.0}
+    
+    def filter_store(self, store: PostStore, output_path: str, consumer: str = "badword_filter",
+                     chunksize: int = FILTER_CHUNK_SIZE) -> Dict[str, float]:
+        """
+        게시글 저장소에서 지난 실행 이후 추가된 게시글만 읽어 필터링하고 output_path에 이어서 씁니다.
+        
+        청크를 파일에 쓴 뒤에 읽은 위치를 저장하므로, 중간에 실패하면 다음 실행에서 그 청크부터 다시 처리합니다.
+        """
+        started = time.perf_counter()
+        total, kept = 0, 0
+        write_header = not os.path.exists(output_path)
+        for chunk, last_seq in store.iter_new_posts(consumer, chunksize):
+            mask = self.contains_bad_word_batch(chunk['content'])
+            filtered = chunk[~mask]
+            filtered.to_csv(output_path, mode="a", index=False, header=write_header, encoding="utf-8")
+            write_header = False
+            store.ack(consumer, last_seq)
+            total += len(chunk)
+            kept += len(filtered)
+        
+        elapsed = time.perf_counter() - started
+        self._print_throughput(total, kept, elapsed)
+        return {"total": total, "kept": kept, "seconds": elapsed, "posts_per_sec": total / elapsed if elapsed else 0.0}
+    
+    @staticmethod
+    def _print_throughput(total: int, kept: int, elapsed: float) -> None:
+        posts_per_sec = total / elapsed if elapsed else 0.0
+        print(f"필터링 처리량: {total}개 중 {kept}개 유지, {elapsed:.2f}초 ({posts_per_sec:,.0f} posts/sec)")
 
 if __name__ == "__main__":
     # 필터 인스턴스 생성
-    filter = BadWordFilter()
+    # --revalidate: 데이터셋 원본이 바뀌었는지 조건부 요청으로 확인
+    filter = BadWordFilter(revalidate="--revalidate" in sys.argv)
     
-    # CSV 파일 필터링
-    filtered_df = filter.filter_contents(
-        CONTENTS_FILE,
-        f"{OUTPUT_DIR}/filtered_contents.csv"
-    )
+    if os.path.exists(POSTS_DB_FILE):
+        # 게시글 저장소에서 지난 실행 이후 추가된 게시글만 필터링
+        with PostStore(POSTS_DB_FILE) as store:
+            filter.filter_store(store, f"{OUTPUT_DIR}/filtered_contents.csv")
+    else:
+        # CSV 파일을 청크 단위로 스트리밍 필터링
+        filter.filter_contents_streaming(
+            CONTENTS_FILE,
+            f"{OUTPUT_DIR}/filtered_contents.csv"
+        )
     print(f"✅ 필터링 완료: {OUTPUT_DIR}/filtered_contents.csv 파일 저장됨")
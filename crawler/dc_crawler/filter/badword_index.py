@@ -0,0 +1,163 @@
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Union
+import pickle
+
+from crawler.dc_crawler.filter.dataset_cache import normalize_phrase
+
+# 인덱스 파일 포맷 버전 (구조가 바뀌면 올려서 예전 파일을 다시 빌드하게 합니다)
+INDEX_FORMAT_VERSION = 2
+
+# 문서 구분자 (역방향 검색용 코퍼스에서 문구 사이에 넣습니다)
+SEPARATOR = "\x00"
+
+# goto 테이블 키: (노드 번호 << 21) | 문자 코드 (유니코드 최대값 0x10FFFF < 2**21)
+_CHAR_BITS = 21
+
+
+class AhoCorasick:
+    """
+    여러 문구를 한 번에 찾는 Aho-Corasick 오토마톤.
+
+    노드마다 dict를 두는 대신 (노드, 문자) → 자식 노드를 하나의 평탄한 dict와
+    array로 보관해서 pickle 저장/로드가 빠릅니다.
+    """
+
+    def __init__(self, phrases: List[str]):
+        self.phrases = phrases
+        self._goto: Dict[int, int] = {}
+        self._fail = array('i', [0])
+        self._term = array('i', [-1])   # 이 노드에서 끝나는 문구 번호 (-1: 없음)
+        self._out = array('i', [0])     # 실패 링크를 따라가며 만나는 다음 출력 노드 (0: 없음)
+        self._build()
+
+    def _build(self) -> None:
+        children: List[List[int]] = [[]]
+        for index, phrase in enumerate(self.phrases):
+            node = 0
+            for char in phrase:
+                key = (node << _CHAR_BITS) | ord(char)
+                child = self._goto.get(key)
+                if child is None:
+                    child = len(self._term)
+                    self._goto[key] = child
+                    self._fail.append(0)
+                    self._term.append(-1)
+                    self._out.append(0)
+                    children.append([])
+                    children[node].append(key)
+                node = child
+            self._term[node] = index
+
+        # BFS로 실패 링크와 출력 링크 계산
+        queue = [self._goto[key] for key in children[0]]
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for key in children[node]:
+                child = self._goto[key]
+                char = key & ((1 << _CHAR_BITS) - 1)
+                fail = self._fail[node]
+                while fail and ((fail << _CHAR_BITS) | char) not in self._goto:
+                    fail = self._fail[fail]
+                fail = self._goto.get((fail << _CHAR_BITS) | char, 0) if node else 0
+                self._fail[child] = fail
+                self._out[child] = fail if self._term[fail] >= 0 else self._out[fail]
+                queue.append(child)
+
+    def search(self, text: str, first_only: bool = False) -> List[int]:
+        """text 안에 들어 있는 문구 번호 목록을 반환합니다 (한 번의 선형 스캔)."""
+        goto, fail, term, out = self._goto, self._fail, self._term, self._out
+        found: Dict[int, None] = {}
+        node = 0
+        for char in text:
+            code = ord(char)
+            while node and ((node << _CHAR_BITS) | code) not in goto:
+                node = fail[node]
+            node = goto.get((node << _CHAR_BITS) | code, 0)
+            match = node if term[node] >= 0 else out[node]
+            while match:
+                found[term[match]] = None
+                if first_only:
+                    return list(found)
+                match = out[match]
+        return list(found)
+
+
+class BadWordIndex:
+    """
+    악성 문구 인덱스.
+
+    기존 필터와 같은 기준(게시글에 문구가 포함되거나, 게시글이 문구에 포함됨)으로 판단합니다.
+    게시글은 데이터셋 문구와 같은 방식(NFC, 공백 하나로 합침)으로 정규화한 뒤 비교합니다.
+      - 정방향: Aho-Corasick 오토마톤으로 게시글을 한 번만 훑습니다.
+      - 역방향: 모든 문구를 구분자로 이은 코퍼스에서 게시글을 한 번 검색합니다.
+    """
+
+    def __init__(self, phrases: Iterable[str], version: str = ""):
+        # 인덱스를 만든 데이터셋 버전 (데이터셋이 바뀌면 다시 빌드하는 기준)
+        self.version = version
+        # 중복/빈 문구 제거 (순서 유지)
+        self.phrases: List[str] = list(dict.fromkeys(
+            phrase for phrase in phrases if isinstance(phrase, str) and phrase and SEPARATOR not in phrase
+        ))
+        self._automaton = AhoCorasick(self.phrases)
+        self._corpus = SEPARATOR + SEPARATOR.join(self.phrases) + SEPARATOR
+        # 코퍼스 안에서 각 문구가 시작하는 위치 (역방향 검색 결과를 문구로 바꿀 때 사용)
+        self._offsets = array('l')
+        position = 1
+        for phrase in self.phrases:
+            self._offsets.append(position)
+            position += len(phrase) + 1
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def find(self, text: str) -> List[str]:
+        """게시글과 일치하는 악성 문구 목록을 반환합니다. 빈 게시글은 일치하지 않는 것으로 봅니다."""
+        if not isinstance(text, str) or not self.phrases:
+            return []
+        text = normalize_phrase(text)
+        if not text:
+            return []
+        hits = self._automaton.search(text)
+        if SEPARATOR not in text:
+            position = self._corpus.find(text)
+            while position != -1:
+                index = bisect_right(self._offsets, position) - 1
+                hits.append(index)
+                if index + 1 >= len(self._offsets):
+                    break
+                position = self._corpus.find(text, self._offsets[index + 1])
+        return [self.phrases[index] for index in dict.fromkeys(hits)]
+
+    def contains(self, text: str) -> bool:
+        """악성 문구가 하나라도 일치하는지 확인합니다."""
+        if not isinstance(text, str) or not self.phrases:
+            return False
+        text = normalize_phrase(text)
+        if not text:
+            return False
+        if SEPARATOR not in text and text in self._corpus:
+            return True
+        return bool(self._automaton.search(text, first_only=True))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """컴파일된 인덱스를 파일로 저장합니다."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((INDEX_FORMAT_VERSION, self), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BadWordIndex":
+        """저장된 인덱스를 로드합니다. 포맷 버전이 다르면 ValueError를 발생시킵니다."""
+        with open(path, "rb") as f:
+            version, index = pickle.load(f)
+        if version != INDEX_FORMAT_VERSION or not isinstance(index, cls):
+            raise ValueError(f"인덱스 포맷 버전이 다릅니다: {version}")
+        return index
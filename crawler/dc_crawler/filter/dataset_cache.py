@@ -0,0 +1,156 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+import hashlib
+import unicodedata
+import json
+import zlib
+import io
+import re
+
+import pandas as pd
+import requests
+
+# 캐시 파일 포맷 버전 (전처리 방식이 바뀌면 올려서 캐시를 다시 만들게 합니다)
+CACHE_FORMAT_VERSION = 1
+
+# 데이터셋마다 컬럼 이름이 조금씩 달라서 후보를 둡니다.
+TEXT_COLUMNS = ("text", "content")
+LABEL_COLUMNS = ("label", "lable")
+MALICIOUS_LABEL = 0
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_phrase(text: str) -> str:
+    """문구를 NFC로 정규화하고 공백을 하나로 합칩니다."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def preprocess_dataset(raw: str) -> List[str]:
+    """데이터셋 CSV에서 악성 문구만 골라 정규화/중복 제거한 목록을 반환합니다."""
+    # 구분자가 쉼표/탭 중 무엇인지 자동으로 판단합니다.
+    df = pd.read_csv(io.StringIO(raw), sep=None, engine="python")
+    text_column = next((column for column in TEXT_COLUMNS if column in df.columns), None)
+    label_column = next((column for column in LABEL_COLUMNS if column in df.columns), None)
+    if text_column is None or label_column is None:
+        raise ValueError(f"데이터셋 컬럼을 찾을 수 없습니다: {list(df.columns)}")
+
+    texts = df.loc[pd.to_numeric(df[label_column], errors="coerce") == MALICIOUS_LABEL, text_column]
+    phrases = (normalize_phrase(text) for text in texts if isinstance(text, str))
+    return list(dict.fromkeys(phrase for phrase in phrases if phrase))
+
+
+class MaliciousDatasetCache:
+    """
+    악성댓글 데이터셋의 로컬 캐시.
+
+    처음 한 번만 내려받아 악성 문구만 남긴 압축 파일(phrases.bin)과 메타데이터(meta.json)로 저장하고,
+    이후에는 디스크에서만 읽습니다. revalidate=True일 때만 ETag/Last-Modified로 조건부 요청을 보냅니다.
+    source에는 http(s) URL이나 로컬 CSV 경로를 줄 수 있습니다.
+    """
+
+    def __init__(self, source: str, cache_dir: Union[str, Path], timeout: float = 10.0):
+        self.source = source
+        self.cache_dir = Path(cache_dir)
+        self.timeout = timeout
+        self.phrases_path = self.cache_dir / "phrases.bin"
+        self.meta_path = self.cache_dir / "meta.json"
+
+    def _is_remote(self) -> bool:
+        return urlparse(self.source).scheme in ("http", "https")
+
+    def read_meta(self) -> Dict:
+        """캐시 메타데이터를 반환합니다. 캐시가 없거나 다른 소스/포맷이면 빈 dict"""
+        try:
+            meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if meta.get("format") != CACHE_FORMAT_VERSION or meta.get("source") != self.source:
+            return {}
+        return meta
+
+    def cached_version(self) -> Optional[str]:
+        """네트워크 없이 현재 캐시된 데이터셋 버전을 반환합니다."""
+        if not self.phrases_path.exists():
+            return None
+        return self.read_meta().get("version")
+
+    def load(self, revalidate: bool = False) -> List[str]:
+        """
+        악성 문구 목록을 반환합니다.
+
+        캐시가 있으면 디스크에서 읽고, 없거나 revalidate=True이면 소스를 확인합니다.
+        소스를 가져오지 못하면 기존 캐시를 그대로 사용하고, 캐시도 없으면 빈 목록을 반환합니다.
+        """
+        meta = self.read_meta()
+        if meta and not revalidate and self.phrases_path.exists():
+            return self._read_phrases()
+
+        try:
+            self._refresh(meta)
+        except Exception as e:
+            print(f"악성댓글 데이터셋 갱신 실패: {str(e)}")
+            if not meta or not self.phrases_path.exists():
+                return []
+        return self._read_phrases()
+
+    def _refresh(self, meta: Dict) -> None:
+        if not self._is_remote():
+            path = Path(self.source[len("file://"):] if self.source.startswith("file://") else self.source)
+            stat = path.stat()
+            # 로컬 파일은 수정 시각과 크기로 변경 여부를 판단합니다.
+            validator = f"{stat.st_mtime_ns}-{stat.st_size}"
+            if meta.get("etag") == validator and self.phrases_path.exists():
+                return
+            self._write(preprocess_dataset(path.read_text(encoding="utf-8-sig")), {"etag": validator})
+            return
+
+        headers = {}
+        if meta and self.phrases_path.exists():
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = requests.get(self.source, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            print("악성댓글 데이터셋 변경 없음 (304)")
+            meta["checked_at"] = datetime.now().isoformat(timespec="seconds")
+            self._write_meta(meta)
+            return
+        response.raise_for_status()
+        # raw.githubusercontent.com은 charset 없이 text/plain을 돌려주므로 직접 UTF-8로 디코딩합니다.
+        self._write(preprocess_dataset(response.content.decode("utf-8-sig")), {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        })
+
+    def _read_phrases(self) -> List[str]:
+        data = zlib.decompress(self.phrases_path.read_bytes()).decode("utf-8")
+        return data.split("\n") if data else []
+
+    def _write(self, phrases: List[str], validators: Dict) -> None:
+        # 정규화 단계에서 줄바꿈이 모두 공백으로 바뀌므로 줄 단위로 저장할 수 있습니다.
+        data = "\n".join(phrases).encode("utf-8")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.phrases_path.with_suffix(".bin.tmp")
+        tmp_path.write_bytes(zlib.compress(data, 9))
+        tmp_path.replace(self.phrases_path)
+        now = datetime.now().isoformat(timespec="seconds")
+        self._write_meta({
+            "format": CACHE_FORMAT_VERSION,
+            "source": self.source,
+            "version": hashlib.sha256(data).hexdigest()[:16],
+            "count": len(phrases),
+            "fetched_at": now,
+            "checked_at": now,
+            **validators,
+        })
+        print(f"악성댓글 데이터셋 캐시 저장: {len(phrases)}개 문구")
+
+    def _write_meta(self, meta: Dict) -> None:
+        tmp_path = self.meta_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp_path.replace(self.meta_path)
@@ -0,0 +1,156 @@
+from selenium.common.exceptions import WebDriverException
+from time import sleep, perf_counter
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import threading
+import requests
+import logging
+import queue
+
+from config import FETCH_WORKERS, PIPELINE_QUEUE_SIZE, HTML_PARSER
+from crawler.dc_crawler.fetcher import Fetcher, BotCheckDetected, create_retry_policy
+from crawler.common.rate_limit import RetryPolicy, CircuitOpenError
+from crawler.common.html_parser import parse_html
+
+logger = logging.getLogger(__name__)
+
+# 단계 종료 신호
+_STOP = object()
+
+
+class ArticleJob(NamedTuple):
+    """목록 페이지에서 뽑아낸 게시글 요청 단위"""
+    gall_id: str
+    title: str
+    post_url: str
+    post_date: str
+    page: int = 0
+
+
+def extract_post_content(html: str) -> str:
+    """게시글 페이지에서 본문 텍스트를 추출합니다."""
+    soup = parse_html(html, HTML_PARSER)
+    write_div = soup.select_one("div.write_div")
+    return write_div.text.strip() if write_div else ""
+
+
+class ArticlePipeline:
+    """
+    목록 페이지(생산자) → 게시글 요청 워커 N개 → 파서 → 저장 단계를 크기 제한 큐로 연결합니다.
+
+    큐가 가득 차면 submit()이 막히기 때문에 목록 페이지를 앞서 읽어 나가지 않고,
+    호스트별 요청 간격은 워커들이 공유하는 Fetcher의 rate limiter가 지킵니다.
+    """
+
+    def __init__(self, fetcher_factory: Callable[[], Fetcher], store: Callable[[Tuple], None],
+                 workers: int = FETCH_WORKERS, queue_size: int = PIPELINE_QUEUE_SIZE,
+                 retry_policy: Optional[RetryPolicy] = None, deadline: Optional[float] = None,
+                 on_failed: Optional[Callable[[ArticleJob], None]] = None):
+        self.store = store
+        self.on_failed = on_failed
+        self.retry_policy = retry_policy or create_retry_policy()
+        # 크롤링 전체의 재시도 시간 예산이 끝나는 시각 (time.monotonic 기준)
+        self.deadline = deadline
+        self._fetch_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._parse_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._store_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._fetchers: List[Fetcher] = [fetcher_factory() for _ in range(workers)]
+        self._fetch_threads = [
+            threading.Thread(target=self._fetch_worker, args=(fetcher,), name=f"dc-fetch-{i}", daemon=True)
+            for i, fetcher in enumerate(self._fetchers)
+        ]
+        self._parse_thread = threading.Thread(target=self._parse_worker, name="dc-parse", daemon=True)
+        self._store_thread = threading.Thread(target=self._store_worker, name="dc-store", daemon=True)
+        self.stats: Dict[str, int] = {"submitted": 0, "fetched": 0, "failed": 0, "stored": 0}
+        self._stats_lock = threading.Lock()
+        self._started_at = 0.0
+
+    def __enter__(self) -> "ArticlePipeline":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def start(self) -> None:
+        self._started_at = perf_counter()
+        for thread in self._fetch_threads:
+            thread.start()
+        self._parse_thread.start()
+        self._store_thread.start()
+
+    def submit(self, job: ArticleJob) -> None:
+        """게시글 요청을 넣습니다. 큐가 가득 차면 자리가 날 때까지 기다립니다."""
+        self._count("submitted")
+        self._fetch_queue.put(job)
+
+    def close(self) -> None:
+        """남은 작업을 모두 처리한 뒤 단계를 순서대로 종료합니다."""
+        for _ in self._fetch_threads:
+            self._fetch_queue.put(_STOP)
+        for thread in self._fetch_threads:
+            thread.join()
+        self._parse_queue.put(_STOP)
+        self._parse_thread.join()
+        self._store_queue.put(_STOP)
+        self._store_thread.join()
+        for fetcher in self._fetchers:
+            fetcher.close()
+        elapsed = perf_counter() - self._started_at
+        logger.info(f"파이프라인 종료: {self.stats} ({elapsed:.1f}초)")
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _fetch(self, fetcher: Fetcher, url: str) -> Optional[str]:
+        attempts = self.retry_policy.max_attempts
+        for i in range(attempts):
+            try:
+                return fetcher.fetch(url)
+            except CircuitOpenError as e:
+                logger.error(f"게시글 로드 중단: {str(e)}")
+                return None
+            except (requests.RequestException, WebDriverException, BotCheckDetected) as e:
+                logger.error(f"게시글 로드 실패 (시도 {i+1}/{attempts}): {str(e)}")
+                delay = self.retry_policy.next_delay(i, self.deadline)
+                if delay is None:
+                    return None
+                sleep(delay)
+
+    def _fetch_worker(self, fetcher: Fetcher) -> None:
+        while True:
+            job = self._fetch_queue.get()
+            if job is _STOP:
+                return
+            html = self._fetch(fetcher, job.post_url)
+            if html is None:
+                self._count("failed")
+                if self.on_failed:
+                    self.on_failed(job)
+                continue
+            self._count("fetched")
+            self._parse_queue.put((job, html))
+
+    def _parse_worker(self) -> None:
+        while True:
+            item = self._parse_queue.get()
+            if item is _STOP:
+                return
+            job, html = item
+            try:
+                content = extract_post_content(html)
+            except Exception as e:
+                logger.error(f"게시글 파싱 실패 ({job.gall_id}): {str(e)}")
+                content = ""
+            self._store_queue.put((job.gall_id, job.title, content, job.post_date))
+
+    def _store_worker(self) -> None:
+        while True:
+            record = self._store_queue.get()
+            if record is _STOP:
+                return
+            try:
+                self.store(record)
+                self._count("stored")
+            except Exception as e:
+                logger.error(f"게시글 저장 실패 ({record[0]}): {str(e)}")
@@ -0,0 +1,209 @@
+import os
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from config import POSTS_DB_FILE, STORE_BATCH_SIZE
+
+POST_COLUMNS = ["id", "title", "content", "date"]
+REPLY_COLUMNS = ["id", "reply_id", "reply_content", "reply_date"]
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    id         INTEGER NOT NULL UNIQUE,
+    title      TEXT NOT NULL,
+    content    TEXT NOT NULL,
+    date       TEXT NOT NULL,
+    crawled_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_date ON posts (date);
+
+CREATE TABLE IF NOT EXISTS replies (
+    seq           INTEGER PRIMARY KEY AUTOINCREMENT,
+    id            INTEGER NOT NULL,
+    reply_id      TEXT NOT NULL,
+    reply_content TEXT NOT NULL,
+    reply_date    TEXT NOT NULL,
+    UNIQUE (id, reply_id)
+);
+
+CREATE TABLE IF NOT EXISTS consumer_offsets (
+    name     TEXT PRIMARY KEY,
+    last_seq INTEGER NOT NULL
+);
+"""
+
+# 같은 게시글을 다시 수집하면 seq(추가 순서)는 그대로 두고 바뀐 내용만 갱신합니다.
+_UPSERT_POST = """
+INSERT INTO posts (id, title, content, date, crawled_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET title = excluded.title, content = excluded.content, date = excluded.date
+WHERE posts.title != excluded.title OR posts.content != excluded.content OR posts.date != excluded.date
+"""
+_UPSERT_REPLY = """
+INSERT INTO replies (id, reply_id, reply_content, reply_date) VALUES (?, ?, ?, ?)
+ON CONFLICT (id, reply_id) DO NOTHING
+"""
+
+
+def _numeric_ids(rows: Iterable[Tuple], kind: str) -> Iterator[Tuple]:
+    """글 번호가 숫자가 아닌 행은 로그만 남기고 건너뜁니다 (한 행 때문에 배치 전체가 실패하지 않도록)."""
+    for row in rows:
+        if str(row[0]).strip().isdigit():
+            yield row
+        else:
+            logger.warning(f"글 번호가 숫자가 아닌 {kind}을 건너뜁니다: {row[0]!r}")
+
+
+class PostStore:
+    """
+    게시글 id로 색인된 SQLite(WAL) 게시글 저장소.
+
+    실행할 때마다 CSV를 새로 쓰는 대신 게시글을 계속 누적하고, 같은 id를 다시 저장해도 중복되지 않습니다.
+    후속 필터는 consumer 이름별로 마지막으로 읽은 위치를 저장해서 새로 추가된 행만 읽을 수 있습니다.
+    """
+
+    def __init__(self, db_path: str = POSTS_DB_FILE, batch_size: int = STORE_BATCH_SIZE,
+                 on_flush: Optional[Callable[[List[Tuple]], None]] = None):
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.db_path = db_path
+        self.batch_size = batch_size
+        # 버퍼의 게시글이 커밋된 뒤 호출됩니다 (체크포인트 갱신용).
+        self.on_flush = on_flush
+        # 파이프라인의 저장 스레드에서도 쓰기 때문에 스레드 검사를 끄고 잠금으로 보호합니다.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._pending: List[Tuple] = []
+
+    def __enter__(self) -> "PostStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
+
+    # 쓰기
+
+    def add_post(self, post: Tuple) -> None:
+        """게시글 하나를 버퍼에 넣고, batch_size만큼 모이면 한 트랜잭션으로 씁니다."""
+        with self._lock:
+            self._pending.append(post)
+            if len(self._pending) < self.batch_size:
+                return
+        self.flush()
+
+    def flush(self) -> int:
+        """버퍼에 남은 게시글을 씁니다. 쓰기에 실패하면 게시글을 버퍼 앞에 되돌려 놓고 예외를 다시 발생시킵니다."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            saved = self.upsert_posts(pending)
+        except Exception:
+            # DB 잠금, 디스크 부족 등으로 실패하면 다음 flush에서 다시 쓰도록 남겨 둡니다 (체크포인트도 그때 갱신).
+            with self._lock:
+                self._pending[:0] = pending
+            raise
+        if self.on_flush:
+            self.on_flush(pending)
+        return saved
+
+    def upsert_posts(self, posts: Iterable[Tuple]) -> int:
+        """(id, title, content, date) 튜플들을 한 트랜잭션으로 저장합니다. 반영된 행 수를 반환합니다."""
+        crawled_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [(int(gall_id), title, content or "", date, crawled_at)
+                for gall_id, title, content, date in _numeric_ids(posts, "게시글")]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(_UPSERT_POST, rows)
+            return self._conn.total_changes - before
+
+    def upsert_replies(self, replies: Iterable[Tuple]) -> int:
+        """(id, reply_id, reply_content, reply_date) 튜플들을 저장합니다. 이미 있는 댓글은 건너뜁니다."""
+        rows = [(int(gall_id), str(reply_id), content or "", date)
+                for gall_id, reply_id, content, date in _numeric_ids(replies, "댓글")]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(_UPSERT_REPLY, rows)
+            return self._conn.total_changes - before
+
+    # 읽기
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def has_post(self, gall_id: str) -> bool:
+        if not str(gall_id).isdigit():
+            return False
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM posts WHERE id = ?", (int(gall_id),)).fetchone() is not None
+
+    def posts_between(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """start 이상 end 미만 날짜의 게시글을 date 인덱스로 조회합니다."""
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT id, title, content, date FROM posts WHERE date >= ? AND date < ? ORDER BY date",
+                self._conn,
+                params=(start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S")),
+            )
+
+    def last_seq(self, consumer: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT last_seq FROM consumer_offsets WHERE name = ?", (consumer,)).fetchone()
+        return row[0] if row else 0
+
+    def iter_new_posts(self, consumer: str, chunksize: int = 10000) -> Iterator[Tuple[pd.DataFrame, int]]:
+        """
+        consumer가 마지막으로 처리한 뒤 추가된 게시글을 chunksize 행씩 돌려줍니다.
+
+        각 청크와 함께 그 청크의 마지막 seq를 주므로, 처리가 끝난 뒤 ack()로 위치를 저장하면 됩니다.
+        """
+        after = self.last_seq(consumer)
+        while True:
+            with self._lock:
+                chunk = pd.read_sql_query(
+                    "SELECT seq, id, title, content, date FROM posts WHERE seq > ? ORDER BY seq LIMIT ?",
+                    self._conn,
+                    params=(after, chunksize),
+                )
+            if chunk.empty:
+                return
+            after = int(chunk["seq"].iloc[-1])
+            yield chunk.drop(columns="seq"), after
+
+    def ack(self, consumer: str, last_seq: int) -> None:
+        """consumer가 last_seq까지 처리했음을 기록합니다."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO consumer_offsets (name, last_seq) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET last_seq = MAX(last_seq, excluded.last_seq)",
+                (consumer, last_seq),
+            )
+
+    def export_csv(self, path: str, start: Optional[datetime] = None) -> int:
+        """기존 CSV 형식(id, title, content, date)으로 내보냅니다."""
+        query = "SELECT id, title, content, date FROM posts"
+        params: Tuple = ()
+        if start:
+            query += " WHERE date >= ?"
+            params = (start.strftime("%Y-%m-%d %H:%M:%S"),)
+        with self._lock:
+            df = pd.read_sql_query(query + " ORDER BY id", self._conn, params=params)
+        df.to_csv(path, index=False, encoding="utf-8")
+        return len(df)
@@ -0,0 +1,181 @@
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+import asyncio
+import importlib
+import os
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+# 실행: python ./nexon_crawler/async_runner.py [notice|event|update|dc ...]
+# 여러 게시판을 하나의 이벤트 루프에서 동시에 확인하고, 새 글의 상세 페이지도 게시판 구분 없이 한꺼번에 받아 옵니다.
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from crawler.nexon_crawler.config import (
+    HTML_PARSER, ASYNC_HOST_CONCURRENCY, ASYNC_REQUEST_TIMEOUT
+)
+from crawler.nexon_crawler.utils.utils import (
+    setup_logging, setup_session, fetch_html, get_http_cache, get_event_index, get_crawl_state, retry_policy
+)
+from crawler.nexon_crawler.utils.screenshot_utils import BrowserPool
+from crawler.nexon_crawler.utils.image_encoder import shutdown_encoder
+from crawler.nexon_crawler.utils.discord_dispatcher import DiscordDispatcher
+from crawler.nexon_crawler.utils.notification_outbox import NotificationOutbox
+from crawler.nexon_crawler.utils.list_filter import prefilter_rows
+from crawler.nexon_crawler.probe import BOARDS, Board
+from crawler.common.html_parser import parse_html
+from crawler.common.list_extract import extract_nexon_rows
+from crawler.common.rate_limit import CircuitOpenError, DeadlineExceeded
+from crawler.common.transport import timing_stats
+
+logging = setup_logging()
+
+# DC 크롤러는 자체 config 모듈을 쓰므로 같은 프로세스에서 import하지 않고 별도 프로세스로 실행합니다.
+DC_CRAWLER_SCRIPT = Path(__file__).parent.parent / "dc_crawler" / "dc_crawler.py"
+
+
+class AsyncBoardRunner:
+    """
+    넥슨 게시판(과 DC 갤러리)을 동시에 크롤링하는 비동기 러너.
+
+    HTTP 요청은 기존 requests 세션을 스레드에서 실행하고, 호스트별 세마포어로 동시 요청 수를 제한합니다.
+    응답마다 sleep하는 대신 동시 요청 수로 부하를 조절하므로, 전체 소요 시간은 가장 느린 게시판에 맞춰집니다.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, browser_pool: Optional[BrowserPool] = None,
+                 dispatcher: Optional[DiscordDispatcher] = None, outbox: Optional[NotificationOutbox] = None,
+                 host_concurrency: int = ASYNC_HOST_CONCURRENCY, timeout: tuple = ASYNC_REQUEST_TIMEOUT):
+        self.session = session or setup_session()
+        # 모든 게시판이 같은 크롬 풀을 나눠 쓰므로 동시에 뜨는 크롬 수는 풀 크기로 제한됩니다.
+        self.browser_pool = browser_pool or BrowserPool()
+        # 여러 게시판의 알림이 같은 발송기에서 묶여 나갑니다.
+        self.dispatcher = dispatcher or DiscordDispatcher()
+        self.outbox = outbox or NotificationOutbox()
+        self.host_concurrency = host_concurrency
+        self.timeout = timeout
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.deadline: Optional[float] = None
+
+    def _semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.host_concurrency)
+        return self._semaphores[host]
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """페이지 HTML을 가져옵니다. 실패하면 재시도하고, 끝내 실패하면 None을 반환합니다."""
+        for i in range(retry_policy.max_attempts):
+            try:
+                # 요청 간격은 크롤러들과 공유하는 호스트별 속도 조절기가 정합니다.
+                async with self._semaphore(url):
+                    return await asyncio.to_thread(fetch_html, url, self.session, self.timeout, self.deadline)
+            except (CircuitOpenError, DeadlineExceeded) as e:
+                logging.error(f"페이지 로드 중단: {url} {str(e)}")
+                return None
+            except Exception as e:
+                logging.error(f"페이지 로드 실패 (시도 {i+1}/{retry_policy.max_attempts}): {url} {str(e)}")
+                delay = retry_policy.next_delay(i, self.deadline)
+                if delay is None:
+                    return None
+                await asyncio.sleep(delay)
+
+    async def run_board(self, name: str) -> None:
+        """목록을 받아 새 글의 상세 페이지를 동시에 가져온 뒤, 기존 크롤러로 스크린샷/알림을 처리합니다."""
+        board = BOARDS[name]
+        started = time.perf_counter()
+        html = await self.fetch(board.url)
+        if html is None:
+            logging.error(f"[{name}] 목록 페이지를 가져오는데 실패했습니다")
+            return
+
+        rows = extract_nexon_rows(html, HTML_PARSER) or []
+        # 크롤러와 같은 기준으로 목록 정보만 보고 미리 받을 상세 페이지를 고릅니다.
+        state = get_crawl_state().get(name)
+        seen_ids = state.seen | self.outbox.known_ids(name, [row.id for row in rows if row.id])
+        prefiltered = prefilter_rows(name, rows, state.watermark, seen_ids)
+        new_rows = prefiltered.rows
+        if not new_rows:
+            # 크롤러를 실행하지 않으므로 크롤러가 하던 기록을 여기서 합니다:
+            # 종료/형식 오류 글은 처리 완료로 남기고, 이벤트 기간 색인은 새 글이 없어도 최신으로 유지합니다.
+            if name == "event" and rows:
+                get_event_index().add_rows(rows)
+            if rows:
+                get_crawl_state().commit(name, [row.id for row in rows], prefiltered.settled_ids)
+            logging.info(f"[{name}] 새로운 글이 없습니다, {prefiltered.describe()} ({time.perf_counter() - started:.2f}초)")
+            return
+
+        urls = [f"{board.url}/{row.id}" for row in new_rows]
+        pages = await asyncio.gather(*(self.fetch(url) for url in urls))
+        logging.info(
+            f"[{name}] 새 글 {len(new_rows)}개 상세 페이지 수신, {prefiltered.describe()} ({time.perf_counter() - started:.2f}초)"
+        )
+
+        prefetched = {url: page for url, page in zip(urls, pages) if page}
+        await asyncio.to_thread(self._run_crawler, board, html, prefetched)
+        logging.info(f"[{name}] 완료 ({time.perf_counter() - started:.2f}초)")
+
+    def _run_crawler(self, board: Board, html: str, prefetched: Dict[str, str]) -> None:
+        crawler_class = getattr(importlib.import_module(board.crawler_module), board.crawler_class)
+        crawler = crawler_class(session=self.session, browser_pool=self.browser_pool, dispatcher=self.dispatcher,
+                                outbox=self.outbox)
+        cache = get_http_cache()
+        crawler.prefetched_pages = {
+            url: cache.parsed(url, page, lambda html: parse_html(html, HTML_PARSER)) for url, page in prefetched.items()
+        }
+        crawler.crawl(html)
+
+    async def run_dc(self) -> None:
+        started = time.perf_counter()
+        env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [project_root, os.getenv("PYTHONPATH")]))}
+        # DC 크롤러의 데이터/설정 경로는 crawler/ 기준이므로 그 디렉터리에서 실행합니다.
+        process = await asyncio.create_subprocess_exec(sys.executable, str(DC_CRAWLER_SCRIPT),
+                                                       cwd=str(DC_CRAWLER_SCRIPT.parent.parent), env=env)
+        returncode = await process.wait()
+        logging.info(f"[dc] 종료 코드 {returncode} ({time.perf_counter() - started:.2f}초)")
+
+    async def run(self, names: List[str]) -> None:
+        started = time.perf_counter()
+        self.deadline = retry_policy.deadline()
+        tasks = [self.run_dc() if name == "dc" else self.run_board(name) for name in names]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logging.error(f"[{name}] 실행 실패: {str(result)}")
+        if "event" in names:
+            get_event_index().enqueue_reminders(self.outbox)
+        # 모든 게시판의 알림(과 지난 실행에서 재시도 시각이 된 알림)을 한꺼번에 보냅니다.
+        await asyncio.to_thread(self.outbox.drain, self.dispatcher)
+        get_http_cache().log_stats()
+        timing_stats.log()
+        logging.info(f"전체 완료 ({time.perf_counter() - started:.2f}초)")
+
+
+def main(argv: List[str]) -> int:
+    available = list(BOARDS) + ["dc"]
+    # DC는 END_DATE까지 과거 글을 훑는 긴 작업이라 이름을 지정했을 때만 함께 실행합니다.
+    names = [arg for arg in argv if not arg.startswith("--")] or list(BOARDS)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        logging.error(f"알 수 없는 게시판: {', '.join(unknown)} (가능: {', '.join(available)})")
+        return 2
+
+    runner = AsyncBoardRunner()
+    try:
+        asyncio.run(runner.run(names))
+    finally:
+        runner.browser_pool.close()
+        shutdown_encoder()
+        runner.dispatcher.close()
+        runner.outbox.close()
+        runner.session.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -17,6 +17,25 @@ BASE_URL: Final[str] = "https://mabinogimobile.nexon.com"
 # 크롤링 설정
 SLEEP_TIME: Final[float] = 1.0
 MAX_RETRIES: Final[int] = 2
+# 요청 타임아웃 (연결, 읽기) 초. 연결 시간에는 DNS 조회도 포함됩니다.
+REQUEST_TIMEOUT: Final[tuple] = (3.05, 10.0)
+# 연결 풀 크기 (비동기 러너의 호스트별 동시 요청 수보다 크게), HTTP/2 사용 (httpx[http2]가 설치된 경우)
+HTTP_POOL_SIZE: Final[int] = 8
+HTTP2_ENABLED: Final[bool] = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+HTTP2_HOSTS: Final[tuple] = ("mabinogimobile.nexon.com",)
+# 호스트별 요청 속도 (초당 요청 수). 응답 시간, 429/503, 차단 페이지를 보고 이 범위 안에서 조절합니다 (AIMD).
+RATE_INITIAL: Final[float] = 1 / SLEEP_TIME
+RATE_MIN: Final[float] = 0.2
+RATE_MAX: Final[float] = float(os.getenv("RATE_MAX", "4.0"))
+RATE_BURST: Final[float] = 2.0
+# 재시도: SLEEP_TIME * 2부터 지수 백오프(jitter 포함), 한 번의 크롤링이 요청/재시도에 쓸 수 있는 시간 예산 (초)
+RETRY_MAX_DELAY: Final[float] = 30.0
+CRAWL_DEADLINE: Final[float] = float(os.getenv("CRAWL_DEADLINE", "300"))
+# 연속 실패가 이만큼이면 BREAKER_COOLDOWN초 동안 해당 호스트 요청을 멈춤
+BREAKER_THRESHOLD: Final[int] = 5
+BREAKER_COOLDOWN: Final[float] = 120.0
+# HTML 파서 백엔드 (auto | selectolax | lxml | html.parser)
+HTML_PARSER: Final[str] = os.getenv("HTML_PARSER", "auto")
 USER_AGENT: Final[str] = 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_7_1 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.2 Mobile/15E148 Safari/604.1'
 
 # 파일 경로
@@ -25,20 +44,78 @@ OUTPUT_DIR: Final[Path] = BASE_DIR / "output"
 # 공지사항 크롤러 설정
 NOTICE_URL: Final[str] = f"{BASE_URL}/News/Notice"
 NOTICE_CONTENTS_FILE: Final[Path] = OUTPUT_DIR / "notice_contents.json"
-NOTICE_IMAGES_DIR: Final[Path] = OUTPUT_DIR / "notice_images"
-NOTICE_LAST_ID_FILE = BASE_DIR / "notice_latest_id.json"
+NOTICE_LAST_ID_FILE = BASE_DIR / "notice_latest_id.json"  # 예전 최신 ID 파일 (크롤링 상태 저장소로 한 번 가져옴)
 
 # 이벤트 크롤러 설정
 EVENT_URL: Final[str] = f"{BASE_URL}/News/Events"
 EVENT_CONTENTS_FILE: Final[Path] = OUTPUT_DIR / "event_contents.json"
-EVENT_IMAGES_DIR: Final[Path] = OUTPUT_DIR / "event_images"
-EVENT_LAST_ID_FILE = BASE_DIR / "event_latest_id.json"
+EVENT_LAST_ID_FILE = BASE_DIR / "event_latest_id.json"  # 예전 최신 ID 파일 (크롤링 상태 저장소로 한 번 가져옴)
+# 이벤트 기간 색인 (진행 중/종료 임박 이벤트 조회, 종료 임박 알림)
+EVENT_INDEX_FILE: Final[Path] = OUTPUT_DIR / "event_index.db"
+EVENT_REMINDER_HOURS: Final[float] = float(os.getenv("EVENT_REMINDER_HOURS", "24"))  # 종료까지 이 시간 이내면 알림
+EVENT_INDEX_RETENTION_DAYS: Final[int] = 30  # 종료된 지 이만큼 지난 기간은 색인에서 삭제
 
 # 업데이트 크롤러 설정
 UPDATE_URL = "https://mabinogimobile.nexon.com/News/Update"
 UPDATE_CONTENTS_FILE = OUTPUT_DIR / "update_contents.json"
-UPDATE_IMAGES_DIR = OUTPUT_DIR / "updates" 
-UPDATE_LAST_ID_FILE = BASE_DIR / "update_latest_id.json"
+UPDATE_LAST_ID_FILE = BASE_DIR / "update_latest_id.json"  # 예전 최신 ID 파일 (크롤링 상태 저장소로 한 번 가져옴)
+
+# 크롤링 상태 저장소 (게시판별 최신 ID, 처리한 글 id, 마지막 확인/프로브 상태)
+CRAWL_STATE_FILE: Final[Path] = BASE_DIR / "crawl_state.db"
+
+# 변경 감지 프로브 설정
+PROBE_STATE_FILE: Final[Path] = BASE_DIR / "probe_state.json"  # 예전 프로브 상태 파일 (크롤링 상태 저장소로 한 번 가져옴)
+PROBE_TIMEOUT: Final[float] = 5.0
+
+# HTTP 캐시 설정 (ETag/Last-Modified로 조건부 요청, 304면 저장된 본문 사용)
+HTTP_CACHE_DIR: Final[Path] = OUTPUT_DIR / "http_cache"
+HTTP_CACHE_MAX_BYTES: Final[int] = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))  # 압축된 본문 합계
+# URL 접두어별로 다시 확인하지 않고 저장된 본문을 쓰는 시간 (초). 목록 페이지는 새 글 감지용이라 항상 확인합니다.
+HTTP_CACHE_TTL: Final[dict] = {
+    f"{NOTICE_URL}/": 3600.0,
+    f"{EVENT_URL}/": 3600.0,
+    f"{UPDATE_URL}/": 3600.0,
+}
+
+# 데몬 설정 (python ./nexon_crawler/daemon.py)
+DAEMON_INTERVAL: Final[float] = float(os.getenv("DAEMON_INTERVAL", "300"))  # 게시판별 확인 주기 (초)
+DAEMON_JITTER: Final[float] = float(os.getenv("DAEMON_JITTER", "30"))  # 주기에 더하는 무작위 지연 (초)
+DAEMON_START_HOUR: Final[int] = int(os.getenv("DAEMON_START_HOUR", "6"))  # 운영 시작 시각 (포함)
+DAEMON_END_HOUR: Final[int] = int(os.getenv("DAEMON_END_HOUR", "22"))  # 운영 종료 시각 (미포함)
+
+# 비동기 러너 설정 (python ./nexon_crawler/async_runner.py)
+ASYNC_HOST_CONCURRENCY: Final[int] = 4  # 호스트별 동시 요청 수
+ASYNC_REQUEST_TIMEOUT: Final[tuple] = REQUEST_TIMEOUT
+
+# 스크린샷 설정
+SCREENSHOT_POOL_SIZE: Final[int] = int(os.getenv("SCREENSHOT_POOL_SIZE", "3"))  # 동시에 띄우는 헤드리스 크롬 수
+SCREENSHOT_RECYCLE_AFTER: Final[int] = 50  # 이 횟수만큼 찍은 크롬은 재시작
+# 캡처 방식: clip(상단 영역을 CDP로 한 번에) | element(본문 요소 영역만) | resize(창 크기 조절, 예전 방식)
+SCREENSHOT_CAPTURE_MODE: Final[str] = os.getenv("SCREENSHOT_CAPTURE_MODE", "clip")
+SCREENSHOT_HEIGHT_RATIO: Final[float] = 0.5  # clip/resize 방식에서 캡처할 페이지 높이 비율
+SCREENSHOT_READY_TIMEOUT: Final[float] = 10.0  # 페이지 준비를 기다리는 최대 시간 (초)
+SCREENSHOT_NETWORK_IDLE: Final[float] = 0.5  # 이 시간 동안 새 리소스 요청이 없으면 네트워크가 잠잠하다고 봄 (초)
+# 게시판별 본문 컨테이너 (준비 판단 기준, 없으면 문서 전체를 봅니다)
+SCREENSHOT_READY_SELECTORS: Final[dict] = {
+    "notice": ".view_area, .board_view, article",
+    "event": ".view_area, .board_view, article",
+    "update": ".view_area, .board_view, article",
+}
+SCREENSHOT_READY_STATS_FILE: Final[Path] = OUTPUT_DIR / "screenshot_ready_stats.json"
+SCREENSHOT_READY_SAMPLES: Final[int] = 200  # 게시판별로 보관하는 최근 준비 시간 수
+
+# 스크린샷 저장소 (세 게시판 공용, 예산을 넘으면 오래 사용하지 않은 것부터 삭제)
+SCREENSHOT_STORE_DIR: Final[Path] = OUTPUT_DIR / "screenshots"
+SCREENSHOT_STORE_MAX_BYTES: Final[int] = int(os.getenv("SCREENSHOT_STORE_MAX_BYTES", str(200 * 1024 * 1024)))
+SCREENSHOT_STORE_MAX_ITEMS: Final[int] = int(os.getenv("SCREENSHOT_STORE_MAX_ITEMS", "300"))
+
+# 업로드 이미지 인코딩 설정 (스크린샷을 바이트 예산 안으로 줄여서 디스코드에 올립니다)
+IMAGE_BYTE_BUDGET: Final[int] = int(os.getenv("IMAGE_BYTE_BUDGET", str(1024 * 1024)))
+# (포맷, 품질) 단계: 예산에 들어올 때까지 차례로 시도
+IMAGE_ENCODE_LADDER: Final[tuple] = (("WEBP", 85), ("WEBP", 70), ("JPEG", 80), ("WEBP", 55), ("JPEG", 60))
+# 품질을 낮춰도 안 들어오면 이 비율로 줄여서 다시 시도
+IMAGE_ENCODE_SCALES: Final[tuple] = (1.0, 0.75, 0.5)
+IMAGE_ENCODE_WORKERS: Final[int] = 2  # 인코딩 프로세스 수
 
 # 디버그 설정
 DEBUG_DIR: Final[Path] = BASE_DIR / "debug"
@@ -49,6 +126,22 @@ GPT_API_KEY: Final[str] = os.getenv("GPT_API_KEY", "")
 # 디스코드 웹훅 URL 설정
 DISCORD_WEBHOOK_URL: Final[str] = os.getenv("DISCORD_WEBHOOK_URL", "")
 
+# 디스코드 발송 설정
+DISCORD_BATCH_WINDOW: Final[float] = 1.0  # 이 시간 동안 모인 알림을 한 요청으로 묶음 (초)
+DISCORD_DIGEST_THRESHOLD: Final[int] = 15  # 한 번에 이만큼 몰리면 제목/링크만 모은 요약으로 전송
+DISCORD_MAX_UPLOAD_BYTES: Final[int] = 8 * 1024 * 1024  # 메시지 하나의 첨부 파일 합계 제한
+DISCORD_MAX_RETRIES: Final[int] = 5
+DISCORD_TIMEOUT: Final[float] = 15.0
+
+# 알림 보관함 설정 (알림을 먼저 저장하고, 전송 실패는 크롤링과 별개로 재시도합니다)
+OUTBOX_FILE: Final[Path] = OUTPUT_DIR / "notification_outbox.db"
+OUTBOX_MAX_ATTEMPTS: Final[int] = 8  # 이만큼 실패하면 dead 상태로 옮기고 더 보내지 않음
+OUTBOX_BACKOFF_BASE: Final[float] = 30.0  # 재시도 간격: base * 2^(시도 횟수-1), 최대 OUTBOX_BACKOFF_MAX (초)
+OUTBOX_BACKOFF_MAX: Final[float] = 3600.0
+OUTBOX_LEASE: Final[float] = 300.0  # 꺼내 간 알림을 다른 전송 작업이 다시 가져가지 않는 시간 (초)
+OUTBOX_POLL_INTERVAL: Final[float] = 30.0  # 데몬의 전송 작업이 보관함을 확인하는 주기 (초)
+OUTBOX_RETENTION_DAYS: Final[int] = 7  # 전송 완료된 알림 기록 보관 기간
+
 # 로깅 설정
 LOG_FORMAT: Final[str] = '%(asctime)s - %(levelname)s - %(message)s'
 LOG_LEVEL: Final[str] = "DEBUG" if DEBUG else "INFO"
\ No newline at end of file
@@ -0,0 +1,178 @@
+from typing import List, Tuple
+import heapq
+import random
+import signal
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 실행: python ./nexon_crawler/daemon.py [notice|event|update ...]
+# cron으로 크롤러 스크립트를 매번 띄우는 대신, 한 프로세스가 세션과 브라우저를 유지하면서 게시판을 주기적으로 확인합니다.
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from crawler.nexon_crawler.config import (
+    DAEMON_INTERVAL, DAEMON_JITTER, DAEMON_START_HOUR, DAEMON_END_HOUR
+)
+from crawler.nexon_crawler.utils.utils import setup_logging, setup_session, get_http_cache, get_event_index
+from crawler.common.transport import timing_stats
+from crawler.nexon_crawler.utils.screenshot_utils import BrowserPool
+from crawler.nexon_crawler.utils.image_encoder import shutdown_encoder
+from crawler.nexon_crawler.utils.discord_dispatcher import DiscordDispatcher
+from crawler.nexon_crawler.utils.notification_outbox import NotificationOutbox, OutboxWorker
+from crawler.nexon_crawler.probe import (
+    BOARDS, setup_probe_session, load_probe_state, save_probe_state, probe_board, run_crawler
+)
+
+logging = setup_logging()
+
+
+class RadarDaemon:
+    """
+    넥슨 게시판 감시 데몬.
+
+    - 프로브용 세션(조건부 요청)과 크롤링용 세션을 하나씩 만들어 모든 게시판이 재사용합니다.
+    - 크롬 풀은 새 글이 있어 스크린샷이 필요할 때 처음 실행되고, 운영 시간이 끝나면 종료합니다.
+    - 게시판마다 다음 실행 시각을 힙으로 관리하며, 주기에 무작위 지연(jitter)을 더합니다.
+    - 크롤링이 길어져 실행이 밀리면 밀린 횟수만큼 연달아 돌지 않고 한 번으로 합칩니다.
+    """
+
+    def __init__(self, names: List[str], interval: float = DAEMON_INTERVAL, jitter: float = DAEMON_JITTER,
+                 start_hour: int = DAEMON_START_HOUR, end_hour: int = DAEMON_END_HOUR):
+        self.names = names
+        self.interval = interval
+        self.jitter = jitter
+        self.start_hour = start_hour
+        self.end_hour = end_hour
+        self.probe_session = setup_probe_session()
+        self.crawl_session = setup_session()
+        self.browser_pool = BrowserPool()
+        self.dispatcher = DiscordDispatcher()
+        # 크롤러는 알림을 보관함에 넣기만 하고, 전송과 재시도는 전송 작업 스레드가 따로 합니다.
+        self.outbox = NotificationOutbox()
+        self.outbox_worker = OutboxWorker(self.outbox, self.dispatcher)
+        # 종료 임박 이벤트는 이벤트 게시판을 확인할 때마다 기간 색인에서 바로 찾습니다.
+        self.event_index = get_event_index()
+        self.event_index.prune()
+        self._stop = threading.Event()
+        # (실행 시각, 주기 기준 시각, 게시판 이름)
+        self._schedule: List[Tuple[float, float, str]] = []
+
+    def stop(self, *_) -> None:
+        logging.info("데몬 종료 요청")
+        self._stop.set()
+
+    def in_operating_hours(self, now: datetime) -> bool:
+        if self.start_hour <= self.end_hour:
+            return self.start_hour <= now.hour < self.end_hour
+        # 자정을 넘기는 운영 시간 (예: 22시~6시)
+        return now.hour >= self.start_hour or now.hour < self.end_hour
+
+    def next_window_start(self, now: datetime) -> datetime:
+        """다음 운영 시작 시각을 반환합니다."""
+        start = now.replace(hour=self.start_hour, minute=0, second=0, microsecond=0)
+        return start if start > now else start + timedelta(days=1)
+
+    def _push(self, base: float, name: str) -> None:
+        heapq.heappush(self._schedule, (base + random.uniform(0, self.jitter), base, name))
+
+    def run(self) -> None:
+        logging.info(f"데몬 시작: {', '.join(self.names)} (주기 {self.interval:.0f}초, "
+                     f"운영 {self.start_hour}시~{self.end_hour}시)")
+        now = time.time()
+        for name in self.names:
+            self._push(now, name)
+
+        try:
+            while not self._stop.is_set():
+                due, base, name = self._schedule[0]
+                delay = due - time.time()
+                if delay > 0:
+                    # 종료 요청이 오면 바로 깨어납니다.
+                    self._stop.wait(delay)
+                    continue
+                heapq.heappop(self._schedule)
+
+                now_dt = datetime.now()
+                if not self.in_operating_hours(now_dt):
+                    if self.browser_pool.active:
+                        logging.info("운영 시간이 아니므로 크롬을 종료합니다")
+                        self.browser_pool.close()
+                    self._push(self.next_window_start(now_dt).timestamp(), name)
+                    continue
+
+                self._poll(name)
+
+                # 주기 기준 시각을 유지해서 jitter가 누적되지 않게 하고, 밀린 실행은 한 번으로 합칩니다.
+                next_base = base + self.interval
+                now = time.time()
+                if next_base <= now:
+                    skipped = int((now - next_base) // self.interval) + 1
+                    logging.info(f"[{name}] 실행이 밀려 {skipped}회를 한 번으로 합칩니다")
+                    next_base = now
+                self._push(next_base, name)
+        finally:
+            self.close()
+
+    def _poll(self, name: str) -> None:
+        """게시판 하나를 조건부 요청으로 확인하고, 새 글이 있을 때만 전체 크롤러를 실행합니다. 이벤트 게시판이면 종료 임박 알림도 등록합니다."""
+        board = BOARDS[name]
+        try:
+            state = load_probe_state(name)
+            changed = probe_board(name, board, self.probe_session, state)
+            save_probe_state(name, state)
+        except Exception as e:
+            logging.error(f"[{name}] 프로브 실패: {str(e)}")
+            return
+        if changed:
+            logging.info(f"[{name}] 새 글 감지, 크롤러 실행")
+            try:
+                run_crawler(name, board, session=self.crawl_session, browser_pool=self.browser_pool,
+                            dispatcher=self.dispatcher, outbox=self.outbox)
+            except Exception as e:
+                logging.error(f"[{name}] 크롤러 실행 실패: {str(e)}")
+
+        reminders = 0
+        if name == "event":
+            try:
+                reminders = self.event_index.enqueue_reminders(self.outbox)
+            except Exception as e:
+                logging.error(f"[{name}] 종료 임박 알림 등록 실패: {str(e)}")
+        if changed or reminders:
+            self.outbox_worker.wake()
+
+    def close(self) -> None:
+        self.browser_pool.close()
+        shutdown_encoder()
+        self.outbox_worker.close()
+        self.dispatcher.close()
+        self.outbox.close()
+        self.event_index.close()
+        get_http_cache().log_stats()
+        timing_stats.log()
+        self.probe_session.close()
+        self.crawl_session.close()
+        logging.info("데몬 종료")
+
+
+def main(argv: List[str]) -> int:
+    names = [arg for arg in argv if not arg.startswith("--")] or list(BOARDS)
+    unknown = [name for name in names if name not in BOARDS]
+    if unknown:
+        logging.error(f"알 수 없는 게시판: {', '.join(unknown)} (가능: {', '.join(BOARDS)})")
+        return 2
+
+    daemon = RadarDaemon(names)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    daemon.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
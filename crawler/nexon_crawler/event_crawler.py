@@ -1,9 +1,10 @@
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
 import sys
 from pathlib import Path
 from datetime import datetime
 from selenium import webdriver
 import time
+import requests
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = str(Path(__file__).parent.parent.parent)
@@ -12,162 +13,186 @@ if project_root not in sys.path:
 
 from crawler.nexon_crawler.config import (
     EVENT_URL, EVENT_CONTENTS_FILE,
-    DEBUG_DIR, EVENT_IMAGES_DIR,
-    EVENT_LAST_ID_FILE
+    DEBUG_DIR,
+    HTML_PARSER
 )
 from crawler.nexon_crawler.utils.utils import (
     setup_logging, ensure_directories, setup_session,
-    get_page_content,
+    get_page_content, get_page_html,
     save_current_items,
-    load_latest_id, save_latest_id
+    retry_policy, get_event_index, get_crawl_state
 )
-from crawler.nexon_crawler.utils.discord_notifier import DiscordNotifier
-from crawler.nexon_crawler.utils.parse_event_date import EventDateParser
-from crawler.nexon_crawler.utils.screenshot_utils import setup_webdriver, save_screenshot
+from crawler.nexon_crawler.utils.discord_dispatcher import DiscordDispatcher
+from crawler.nexon_crawler.utils.notification_outbox import NotificationOutbox
+from crawler.nexon_crawler.utils.list_filter import PrefilterResult, prefilter_rows
+from crawler.nexon_crawler.utils.screenshot_utils import BrowserPool
+from crawler.nexon_crawler.utils.image_encoder import encode_images
+from crawler.common.html_parser import Document
+from crawler.common.list_extract import ListRow, extract_nexon_rows
 
 logging = setup_logging()
 
 class EventCrawler:
-    def __init__(self):
-        self.session = setup_session()
+    def __init__(self, session: Optional[requests.Session] = None, browser_pool: Optional[BrowserPool] = None,
+                 dispatcher: Optional[DiscordDispatcher] = None, outbox: Optional[NotificationOutbox] = None):
+        # 데몬에서는 세션과 브라우저를 넘겨받아 모든 게시판이 함께 씁니다.
+        self.session = session or setup_session()
         self.events: List[Dict] = []
-        self.discord_notifier = DiscordNotifier()
+        # 이번 크롤링에서 목록 정보만으로 건너뛴 상세 페이지 요청 수
+        self.skipped_fetches = 0
+        # 비동기 러너가 미리 받아 온 상세 페이지 (URL → 문서)
+        self.prefetched_pages: Dict[str, Document] = {}
+        # 이번 크롤링의 요청/재시도 시간 예산이 끝나는 시각 (crawl()에서 설정)
+        self.deadline: Optional[float] = None
+        # 디스코드 알림은 보관함에 먼저 저장하고, 전송은 발송기가 묶어서 처리합니다.
+        # 보관함을 넘겨받으면(데몬/비동기 러너) 전송과 재시도는 넘겨준 쪽의 전송 작업이 맡습니다.
+        self._owns_dispatcher = dispatcher is None
+        self.dispatcher = dispatcher or DiscordDispatcher()
+        self._owns_outbox = outbox is None
+        self.outbox = outbox or NotificationOutbox()
         ensure_directories()
         
-        # Selenium 설정
-        self.driver = setup_webdriver()
+        # Selenium 설정 (스크린샷이 필요할 때 처음 실행되고, 새 글들은 풀에서 병렬로 찍습니다)
+        self._owns_browser_pool = browser_pool is None
+        self.browser_pool = browser_pool or BrowserPool()
         
-        # 최신 ID 파일 경로 설정
-        self.latest_id_file = Path(EVENT_LAST_ID_FILE).parent / "event_latest_id.json"
+        # 게시판별 최신 ID/처리한 글 id (데몬, 다른 크롤러와 같은 저장소를 함께 씁니다)
+        self.crawl_state = get_crawl_state()
         
     def __del__(self):
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        if hasattr(self, 'browser_pool') and self._owns_browser_pool:
+            self.browser_pool.close()
+        if hasattr(self, 'dispatcher') and self._owns_dispatcher:
+            self.dispatcher.close()
+        if hasattr(self, 'outbox') and self._owns_outbox:
+            self.outbox.close()
 
     def _save_current_events(self):
         logging.info(f"현재 이벤트 목록을 저장: {EVENT_CONTENTS_FILE}")
         save_current_items(EVENT_CONTENTS_FILE, self.events)
         logging.info(f"이벤트 저장 완료")
 
-    def crawl(self):
+    def crawl(self, html: Optional[str] = None):
         logging.info(f"{self.__class__.__name__} 크롤링 시작")
+        self.deadline = retry_policy.deadline()
 
         try:
-            # 페이지 가져오기
-            soup = get_page_content(EVENT_URL, self.session)
-            if not soup:
+            # 페이지 가져오기 (비동기 러너가 목록을 미리 받아 온 경우 그대로 사용)
+            if html is None:
+                html = get_page_html(EVENT_URL, self.session, self.deadline)
+            if not html:
                 logging.error("이벤트 페이지를 가져오는데 실패했습니다")
+                self.crawl_state.record_poll("event", error="목록 페이지를 가져오지 못했습니다")
                 return
 
             # 페이지 HTML 저장 (디버깅용)
             with open(DEBUG_DIR / "debug_event_page.html", "w", encoding="utf-8") as f:
-                f.write(soup.prettify())
+                f.write(html)
 
-            # 이벤트 목록 찾기
-            list_area = soup.select_one('.list_area[data-mm-boardlist]')
-            if not list_area:
+            # 이벤트 목록 추출 (전체 DOM 대신 목록 영역만 파싱)
+            event_list = extract_nexon_rows(html, HTML_PARSER)
+            if event_list is None:
                 logging.error("이벤트 목록 영역을 찾을 수 없습니다")
                 return
 
             # 이벤트 목록이 비어있는지 확인
-            list_empty = list_area.select_one('.list_empty')
-            if list_empty:
+            if not event_list:
                 logging.info("현재 이벤트 목록이 비어있습니다. 게시글이 없습니다.")
                 return
 
-            # 이벤트 목록 추출
-            event_list = list_area.select('li.item[data-mm-listitem]')
-            if not event_list:
-                logging.error("이벤트를 찾을 수 없습니다")
-                return
+            # 목록의 이벤트 기간을 색인에 반영합니다 (진행 중/종료 임박 조회용, 바뀐 기간만 갱신)
+            updated = get_event_index().add_rows(event_list)
+            if updated:
+                logging.info(f"이벤트 기간 색인 갱신: {updated}개")
 
-            # 첫 번째 이벤트 ID 확인
-            first_event_id = max(int(event.get('data-threadid')) for event in event_list)
-            if not first_event_id:
-                logging.error("첫 번째 이벤트 ID를 찾을 수 없습니다")
-                return
+            # 크롤링 상태를 한 번만 읽고, 목록 정보만으로 상세 페이지가 필요한 글을 고릅니다 (최신 ID, 이미 처리한 글, 종료된 이벤트)
+            state = self.crawl_state.get("event")
+            seen_ids = state.seen | self.outbox.known_ids("event", [event.id for event in event_list if event.id])
+            prefiltered = prefilter_rows("event", event_list, state.watermark, seen_ids)
+            self.skipped_fetches = prefiltered.skipped_total
+            logging.info(f"이벤트 목록 {len(event_list)}개 중 {len(prefiltered.rows)}개 처리, {prefiltered.describe()}")
 
-            # 저장된 최신 ID 로드
-            saved_latest_id = load_latest_id(self.latest_id_file, "event")
-            
-            # 첫 번째 이벤트가 저장된 최신 ID와 같으면 크롤링 중단
-            if saved_latest_id and first_event_id == saved_latest_id:
+            if not prefiltered.rows:
+                self.crawl_state.commit("event", [event.id for event in event_list], prefiltered.settled_ids)
                 logging.info("새로운 이벤트가 없습니다.")
                 return
 
-            logging.info(f"총 {len(event_list)}개의 이벤트를 찾았습니다")
-            self._process_events(event_list)
+            self._process_events(event_list, prefiltered)
 
         except Exception as e:
             logging.error(f"크롤링 중 오류 발생: {str(e)}")
+            self.crawl_state.record_poll("event", error=str(e))
         
-    def _process_events(self, event_list):
-        """이벤트 목록을 처리하는 메서드"""
-        saved_latest_id = load_latest_id(self.latest_id_file, "event")
-        
-        for event in event_list:
+    def _process_events(self, event_list: List[ListRow], prefiltered: PrefilterResult):
+        """이벤트 목록을 처리하는 메서드 (prefiltered.rows만 상세 페이지를 받습니다)"""
+        for index, event in enumerate(prefiltered.rows):
             try:
-                # 이벤트 ID 추출
-                event_id = event.get('data-threadid')
-                if not event_id:
-                    continue
-
-                # 저장된 최신 ID와 일치하면 이벤트 후 크롤링 중단
-                if saved_latest_id and int(event_id) <= int(saved_latest_id):
-                    break
-
-                # 제목 추출
-                title_elem = event.select_one('.title span')
-                if not title_elem:
-                    continue
-                title = title_elem.text.strip()
+                event_id = event.id
+                title = event.title
 
                 # 이벤트 URL 생성
                 event_url = f"{EVENT_URL}/{event_id}"
                 logging.info(f"이벤트 URL 생성: {event_url}")
 
                 # 날짜 추출
-                date_elem = event.select_one('.date span')
-                if not date_elem:
-                    continue
-                event_date = date_elem.text.strip()
+                event_date = event.date
 
                 # 이벤트 타입 추출
-                type_elem = event.select_one('.type span')
-                event_type = type_elem.text.strip() if type_elem else "일반"
+                event_type = event.subject or "일반"
 
                 # 만약 첫 번째 이벤트면
-                is_first = event_list.index(event) == 0
+                is_first = index == 0
 
-                # 이벤트 처리
-                self._process_single_event(event_id, title, event_url, event_date, event_type, is_first)
+                # 이벤트 처리 (기간은 목록에서 이미 읽었습니다)
+                start_date, end_date = prefiltered.periods[event_id]
+                self._process_single_event(event_id, title, event_url, event_date, event_type, is_first,
+                                           start_date, end_date)
 
             except Exception as e:
                 logging.error(f"이벤트 처리 중 오류 발생: {str(e)}")
                 continue
         
+        # 이벤트 스크린샷을 한꺼번에 병렬로 저장
+        self._capture_screenshots()
+
         # 이벤트 저장
         self._save_current_events()
         
         # 새로운 이벤트만 디스코드 알림 전송
         new_events = [event for event in self.events]
         if new_events:
-            logging.info(f"새로운 이벤트 {len(new_events)}개 발견! 디스코드 알림 전송")
+            logging.info(f"새로운 이벤트 {len(new_events)}개 발견! 디스코드 알림 등록")
             for event in new_events:
                 event_url = f"{EVENT_URL}/{event['id']}"
-                image_path = EVENT_IMAGES_DIR / f"{event['id']}.png"
-                self.discord_notifier.send_notification(event, event_url, "이벤트", image_path)
-            
-            # 최신 ID 저장
-            if new_events:
-                latest_id = max(int(event['id']) for event in new_events)
-                save_latest_id(self.latest_id_file, "event", latest_id)
-                logging.info(f"최신 ID 저장 완료: {latest_id}")
+                image_path = event.get('upload_path') or event['image_path']
+                self.outbox.enqueue("event", event['id'], event, event_url, "이벤트", image_path)
         else:
             logging.info("새로운 이벤트가 없습니다.")
+
+        # 보관함에 넣은 글과 처리할 필요가 없는 글을 처리 완료로 기록합니다. 상세 페이지를 받지 못한 글은 다음 크롤링에서 다시 시도합니다.
+        watermark = self.crawl_state.commit(
+            "event", [event.id for event in event_list],
+            [event['id'] for event in new_events] + prefiltered.settled_ids, len(new_events)
+        )
+        logging.info(f"크롤링 상태 저장 완료 (최신 ID: {watermark})")
+
+        # 보관함에 저장된 뒤에 상태를 갱신했으므로, 여기서 전송이 실패해도 알림은 남아서 다음에 다시 보냅니다.
+        if new_events and self._owns_outbox:
+            self.outbox.drain(self.dispatcher)
                 
-    def _process_single_event(self, event_id: str, title: str, event_url: str, event_date: str, event_type: str, is_first: bool):
-        event_soup = get_page_content(event_url, self.session)
+    def _capture_screenshots(self):
+        jobs = [(f"{EVENT_URL}/{event['id']}", event['id']) for event in self.events]
+        image_paths = self.browser_pool.capture_batch(jobs, board="event")
+        # 업로드용 이미지는 프로세스 풀에서 바이트 예산에 맞게 인코딩합니다.
+        for event, image_path, upload_path in zip(self.events, image_paths, encode_images(image_paths)):
+            event['image_path'] = image_path
+            event['upload_path'] = upload_path
+
+    def _process_single_event(self, event_id: str, title: str, event_url: str, event_date: str, event_type: str, is_first: bool,
+                              start_date: datetime, end_date: datetime):
+        event_soup = self.prefetched_pages.pop(event_url, None)
+        if event_soup is None:
+            event_soup = get_page_content(event_url, self.session, self.deadline)
         if not event_soup:
             logging.error(f"이벤트 페이지를 가져오는데 실패했습니다: {event_url}")
             return
@@ -176,29 +201,12 @@ class EventCrawler:
             # 페이지 HTML 저장 (디버깅용)
             with open(DEBUG_DIR / "debug_event_first_page.html", "w", encoding="utf-8") as f:
                 f.write(event_soup.prettify())
-            
-        # 이벤트 날짜 파싱
-        parser = EventDateParser()
-        start_date, end_date = parser.parse_event_date(event_date)
         
-        # 종료된 이벤트는 건너뛰기
-        if datetime.now() > end_date:
-            logging.info(f"종료된 이벤트 건너뛰기: {title} (종료일: {end_date})")
-            return
-        
-        try:            
-            # 이벤트 스크린샷 저장
-            image_path = EVENT_IMAGES_DIR / f"{event_id}.png"
-            image_path = save_screenshot(self.driver, event_url, image_path)
-            
-        except Exception as e:
-            logging.error(f"이벤트 이미지 저장 중 오류 발생: {str(e)}")
-            image_path = ""
-            
+        # 스크린샷은 목록 처리가 끝난 뒤 _capture_screenshots()에서 한꺼번에 찍습니다.
         self.events.append({
             'id': event_id,
             'title': title,
-            'image_path': image_path,
+            'image_path': "",
             'date': event_date,
             'type': event_type,
             'start_date': start_date.strftime("%Y-%m-%d %H:%M:%S"),
@@ -1,9 +1,10 @@
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional
 import sys
 from pathlib import Path
 from datetime import datetime
 from selenium import webdriver
 import time
+import requests
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 project_root = str(Path(__file__).parent.parent.parent)
@@ -11,131 +12,130 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from crawler.nexon_crawler.config import (
-    NOTICE_URL, NOTICE_CONTENTS_FILE, DEBUG_DIR, NOTICE_IMAGES_DIR,
-    NOTICE_LAST_ID_FILE
+    NOTICE_URL, NOTICE_CONTENTS_FILE, DEBUG_DIR,
+    HTML_PARSER
 )
 from crawler.nexon_crawler.utils.utils import (
     setup_logging, ensure_directories, setup_session,
-    get_page_content,
+    get_page_content, get_page_html,
     save_current_items,
-    load_latest_id, save_latest_id
+    retry_policy, get_crawl_state
 )
-from crawler.nexon_crawler.utils.discord_notifier import DiscordNotifier
-from crawler.nexon_crawler.utils.screenshot_utils import setup_webdriver, save_screenshot
+from crawler.nexon_crawler.utils.discord_dispatcher import DiscordDispatcher
+from crawler.nexon_crawler.utils.notification_outbox import NotificationOutbox
+from crawler.nexon_crawler.utils.list_filter import PrefilterResult, prefilter_rows
+from crawler.nexon_crawler.utils.screenshot_utils import BrowserPool
+from crawler.nexon_crawler.utils.image_encoder import encode_images
+from crawler.common.html_parser import Document
+from crawler.common.list_extract import ListRow, extract_nexon_rows
 
 logging = setup_logging()
 
 class NoticeCrawler:
-    def __init__(self):
-        self.session = setup_session()
+    def __init__(self, session: Optional[requests.Session] = None, browser_pool: Optional[BrowserPool] = None,
+                 dispatcher: Optional[DiscordDispatcher] = None, outbox: Optional[NotificationOutbox] = None):
+        # 데몬에서는 세션과 브라우저를 넘겨받아 모든 게시판이 함께 씁니다.
+        self.session = session or setup_session()
         self.notices: List[Dict] = []
-        self.discord_notifier = DiscordNotifier()
+        # 이번 크롤링에서 목록 정보만으로 건너뛴 상세 페이지 요청 수
+        self.skipped_fetches = 0
+        # 비동기 러너가 미리 받아 온 상세 페이지 (URL → 문서)
+        self.prefetched_pages: Dict[str, Document] = {}
+        # 이번 크롤링의 요청/재시도 시간 예산이 끝나는 시각 (crawl()에서 설정)
+        self.deadline: Optional[float] = None
+        # 디스코드 알림은 보관함에 먼저 저장하고, 전송은 발송기가 묶어서 처리합니다.
+        # 보관함을 넘겨받으면(데몬/비동기 러너) 전송과 재시도는 넘겨준 쪽의 전송 작업이 맡습니다.
+        self._owns_dispatcher = dispatcher is None
+        self.dispatcher = dispatcher or DiscordDispatcher()
+        self._owns_outbox = outbox is None
+        self.outbox = outbox or NotificationOutbox()
         ensure_directories()
         
-        # Selenium 설정
-        self.driver = setup_webdriver()
+        # Selenium 설정 (스크린샷이 필요할 때 처음 실행되고, 새 글들은 풀에서 병렬로 찍습니다)
+        self._owns_browser_pool = browser_pool is None
+        self.browser_pool = browser_pool or BrowserPool()
         
-        # 최신 ID 파일 경로 설정
-        self.latest_id_file = Path(NOTICE_LAST_ID_FILE).parent / "notice_latest_id.json"
+        # 게시판별 최신 ID/처리한 글 id (데몬, 다른 크롤러와 같은 저장소를 함께 씁니다)
+        self.crawl_state = get_crawl_state()
         
     def __del__(self):
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        if hasattr(self, 'browser_pool') and self._owns_browser_pool:
+            self.browser_pool.close()
+        if hasattr(self, 'dispatcher') and self._owns_dispatcher:
+            self.dispatcher.close()
+        if hasattr(self, 'outbox') and self._owns_outbox:
+            self.outbox.close()
 
     def _save_current_notices(self):
         logging.info(f"현재 공지사항 목록을 저장: {NOTICE_CONTENTS_FILE}")
         save_current_items(NOTICE_CONTENTS_FILE, self.notices)
         logging.info(f"공지사항 저장 완료")
 
-    def crawl(self):
+    def crawl(self, html: Optional[str] = None):
         logging.info(f"{self.__class__.__name__} 크롤링 시작")
+        self.deadline = retry_policy.deadline()
 
         try:
-            # 페이지 가져오기
-            soup = get_page_content(NOTICE_URL, self.session)
-            if not soup:
+            # 페이지 가져오기 (비동기 러너가 목록을 미리 받아 온 경우 그대로 사용)
+            if html is None:
+                html = get_page_html(NOTICE_URL, self.session, self.deadline)
+            if not html:
                 logging.error("공지사항 페이지를 가져오는데 실패했습니다")
+                self.crawl_state.record_poll("notice", error="목록 페이지를 가져오지 못했습니다")
                 return
 
             # 페이지 HTML 저장 (디버깅용)
             with open(DEBUG_DIR / "debug_notice_page.html", "w", encoding="utf-8") as f:
-                f.write(soup.prettify())
+                f.write(html)
 
-            # 공지사항 목록 찾기
-            list_area = soup.select_one('.list_area[data-mm-boardlist]')
-            if not list_area:
+            # 공지사항 목록 추출 (전체 DOM 대신 목록 영역만 파싱)
+            notice_list = extract_nexon_rows(html, HTML_PARSER)
+            if notice_list is None:
                 logging.error("공지사항 목록 영역을 찾을 수 없습니다")
                 return
 
             # 공지사항 목록이 비어있는지 확인
-            list_empty = list_area.select_one('.list_empty')
-            if list_empty:
+            if not notice_list:
                 logging.info("현재 공지사항 목록이 비어있습니다. 게시글이 없습니다.")
                 return
 
-            # 공지사항 목록 추출
-            notice_list = list_area.select('li.item[data-mm-listitem]')
-            if not notice_list:
-                logging.error("공지사항을 찾을 수 없습니다")
-                return
+            # 크롤링 상태를 한 번만 읽고, 목록 정보만으로 상세 페이지가 필요한 글을 고릅니다 (최신 ID, 이미 처리한 글)
+            state = self.crawl_state.get("notice")
+            seen_ids = state.seen | self.outbox.known_ids("notice", [notice.id for notice in notice_list if notice.id])
+            prefiltered = prefilter_rows("notice", notice_list, state.watermark, seen_ids)
+            self.skipped_fetches = prefiltered.skipped_total
+            logging.info(f"공지사항 목록 {len(notice_list)}개 중 {len(prefiltered.rows)}개 처리, {prefiltered.describe()}")
 
-            # 첫 번째 공지사항 ID 확인
-            first_notice_id = max(int(notice.get('data-threadid')) for notice in notice_list)
-            if not first_notice_id:
-                logging.error("첫 번째 공지사항 ID를 찾을 수 없습니다")
-                return
-
-            # 저장된 최신 ID 로드
-            saved_latest_id = load_latest_id(self.latest_id_file, "notice")
-            
-            # 첫 번째 공지사항이 저장된 최신 ID와 같으면 크롤링 중단
-            if saved_latest_id and first_notice_id == saved_latest_id:
+            if not prefiltered.rows:
+                self.crawl_state.commit("notice", [notice.id for notice in notice_list], prefiltered.settled_ids)
                 logging.info("새로운 공지사항이 없습니다.")
                 return
 
-            logging.info(f"총 {len(notice_list)}개의 공지사항을 찾았습니다")
-            self._process_notices(notice_list)
+            self._process_notices(notice_list, prefiltered)
 
         except Exception as e:
             logging.error(f"크롤링 중 오류 발생: {str(e)}")
+            self.crawl_state.record_poll("notice", error=str(e))
         
-    def _process_notices(self, notice_list):
-        """공지사항 목록을 처리하는 메서드"""
-        saved_latest_id = load_latest_id(self.latest_id_file, "notice")
-        
-        for notice in notice_list:
+    def _process_notices(self, notice_list: List[ListRow], prefiltered: PrefilterResult):
+        """공지사항 목록을 처리하는 메서드 (prefiltered.rows만 상세 페이지를 받습니다)"""
+        for index, notice in enumerate(prefiltered.rows):
             try:
-                # 공지사항 ID 추출
-                notice_id = notice.get('data-threadid')
-                if not notice_id:
-                    continue
-
-                # 저장된 최신 ID와 일치하면 공지사항 후 크롤링 중단
-                if saved_latest_id and int(notice_id) <= int(saved_latest_id):
-                    break
-
-                # 제목 추출
-                title_elem = notice.select_one('.title span')
-                if not title_elem:
-                    continue
-                title = title_elem.text.strip()
+                notice_id = notice.id
+                title = notice.title
 
                 # 공지사항 URL 생성
                 notice_url = f"{NOTICE_URL}/{notice_id}"
                 logging.info(f"공지사항 URL 생성: {notice_url}")
 
                 # 날짜 추출
-                date_elem = notice.select_one('.date span')
-                if not date_elem:
-                    continue
-                notice_date = date_elem.text.strip()
+                notice_date = notice.date
 
                 # 공지사항 타입 추출
-                type_elem = notice.select_one('.type span')
-                notice_type = type_elem.text.strip() if type_elem else "일반"
+                notice_type = notice.subject or "일반"
 
                 # 만약 첫 번째 공지사항이면
-                is_first = notice_list.index(notice) == 0
+                is_first = index == 0
 
                 # 공지사항 처리
                 self._process_single_notice(notice_id, title, notice_url, notice_date, notice_type, is_first)
@@ -144,28 +144,46 @@ class NoticeCrawler:
                 logging.error(f"공지사항 처리 중 오류 발생: {str(e)}")
                 continue
         
+        # 공지사항 스크린샷을 한꺼번에 병렬로 저장
+        self._capture_screenshots()
+
         # 공지사항 저장
         self._save_current_notices()
         
         # 새로운 공지사항만 디스코드 알림 전송
         new_notices = [notice for notice in self.notices]
         if new_notices:
-            logging.info(f"새로운 공지사항 {len(new_notices)}개 발견! 디스코드 알림 전송")
+            logging.info(f"새로운 공지사항 {len(new_notices)}개 발견! 디스코드 알림 등록")
             for notice in new_notices:
                 notice_url = f"{NOTICE_URL}/{notice['id']}"
-                image_path = NOTICE_IMAGES_DIR / f"{notice['id']}.png"
-                self.discord_notifier.send_notification(notice, notice_url, "공지사항", image_path, notice_date)
-            
-            # 최신 ID 저장
-            if new_notices:
-                latest_id = max(int(notice['id']) for notice in new_notices)
-                save_latest_id(self.latest_id_file, "notice", latest_id)
-                logging.info(f"최신 ID 저장 완료: {latest_id}")
+                image_path = notice.get('upload_path') or notice['image_path']
+                self.outbox.enqueue("notice", notice['id'], notice, notice_url, "공지사항", image_path, notice_date)
         else:
             logging.info("새로운 공지사항이 없습니다.")
+
+        # 보관함에 넣은 글과 처리할 필요가 없는 글을 처리 완료로 기록합니다. 상세 페이지를 받지 못한 글은 다음 크롤링에서 다시 시도합니다.
+        watermark = self.crawl_state.commit(
+            "notice", [notice.id for notice in notice_list],
+            [notice['id'] for notice in new_notices] + prefiltered.settled_ids, len(new_notices)
+        )
+        logging.info(f"크롤링 상태 저장 완료 (최신 ID: {watermark})")
+
+        # 보관함에 저장된 뒤에 상태를 갱신했으므로, 여기서 전송이 실패해도 알림은 남아서 다음에 다시 보냅니다.
+        if new_notices and self._owns_outbox:
+            self.outbox.drain(self.dispatcher)
                 
+    def _capture_screenshots(self):
+        jobs = [(f"{NOTICE_URL}/{notice['id']}", notice['id']) for notice in self.notices]
+        image_paths = self.browser_pool.capture_batch(jobs, board="notice")
+        # 업로드용 이미지는 프로세스 풀에서 바이트 예산에 맞게 인코딩합니다.
+        for notice, image_path, upload_path in zip(self.notices, image_paths, encode_images(image_paths)):
+            notice['image_path'] = image_path
+            notice['upload_path'] = upload_path
+
     def _process_single_notice(self, notice_id: str, title: str, notice_url: str, notice_date: str, notice_type: str, is_first: bool):
-        notice_soup = get_page_content(notice_url, self.session)
+        notice_soup = self.prefetched_pages.pop(notice_url, None)
+        if notice_soup is None:
+            notice_soup = get_page_content(notice_url, self.session, self.deadline)
         if not notice_soup:
             logging.error(f"공지사항 페이지를 가져오는데 실패했습니다: {notice_url}")
             return
@@ -175,19 +193,11 @@ class NoticeCrawler:
             with open(DEBUG_DIR / "debug_notice_first_page.html", "w", encoding="utf-8") as f:
                 f.write(notice_soup.prettify())
         
-        try:            
-            # 공지사항 스크린샷 저장
-            image_path = NOTICE_IMAGES_DIR / f"{notice_id}.png"
-            image_path = save_screenshot(self.driver, notice_url, image_path)
-            
-        except Exception as e:
-            logging.error(f"공지사항 이미지 저장 중 오류 발생: {str(e)}")
-            image_path = ""
-            
+        # 스크린샷은 목록 처리가 끝난 뒤 _capture_screenshots()에서 한꺼번에 찍습니다.
         self.notices.append({
             'id': notice_id,
             'title': title,
-            'image_path': image_path,
+            'image_path': "",
             'date': notice_date,
             'type': notice_type
         })
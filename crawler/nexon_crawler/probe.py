@@ -0,0 +1,149 @@
+from typing import Dict, List, NamedTuple
+import importlib
+import hashlib
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+# 실행: python ./nexon_crawler/probe.py [--dry-run] [notice|event|update ...]
+# 브라우저 없이 목록 페이지만 조건부 요청으로 확인하고, 새 글이 있는 게시판만 전체 크롤러를 실행합니다.
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from crawler.nexon_crawler.config import (
+    NOTICE_URL, EVENT_URL, UPDATE_URL,
+    PROBE_TIMEOUT, USER_AGENT, HTTP2_ENABLED, HTTP2_HOSTS
+)
+from crawler.nexon_crawler.utils.utils import setup_logging, fetch_response, get_crawl_state
+from crawler.common.transport import create_session
+from crawler.common.list_extract import NEXON_LIST_PATTERN, THREAD_ID_PATTERN, slice_element
+
+logging = setup_logging()
+
+
+class Board(NamedTuple):
+    url: str
+    crawler_module: str
+    crawler_class: str
+
+
+BOARDS: Dict[str, Board] = {
+    "notice": Board(NOTICE_URL, "crawler.nexon_crawler.notice_crawler", "NoticeCrawler"),
+    "event": Board(EVENT_URL, "crawler.nexon_crawler.event_crawler", "EventCrawler"),
+    "update": Board(UPDATE_URL, "crawler.nexon_crawler.update_crawler", "UpdateCrawler"),
+}
+
+
+def setup_probe_session() -> requests.Session:
+    """프로브용 세션 (조건부 요청이 동작하도록 Cache-Control: no-cache를 보내지 않습니다)"""
+    return create_session({
+        'User-Agent': USER_AGENT,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+        'Connection': 'keep-alive',
+    }, pool_size=len(BOARDS), timeout=PROBE_TIMEOUT, http2_hosts=HTTP2_HOSTS, http2=HTTP2_ENABLED)
+
+
+def load_probe_state(name: str) -> Dict:
+    """게시판의 프로브 상태 (크롤링 상태 저장소에 함께 보관). 프로브 직전에 읽어서 다른 프로세스의 갱신을 반영합니다."""
+    return get_crawl_state().get_poll_meta(name)
+
+
+def save_probe_state(name: str, state: Dict) -> None:
+    """프로브한 게시판의 상태만 저장합니다 (다른 게시판의 상태는 건드리지 않음)."""
+    get_crawl_state().update_poll_meta(name, state)
+
+
+def probe_board(name: str, board: Board, session: requests.Session, state: Dict) -> bool:
+    """
+    게시판 목록이 바뀌었는지 확인하고, 아직 처리하지 않은 새 글이 있으면 True를 반환합니다.
+
+    1. ETag/Last-Modified로 조건부 요청 → 304면 본문을 받지 않음
+    2. 목록 컨테이너만 잘라 해시 → 이전과 같으면 파싱하지 않음
+    3. 바뀐 경우에만 data-threadid를 정규식으로 추출
+    state는 이 게시판의 프로브 상태이며 제자리에서 갱신됩니다.
+    """
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+
+    # 크롤러와 같은 호스트별 속도 조절기를 거치므로, 프로브가 요청 제한을 받으면 크롤링도 함께 느려집니다.
+    response = fetch_response(board.url, session, timeout=PROBE_TIMEOUT, headers=headers)
+    state["checked_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    if response.status_code == 304:
+        logging.debug(f"[{name}] 304 Not Modified")
+    else:
+        response.raise_for_status()
+        state["etag"] = response.headers.get("ETag")
+        state["last_modified"] = response.headers.get("Last-Modified")
+        fragment = slice_element(response.text, NEXON_LIST_PATTERN) or ""
+        list_hash = hashlib.sha256(fragment.encode("utf-8")).hexdigest()
+        if list_hash != state.get("list_hash"):
+            thread_ids = [int(thread_id) for thread_id in THREAD_ID_PATTERN.findall(fragment)]
+            state["list_hash"] = list_hash
+            state["max_thread_id"] = max(thread_ids) if thread_ids else None
+            state["thread_ids"] = sorted(set(thread_ids))
+            logging.info(f"[{name}] 목록 변경 감지 (최대 ID: {state['max_thread_id']})")
+
+    # 크롤러가 성공해야 크롤링 상태가 갱신되므로, 실패한 경우 다음 프로브에서 다시 트리거됩니다.
+    # 최대 ID만 보면 그보다 작은 글이 처리되지 못한 채 남아 있어도 놓치므로 목록의 id 전체를 확인합니다.
+    thread_ids = state.get("thread_ids")
+    if thread_ids is None:
+        # 예전 프로브 상태에는 최대 ID만 있습니다 (다음 목록 변경 때 전체 id가 채워짐).
+        thread_ids = [state["max_thread_id"]] if state.get("max_thread_id") is not None else []
+    return get_crawl_state().has_unsettled(name, thread_ids)
+
+
+def run_crawler(name: str, board: Board, **crawler_kwargs) -> None:
+    """변경된 게시판의 전체 크롤러를 실행합니다 (이때만 셀레니움/스크린샷/디스코드 사용)."""
+    crawler_class = getattr(importlib.import_module(board.crawler_module), board.crawler_class)
+    crawler = crawler_class(**crawler_kwargs)
+    try:
+        crawler.crawl()
+    finally:
+        del crawler
+
+
+def main(argv: List[str]) -> int:
+    dry_run = "--dry-run" in argv
+    names = [arg for arg in argv if not arg.startswith("--")] or list(BOARDS)
+    unknown = [name for name in names if name not in BOARDS]
+    if unknown:
+        logging.error(f"알 수 없는 게시판: {', '.join(unknown)} (가능: {', '.join(BOARDS)})")
+        return 2
+
+    session = setup_probe_session()
+    changed: List[str] = []
+    for name in names:
+        state = load_probe_state(name)
+        try:
+            if probe_board(name, BOARDS[name], session, state):
+                changed.append(name)
+        except Exception as e:
+            logging.error(f"[{name}] 프로브 실패: {str(e)}")
+        save_probe_state(name, state)
+
+    if not changed:
+        logging.info("변경된 게시판이 없습니다.")
+        return 0
+
+    logging.info(f"새 글이 있는 게시판: {', '.join(changed)}")
+    if dry_run:
+        return 0
+    for name in changed:
+        try:
+            run_crawler(name, BOARDS[name])
+        except Exception as e:
+            logging.error(f"[{name}] 크롤러 실행 실패: {str(e)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
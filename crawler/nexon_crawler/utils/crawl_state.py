@@ -0,0 +1,213 @@
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, NamedTuple, Optional, Union
+import json
+import sqlite3
+import threading
+import time
+import logging
+
+from config import (
+    CRAWL_STATE_FILE, PROBE_STATE_FILE,
+    NOTICE_LAST_ID_FILE, EVENT_LAST_ID_FILE, UPDATE_LAST_ID_FILE
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    board           TEXT PRIMARY KEY,
+    watermark       INTEGER,
+    poll_meta       TEXT NOT NULL DEFAULT '{}',
+    last_poll_at    TEXT,
+    last_success_at TEXT,
+    last_new_count  INTEGER NOT NULL DEFAULT 0,
+    last_error      TEXT
+);
+
+CREATE TABLE IF NOT EXISTS seen (
+    board   TEXT NOT NULL,
+    item_id INTEGER NOT NULL,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (board, item_id)
+) WITHOUT ROWID;
+"""
+
+# 예전 게시판별 최신 ID 파일 (처음 열 때 한 번 가져옵니다)
+_LEGACY_LAST_ID_FILES: Dict[str, Path] = {
+    "notice": NOTICE_LAST_ID_FILE,
+    "event": EVENT_LAST_ID_FILE,
+    "update": UPDATE_LAST_ID_FILE,
+}
+
+
+class BoardState(NamedTuple):
+    board: str
+    watermark: Optional[int]   # 이 ID 이하는 모두 처리 완료
+    seen: FrozenSet[str]       # watermark보다 크지만 이미 처리한 글 id (고정글, 순서가 뒤섞인 글)
+    last_poll_at: Optional[str]
+    last_success_at: Optional[str]
+    last_new_count: int
+    last_error: Optional[str]
+
+    def is_settled(self, item_id: Union[str, int]) -> bool:
+        return (self.watermark is not None and int(item_id) <= self.watermark) or str(item_id) in self.seen
+
+
+class CrawlStateStore:
+    """
+    넥슨 게시판 크롤링 상태 저장소 (게시판별 최신 ID JSON 파일을 대신함).
+
+    - watermark: 이 ID 이하의 글은 모두 처리했다는 기준입니다. 목록의 최댓값으로 올리지 않고
+      아직 처리하지 못한 글 바로 아래까지만 올리므로, 고정글이나 실패한 글이 있어도 새 글을 건너뛰지 않습니다.
+    - seen: watermark보다 크지만 이미 처리한 글 id. watermark가 올라가면 그 아래 것은 지워서 작게 유지합니다.
+    - 마지막 확인/성공 시각, 새 글 수, 오류와 프로브 상태(ETag, 목록 해시 등)를 함께 둡니다.
+    모든 변경은 BEGIN IMMEDIATE 트랜잭션 하나로 커밋하므로, 데몬과 크론으로 실행한 크롤러가 같은 파일을 함께 써도 됩니다.
+    """
+
+    def __init__(self, path: Union[str, Path] = CRAWL_STATE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 트랜잭션은 직접 엽니다 (isolation_level=None). 크롤러 스레드와 데몬 스레드가 함께 쓰므로 잠금으로 보호합니다.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # 커밋마다 fsync해서 전원이 나가도 커밋한 상태는 남게 합니다.
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._import_legacy()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @contextmanager
+    def _transaction(self, immediate: bool = True) -> Iterator[sqlite3.Connection]:
+        """읽기만 하면 immediate=False (일관된 스냅샷), 쓰기는 처음부터 쓰기 잠금을 잡습니다."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _import_legacy(self) -> None:
+        """아직 상태가 없는 게시판은 예전 최신 ID 파일과 프로브 상태 파일에서 가져옵니다."""
+        try:
+            with open(PROBE_STATE_FILE, 'r', encoding='utf-8') as f:
+                probe_state = json.load(f)
+        except (OSError, ValueError):
+            probe_state = {}
+        with self._transaction() as conn:
+            existing = {board for board, in conn.execute("SELECT board FROM boards")}
+            for board, file_path in _LEGACY_LAST_ID_FILES.items():
+                if board in existing:
+                    continue
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        watermark = json.load(f).get(board)
+                except (OSError, ValueError):
+                    watermark = None
+                if watermark is None and board not in probe_state:
+                    continue
+                conn.execute(
+                    "INSERT INTO boards (board, watermark, poll_meta) VALUES (?, ?, ?)",
+                    (board, int(watermark) if watermark is not None else None,
+                     json.dumps(probe_state.get(board, {}), ensure_ascii=False)),
+                )
+                logging.info(f"[{board}] 예전 상태 파일에서 최신 ID를 가져왔습니다: {watermark}")
+
+    @staticmethod
+    def _ensure_board(conn: sqlite3.Connection, board: str) -> None:
+        conn.execute("INSERT OR IGNORE INTO boards (board) VALUES (?)", (board,))
+
+    def get(self, board: str) -> BoardState:
+        with self._transaction(immediate=False) as conn:
+            row = conn.execute(
+                "SELECT watermark, last_poll_at, last_success_at, last_new_count, last_error FROM boards WHERE board = ?",
+                (board,),
+            ).fetchone()
+            seen = frozenset(str(item_id) for item_id, in conn.execute(
+                "SELECT item_id FROM seen WHERE board = ?", (board,)
+            ))
+        if row is None:
+            return BoardState(board, None, seen, None, None, 0, None)
+        return BoardState(board, row[0], seen, *row[1:])
+
+    def has_unsettled(self, board: str, item_ids: Iterable[Union[str, int]]) -> bool:
+        """item_ids 중 아직 처리하지 않은 글이 있으면 True (상태가 없는 게시판이면 id가 하나라도 있으면 True)"""
+        state = self.get(board)
+        return any(not state.is_settled(item_id) for item_id in item_ids)
+
+    def commit(self, board: str, visible_ids: Iterable[Union[str, int]], settled_ids: Iterable[Union[str, int]],
+               new_count: int = 0) -> Optional[int]:
+        """
+        한 번의 크롤링 결과를 원자적으로 저장합니다.
+
+        Args:
+            visible_ids: 이번 목록에 보인 글 id 전체
+            settled_ids: 이번에 처리를 끝낸 글 id (알림 등록, 종료된 이벤트처럼 처리할 필요가 없는 글 포함)
+            new_count: 이번에 새로 알림을 등록한 글 수
+        Returns:
+            새 watermark
+        """
+        settled = {int(item_id) for item_id in settled_ids if str(item_id).isdigit()}
+        visible = {int(item_id) for item_id in visible_ids if str(item_id).isdigit()}
+        now = time.time()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._transaction() as conn:
+            self._ensure_board(conn, board)
+            watermark = conn.execute("SELECT watermark FROM boards WHERE board = ?", (board,)).fetchone()[0]
+            conn.executemany(
+                "INSERT OR IGNORE INTO seen (board, item_id, seen_at) VALUES (?, ?, ?)",
+                [(board, item_id, now) for item_id in settled if watermark is None or item_id > watermark],
+            )
+            seen = {item_id for item_id, in conn.execute("SELECT item_id FROM seen WHERE board = ?", (board,))}
+            pending = [item_id for item_id in visible
+                       if (watermark is None or item_id > watermark) and item_id not in seen]
+            if pending:
+                # 처리하지 못한 글 바로 아래까지만 올려서 다음 크롤링에서 다시 시도하게 합니다.
+                candidate = min(pending) - 1
+            else:
+                candidate = max(visible | seen, default=watermark)
+            if candidate is not None and (watermark is None or candidate > watermark):
+                watermark = candidate
+            if watermark is not None:
+                conn.execute("DELETE FROM seen WHERE board = ? AND item_id <= ?", (board, watermark))
+            conn.execute(
+                "UPDATE boards SET watermark = ?, last_poll_at = ?, last_success_at = ?, last_new_count = ?, "
+                "last_error = NULL WHERE board = ?",
+                (watermark, timestamp, timestamp, new_count, board),
+            )
+        return watermark
+
+    def record_poll(self, board: str, error: Optional[str] = None) -> None:
+        """확인 시각(과 실패했다면 오류)만 기록합니다."""
+        with self._transaction() as conn:
+            self._ensure_board(conn, board)
+            conn.execute(
+                "UPDATE boards SET last_poll_at = ?, last_error = ? WHERE board = ?",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), error, board),
+            )
+
+    def get_poll_meta(self, board: str) -> Dict:
+        """게시판의 프로브 상태 (ETag, Last-Modified, 목록 해시, 목록의 글 id와 최대 ID, 확인 시각)"""
+        with self._transaction(immediate=False) as conn:
+            row = conn.execute("SELECT poll_meta FROM boards WHERE board = ?", (board,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def update_poll_meta(self, board: str, meta: Dict) -> Dict:
+        """
+        게시판 하나의 프로브 상태를 갱신하고 합친 결과를 반환합니다.
+
+        읽기-수정-쓰기를 한 트랜잭션으로 하므로 다른 프로세스가 다른 게시판(이나 다른 키)을 바꿔도 덮어쓰지 않습니다.
+        """
+        with self._transaction() as conn:
+            self._ensure_board(conn, board)
+            current = json.loads(conn.execute("SELECT poll_meta FROM boards WHERE board = ?", (board,)).fetchone()[0])
+            merged = {**current, **meta}
+            conn.execute(
+                "UPDATE boards SET poll_meta = ? WHERE board = ?",
+                (json.dumps(merged, ensure_ascii=False), board),
+            )
+        return merged
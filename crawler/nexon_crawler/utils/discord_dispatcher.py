@@ -0,0 +1,312 @@
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import asyncio
+import json
+import threading
+import time
+
+import requests
+
+from config import (
+    DISCORD_WEBHOOK_URL, DISCORD_BATCH_WINDOW, DISCORD_DIGEST_THRESHOLD,
+    DISCORD_MAX_UPLOAD_BYTES, DISCORD_MAX_RETRIES, DISCORD_TIMEOUT
+)
+from crawler.nexon_crawler.utils.utils import setup_logging
+
+logger = setup_logging()
+
+# 디스코드 웹훅 한 메시지의 제한
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_FILES_PER_MESSAGE = 10
+MAX_EMBED_DESCRIPTION = 4096
+MAX_EMBED_TOTAL = 6000  # 한 메시지의 모든 임베드 글자 수 합 (제목, 설명, 필드, 바닥글, 작성자)
+MAX_DESCRIPTION_PREVIEW = 50
+
+_STOP = object()
+
+
+class Notification(NamedTuple):
+    embed: Dict
+    image_path: Optional[str]
+    future: Future  # 전송 결과 (성공 여부)
+
+
+def build_embed(post: Dict, post_url: str, type: str = None, image_path: str = None,
+                start_date: str = None, end_date: str = None) -> Dict:
+    """DiscordNotifier와 같은 모양의 임베드를 웹훅 JSON 형식으로 만듭니다."""
+    content = post.get('content', '')
+    description = content[:MAX_DESCRIPTION_PREVIEW] + "..." if len(content) > MAX_DESCRIPTION_PREVIEW else content
+    fields = [{"name": "공지사항 링크", "value": f"[게시글 보기]({post_url})"}]
+    if start_date:
+        fields.append({"name": "시작일", "value": f"**{start_date}**"})
+    if end_date:
+        fields.append({"name": "종료일", "value": f"**{end_date}**"})
+    embed = {
+        "title": f"[새로운 {type}] {post['title']}",
+        "description": description,
+        "url": post_url,
+        "color": 0x3498db,  # 파란색
+        "fields": fields,
+    }
+    if image_path:
+        embed["image"] = {"url": f"attachment://{Path(image_path).name}"}
+    return embed
+
+
+def embed_length(embed: Dict) -> int:
+    """디스코드가 임베드 글자 수 제한에 세는 부분의 길이"""
+    return (
+        len(embed.get("title", "")) + len(embed.get("description", ""))
+        + sum(len(field["name"]) + len(field["value"]) for field in embed.get("fields", []))
+        + len(embed.get("footer", {}).get("text", "")) + len(embed.get("author", {}).get("name", ""))
+    )
+
+
+class DiscordDispatcher:
+    """
+    디스코드 웹훅 비동기 발송기.
+
+    submit()은 큐에 넣고 바로 반환하므로 크롤링이 웹훅 응답을 기다리지 않습니다.
+    백그라운드 스레드의 이벤트 루프가 batch_window초 동안 모인 알림을 한 요청에 최대 10개 임베드/10개 파일까지 묶어 보내고,
+    한 번에 digest_threshold개 이상 몰리면 제목과 링크만 모은 요약(digest) 메시지로 보냅니다.
+    429 응답의 Retry-After와 X-RateLimit-Remaining/Reset-After 헤더를 지켜서 다음 요청 시각을 조절합니다.
+    """
+
+    def __init__(self, webhook_url: str = DISCORD_WEBHOOK_URL, batch_window: float = DISCORD_BATCH_WINDOW,
+                 digest_threshold: int = DISCORD_DIGEST_THRESHOLD, max_upload_bytes: int = DISCORD_MAX_UPLOAD_BYTES,
+                 max_retries: int = DISCORD_MAX_RETRIES, session: Optional[requests.Session] = None):
+        self.webhook_url = webhook_url
+        self.batch_window = batch_window
+        self.digest_threshold = digest_threshold
+        self.max_upload_bytes = max_upload_bytes
+        self.max_retries = max_retries
+        self.session = session or requests.Session()
+        self.stats = {"submitted": 0, "delivered": 0, "failed": 0, "requests": 0, "rate_limited": 0}
+        self._pending = 0
+        self._idle = threading.Condition()
+        self._resume_at = 0.0  # 버킷이 비었을 때 다음 요청을 보낼 수 있는 시각 (time.monotonic 기준)
+        self._loop = asyncio.new_event_loop()
+        self._queue: Optional[asyncio.Queue] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="discord-dispatcher", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def __enter__(self) -> "DiscordDispatcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def submit(self, post: Dict, post_url: str, type: str = None, image_path: str = None,
+               start_date: str = None, end_date: str = None) -> Future:
+        """
+        알림 하나를 큐에 넣습니다 (DiscordNotifier.send_notification과 같은 인자).
+
+        Returns:
+            전송이 끝나면 성공 여부(bool)가 담기는 Future
+        """
+        image_path = str(image_path) if image_path and Path(image_path).exists() else None
+        future: Future = Future()
+        notification = Notification(build_embed(post, post_url, type, image_path, start_date, end_date), image_path, future)
+        with self._idle:
+            self._pending += 1
+            self.stats["submitted"] += 1
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, notification)
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """큐에 넣은 알림이 모두 처리될 때까지 기다립니다."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def close(self) -> None:
+        """남은 알림을 모두 보낸 뒤 발송 스레드를 종료합니다."""
+        if not self._thread.is_alive():
+            return
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, _STOP)
+        self._thread.join()
+        self._loop.close()
+        logger.info(f"디스코드 발송 통계: {self.stats}")
+
+    # 이벤트 루프
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._ready.set()
+        self._loop.run_until_complete(self._consume())
+
+    async def _consume(self) -> None:
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            # batch_window 동안 뒤따라 오는 알림을 함께 묶습니다.
+            deadline = self._loop.time() + self.batch_window
+            while True:
+                remaining = deadline - self._loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                await self._dispatch(batch)
+            except Exception as e:
+                logger.error(f"알림 전송 중 오류 발생: {str(e)}")
+                self._settle([n for n in batch if not n.future.done()], False)
+            with self._idle:
+                self._pending -= len(batch)
+                self._idle.notify_all()
+
+    async def _dispatch(self, batch: List[Notification]) -> None:
+        if len(batch) >= self.digest_threshold:
+            logger.info(f"알림 {len(batch)}개가 한꺼번에 들어와 요약 메시지로 보냅니다")
+            for embeds, notifications in self._digest_messages(batch):
+                self._settle(notifications, await self._send({"embeds": embeds}, []))
+            return
+
+        for notifications in self._pack(batch):
+            payload = {"embeds": [notification.embed for notification in notifications]}
+            files = list(dict.fromkeys(n.image_path for n in notifications if n.image_path))
+            self._settle(notifications, await self._send(payload, files))
+
+    def _settle(self, notifications: List[Notification], delivered: bool) -> None:
+        self.stats["delivered" if delivered else "failed"] += len(notifications)
+        for notification in notifications:
+            notification.future.set_result(delivered)
+
+    def _pack(self, batch: List[Notification]) -> List[List[Notification]]:
+        """임베드 수, 임베드 글자 수, 파일 수, 업로드 바이트 제한 안에서 알림들을 메시지 단위로 나눕니다."""
+        messages: List[List[Notification]] = []
+        current: List[Notification] = []
+        files: Dict[str, int] = {}
+        length = 0
+        for notification in batch:
+            size = Path(notification.image_path).stat().st_size if notification.image_path else 0
+            new_file = notification.image_path and notification.image_path not in files
+            if current and (
+                len(current) >= MAX_EMBEDS_PER_MESSAGE
+                or length + embed_length(notification.embed) > MAX_EMBED_TOTAL
+                or (new_file and len(files) >= MAX_FILES_PER_MESSAGE)
+                or (new_file and sum(files.values()) + size > self.max_upload_bytes)
+            ):
+                messages.append(current)
+                current, files, length = [], {}, 0
+                new_file = bool(notification.image_path)
+            current.append(notification)
+            length += embed_length(notification.embed)
+            if new_file:
+                files[notification.image_path] = size
+        if current:
+            messages.append(current)
+        return messages
+
+    def _digest_messages(self, batch: List[Notification]) -> List[Tuple[List[Dict], List[Notification]]]:
+        """제목과 링크만 모은 요약 임베드를 (메시지의 임베드 목록, 포함된 알림들) 단위로 만듭니다."""
+        embeds: List[Tuple[Dict, List[Notification]]] = []
+        lines: List[str] = []
+        included: List[Notification] = []
+        for notification in batch:
+            line = f"• [{notification.embed['title']}]({notification.embed['url']})"
+            # 설명 길이 제한을 넘으면 임베드를 나눕니다.
+            if lines and len("\n".join(lines)) + len(line) + 1 > MAX_EMBED_DESCRIPTION:
+                embeds.append((self._digest_embed(lines), included))
+                lines, included = [], []
+            lines.append(line)
+            included.append(notification)
+        if lines:
+            embeds.append((self._digest_embed(lines), included))
+
+        # 한 메시지에 임베드 10개, 글자 수 합 6000자까지 담습니다 (넘으면 디스코드가 400으로 거절).
+        messages: List[Tuple[List[Dict], List[Notification]]] = []
+        current: List[Dict] = []
+        included = []
+        length = 0
+        for embed, notifications in embeds:
+            if current and (
+                len(current) >= MAX_EMBEDS_PER_MESSAGE or length + embed_length(embed) > MAX_EMBED_TOTAL
+            ):
+                messages.append((current, included))
+                current, included, length = [], [], 0
+            current.append(embed)
+            included.extend(notifications)
+            length += embed_length(embed)
+        if current:
+            messages.append((current, included))
+        return messages
+
+    @staticmethod
+    def _digest_embed(lines: List[str]) -> Dict:
+        return {"title": f"새 글 {len(lines)}개", "description": "\n".join(lines), "color": 0x3498db}
+
+    async def _send(self, payload: Dict, files: List[str]) -> bool:
+        """메시지 하나를 보냅니다. 429는 Retry-After만큼, 5xx/연결 오류는 지수 백오프로 기다렸다 재시도합니다."""
+        for attempt in range(self.max_retries):
+            delay = self._resume_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                response = await asyncio.to_thread(self._post, payload, files)
+            except requests.RequestException as e:
+                logger.error(f"웹훅 요청 실패 (시도 {attempt + 1}/{self.max_retries}): {str(e)}")
+                await asyncio.sleep(2 ** attempt)
+                continue
+            self.stats["requests"] += 1
+            self._update_bucket(response)
+
+            if response.status_code == 429:
+                self.stats["rate_limited"] += 1
+                retry_after = self._retry_after(response)
+                logger.warning(f"웹훅 요청 제한 (429), {retry_after:.2f}초 후 재시도")
+                self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+                continue
+            if response.ok:
+                logger.info(f"알림 {len(payload['embeds'])}개를 전송했습니다.")
+                return True
+            if response.status_code >= 500:
+                logger.error(f"Webhook status code {response.status_code}, 재시도합니다")
+                await asyncio.sleep(2 ** attempt)
+                continue
+            logger.error(f"Webhook status code {response.status_code}: {response.text}")
+            return False
+        logger.error("알림 전송 실패: 재시도 횟수 초과")
+        return False
+
+    def _post(self, payload: Dict, files: List[str]) -> requests.Response:
+        attachments = {
+            f"files[{index}]": (Path(path).name, Path(path).read_bytes())
+            for index, path in enumerate(files)
+        }
+        return self.session.post(
+            self.webhook_url,
+            data={"payload_json": json.dumps(payload, ensure_ascii=False)},
+            files=attachments or None,
+            timeout=DISCORD_TIMEOUT,
+        )
+
+    def _update_bucket(self, response: requests.Response) -> None:
+        # 버킷이 비었으면 Reset-After가 지날 때까지 다음 요청을 미룹니다.
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            reset_after = float(response.headers.get("X-RateLimit-Reset-After", 1))
+            self._resume_at = max(self._resume_at, time.monotonic() + reset_after)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float:
+        header = response.headers.get("Retry-After")
+        if header:
+            return float(header)
+        try:
+            return float(response.json().get("retry_after", 1))
+        except ValueError:
+            return 1.0
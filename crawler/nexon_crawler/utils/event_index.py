@@ -0,0 +1,227 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Union
+import sqlite3
+import threading
+import time
+import logging
+
+from config import EVENT_URL, EVENT_INDEX_FILE, EVENT_REMINDER_HOURS, EVENT_INDEX_RETENTION_DAYS
+from crawler.common.list_extract import ListRow
+from crawler.nexon_crawler.utils.parse_event_date import parse_event_period
+
+if TYPE_CHECKING:  # utils.py가 이 모듈을 import하므로 보관함(→ 발송기 → utils)은 타입 검사에서만 가져옵니다
+    from crawler.nexon_crawler.utils.notification_outbox import NotificationOutbox
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS periods (
+    event_id    TEXT PRIMARY KEY,
+    title       TEXT NOT NULL,
+    raw         TEXT NOT NULL,
+    start_ts    REAL NOT NULL,
+    end_ts      REAL NOT NULL,
+    reminded_at REAL,
+    updated_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_periods_end ON periods (end_ts);
+"""
+
+# 종료 임박 알림을 보관함에 넣을 때 쓰는 게시판 이름 (새 이벤트 알림과 멱등 키가 겹치지 않도록)
+REMINDER_BOARD = "event_ending"
+
+
+class EventPeriod(NamedTuple):
+    event_id: str
+    title: str
+    raw: str           # 목록에 적힌 기간 문자열
+    start: datetime
+    end: datetime
+    reminded_at: Optional[float]
+
+
+class _Node:
+    """중심점을 지나는 기간들을 시작 오름차순/종료 내림차순으로 들고 있는 구간 트리 노드"""
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, center: datetime, periods: List[EventPeriod], left: "Optional[_Node]", right: "Optional[_Node]"):
+        self.center = center
+        self.by_start = sorted(periods, key=lambda period: period.start)
+        self.by_end = sorted(periods, key=lambda period: period.end, reverse=True)
+        self.left = left
+        self.right = right
+
+
+def _build_tree(periods: List[EventPeriod]) -> Optional[_Node]:
+    if not periods:
+        return None
+    # 양 끝점들의 중앙값을 중심으로 잡으면 트리 높이가 O(log n)이 됩니다.
+    points = sorted(point for period in periods for point in (period.start, period.end))
+    center = points[len(points) // 2]
+    left = [period for period in periods if period.end < center]
+    right = [period for period in periods if period.start > center]
+    here = [period for period in periods if period.start <= center <= period.end]
+    return _Node(center, here, _build_tree(left), _build_tree(right))
+
+
+def _query_tree(node: Optional[_Node], start: datetime, end: datetime) -> List[EventPeriod]:
+    """[start, end]와 겹치는 기간 (O(log n + 결과 수))"""
+    result: List[EventPeriod] = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        if end < node.center:
+            # 이 노드의 기간은 모두 center 이후에 끝나므로 시작만 보면 됩니다.
+            for period in node.by_start:
+                if period.start > end:
+                    break
+                result.append(period)
+            stack.append(node.left)
+        elif start > node.center:
+            # 이 노드의 기간은 모두 center 이전에 시작하므로 종료만 보면 됩니다.
+            for period in node.by_end:
+                if period.end < start:
+                    break
+                result.append(period)
+            stack.append(node.right)
+        else:
+            result.extend(node.by_start)
+            stack.append(node.left)
+            stack.append(node.right)
+    return result
+
+
+class EventIndex:
+    """
+    이벤트 기간 색인.
+
+    목록에서 읽은 이벤트 기간을 SQLite에 저장하고, 조회용으로 메모리에 구간 트리와 종료 시각 정렬 배열을 둡니다.
+    - active_at(T): T에 진행 중인 이벤트, overlapping(A, B): 기간이 [A, B]와 겹치는 이벤트 (구간 트리)
+    - ending_within(N): 지금부터 N시간 안에 끝나는 이벤트 (종료 시각 배열에서 이분 탐색)
+    다른 프로세스(크론으로 실행한 크롤러 등)가 색인을 바꾸면 다음 조회 때 다시 읽어서 트리를 새로 만듭니다.
+    """
+
+    def __init__(self, path: Union[str, Path] = EVENT_INDEX_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # 크롤러 스레드와 데몬 스레드가 함께 쓰므로 잠금으로 보호합니다.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._tree: Optional[_Node] = None
+        self._by_end: List[EventPeriod] = []
+        self._ends: List[datetime] = []
+        # 다른 연결이 커밋하면 data_version이 바뀝니다. 이 연결로 쓴 경우는 _dirty로 표시합니다.
+        self._data_version: Optional[int] = None
+        self._dirty = True
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def add_rows(self, rows: Iterable[ListRow]) -> int:
+        """목록 행들의 기간을 색인에 넣습니다. 기간이나 제목이 바뀐 이벤트만 갱신하고, 바뀐 개수를 반환합니다."""
+        now = time.time()
+        values = []
+        for row in rows:
+            if not row.id or not row.date:
+                continue
+            try:
+                start_date, end_date = parse_event_period(row.date)
+            except ValueError:
+                continue
+            values.append((row.id, row.title, row.date, start_date.timestamp(), end_date.timestamp(), now))
+        if not values:
+            return 0
+
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            # 종료 시각이 바뀌면 종료 임박 알림을 다시 보낼 수 있게 합니다 (기간 연장 등).
+            self._conn.executemany(
+                "INSERT INTO periods (event_id, title, raw, start_ts, end_ts, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (event_id) DO UPDATE SET title = excluded.title, raw = excluded.raw, "
+                "start_ts = excluded.start_ts, end_ts = excluded.end_ts, updated_at = excluded.updated_at, "
+                "reminded_at = CASE WHEN periods.end_ts = excluded.end_ts THEN periods.reminded_at END "
+                "WHERE periods.raw != excluded.raw OR periods.title != excluded.title",
+                values,
+            )
+            changed = self._conn.total_changes - before
+            if changed:
+                self._dirty = True
+        return changed
+
+    def _refresh(self) -> None:
+        """색인이 바뀌었으면 DB에서 다시 읽어 트리와 배열을 새로 만듭니다. 잠금 안에서 호출합니다."""
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if not self._dirty and data_version == self._data_version:
+            return
+        rows = self._conn.execute(
+            "SELECT event_id, title, raw, start_ts, end_ts, reminded_at FROM periods ORDER BY end_ts"
+        ).fetchall()
+        periods = [
+            EventPeriod(event_id, title, raw, datetime.fromtimestamp(start_ts), datetime.fromtimestamp(end_ts), reminded_at)
+            for event_id, title, raw, start_ts, end_ts, reminded_at in rows
+        ]
+        self._tree = _build_tree(periods)
+        self._by_end = periods
+        self._ends = [period.end for period in periods]
+        self._data_version = data_version
+        self._dirty = False
+
+    def overlapping(self, start: datetime, end: datetime) -> List[EventPeriod]:
+        """기간이 [start, end]와 겹치는 이벤트 (시작 순)"""
+        with self._lock:
+            self._refresh()
+            return sorted(_query_tree(self._tree, start, end), key=lambda period: period.start)
+
+    def active_at(self, when: Optional[datetime] = None) -> List[EventPeriod]:
+        """when(기본: 지금)에 진행 중인 이벤트 (시작 순)"""
+        when = when or datetime.now()
+        return self.overlapping(when, when)
+
+    def ending_within(self, hours: float, now: Optional[datetime] = None) -> List[EventPeriod]:
+        """now(기본: 지금)부터 hours시간 안에 끝나는 이벤트 (종료 순)"""
+        now = now or datetime.now()
+        with self._lock:
+            self._refresh()
+            low = bisect_left(self._ends, now)
+            high = bisect_right(self._ends, now + timedelta(hours=hours))
+            return self._by_end[low:high]
+
+    def mark_reminded(self, event_ids: Iterable[str]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE periods SET reminded_at = ? WHERE event_id = ?", [(now, event_id) for event_id in event_ids]
+            )
+            self._dirty = True
+
+    def enqueue_reminders(self, outbox: "NotificationOutbox", hours: float = EVENT_REMINDER_HOURS,
+                          now: Optional[datetime] = None) -> int:
+        """hours시간 안에 끝나는 이벤트 중 아직 알리지 않은 것을 보관함에 넣습니다. 넣은 개수를 반환합니다."""
+        due = [period for period in self.ending_within(hours, now) if period.reminded_at is None]
+        for period in due:
+            post = {'id': period.event_id, 'title': period.title, 'date': period.raw, 'type': "종료 임박"}
+            # 종료 시각을 키에 넣어서, 기간이 연장된 이벤트는 새 종료 시각 기준으로 다시 알립니다.
+            outbox.enqueue(
+                REMINDER_BOARD, f"{period.event_id}@{period.end:%Y%m%d%H%M}", post, f"{EVENT_URL}/{period.event_id}",
+                "이벤트 종료 임박", start_date=period.start.strftime("%Y-%m-%d %H:%M:%S"),
+                end_date=period.end.strftime("%Y-%m-%d %H:%M:%S"),
+            )
+        # 보관함에 들어간 뒤에 표시하므로, 중간에 멈춰도 알림이 빠지지 않습니다 (보관함이 같은 키는 한 번만 받음).
+        self.mark_reminded(period.event_id for period in due)
+        if due:
+            logging.info(f"종료 임박 이벤트 {len(due)}개 알림 등록 ({hours:.0f}시간 이내)")
+        return len(due)
+
+    def prune(self, retention_days: int = EVENT_INDEX_RETENTION_DAYS) -> int:
+        """종료된 지 보관 기간이 지난 이벤트를 지웁니다."""
+        with self._lock, self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM periods WHERE end_ts < ?", (time.time() - retention_days * 86400,)
+            ).rowcount
+            if deleted:
+                self._dirty = True
+        return deleted
@@ -0,0 +1,201 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Union
+import gzip
+import hashlib
+import sqlite3
+import threading
+import time
+import logging
+
+import requests
+
+from config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTL
+from crawler.common.html_parser import Document
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url           TEXT PRIMARY KEY,
+    path          TEXT NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    encoding      TEXT,
+    size          INTEGER NOT NULL,
+    raw_size      INTEGER NOT NULL,
+    fetched_at    REAL NOT NULL,
+    last_access   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access);
+
+CREATE TABLE IF NOT EXISTS totals (
+    id          INTEGER PRIMARY KEY CHECK (id = 0),
+    bytes       INTEGER NOT NULL,
+    hits        INTEGER NOT NULL,
+    revalidated INTEGER NOT NULL,
+    misses      INTEGER NOT NULL,
+    bytes_saved INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, bytes, hits, revalidated, misses, bytes_saved) VALUES (0, 0, 0, 0, 0, 0);
+"""
+
+# 파싱한 문서를 메모리에 보관하는 개수 (같은 본문을 다시 파싱하지 않음)
+PARSED_CACHE_SIZE = 32
+
+
+class CachedPage(NamedTuple):
+    url: str
+    path: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    encoding: Optional[str]
+    raw_size: int
+    fetched_at: float
+
+
+class HttpCache:
+    """
+    URL별 HTTP 응답 캐시 (디스크).
+
+    본문은 gzip으로 압축해서 파일로 두고, ETag/Last-Modified와 사용 시각은 SQLite 인덱스에 둡니다.
+    - HTTP_CACHE_TTL의 URL 접두어에 맞는 페이지는 TTL 동안 요청 없이 저장된 본문을 씁니다.
+    - 그 밖에는 조건부 요청을 보내고, 304면 저장된 본문(과 이미 파싱한 문서)을 그대로 씁니다.
+    - 압축된 본문 합계가 max_bytes를 넘으면 오래 사용하지 않은 것부터 지웁니다 (LRU).
+    적중/재검증/미스 횟수와 아낀 바이트는 totals 행에 누적됩니다.
+    """
+
+    def __init__(self, root: Union[str, Path] = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES,
+                 ttl: Optional[Dict[str, float]] = None):
+        self.root = Path(root)
+        self.body_dir = self.root / "bodies"
+        self.body_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = HTTP_CACHE_TTL if ttl is None else ttl
+        # 크롤러 스레드와 비동기 러너의 요청 스레드들이 함께 쓰므로 잠금으로 보호합니다.
+        self._conn = sqlite3.connect(self.root / "index.db", check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        # URL → (본문 해시, 파싱한 문서)
+        self._parsed: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def ttl_for(self, url: str) -> float:
+        return max((ttl for prefix, ttl in self.ttl.items() if url.startswith(prefix)), default=0.0)
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, path, etag, last_modified, encoding, raw_size, fetched_at FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None or not Path(row[1]).exists():
+            return None
+        return CachedPage(*row)
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        return time.time() - page.fetched_at < self.ttl_for(page.url)
+
+    @staticmethod
+    def conditional_headers(page: Optional[CachedPage]) -> Dict[str, str]:
+        headers = {}
+        if page and page.etag:
+            headers["If-None-Match"] = page.etag
+        if page and page.last_modified:
+            headers["If-Modified-Since"] = page.last_modified
+        return headers
+
+    def read(self, page: CachedPage, revalidated: bool = False) -> str:
+        """저장된 본문을 읽고 사용 시각과 적중 횟수를 갱신합니다. revalidated면 304로 확인한 경우입니다."""
+        data = gzip.decompress(Path(page.path).read_bytes())
+        now = time.time()
+        with self._lock, self._conn:
+            if revalidated:
+                # 304를 받았으니 TTL을 다시 시작합니다.
+                self._conn.execute("UPDATE entries SET last_access = ?, fetched_at = ? WHERE url = ?", (now, now, page.url))
+            else:
+                self._conn.execute("UPDATE entries SET last_access = ? WHERE url = ?", (now, page.url))
+            column = "revalidated" if revalidated else "hits"
+            self._conn.execute(
+                f"UPDATE totals SET {column} = {column} + 1, bytes_saved = bytes_saved + ? WHERE id = 0", (page.raw_size,)
+            )
+        return data.decode(page.encoding or "utf-8", errors="replace")
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """200 응답을 저장합니다. 검증자(ETag/Last-Modified)도 TTL도 없는 페이지는 저장하지 않습니다."""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE totals SET misses = misses + 1 WHERE id = 0")
+        if not (etag or last_modified or self.ttl_for(url)):
+            return
+
+        raw = response.content
+        compressed = gzip.compress(raw, compresslevel=6)
+        path = self.body_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.html.gz"
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(compressed)
+        tmp_path.replace(path)
+        now = time.time()
+        with self._lock, self._conn:
+            previous = self._conn.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, path, etag, last_modified, encoding, size, raw_size, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, str(path), etag, last_modified, response.encoding, len(compressed), len(raw), now, now),
+            )
+            self._conn.execute(
+                "UPDATE totals SET bytes = bytes + ? WHERE id = 0", (len(compressed) - (previous[0] if previous else 0),)
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """압축된 본문 합계가 예산을 넘는 동안 가장 오래 사용하지 않은 것부터 지웁니다. 잠금/트랜잭션 안에서 호출합니다."""
+        while True:
+            total_bytes = self._conn.execute("SELECT bytes FROM totals WHERE id = 0").fetchone()[0]
+            if total_bytes <= self.max_bytes:
+                return
+            oldest = self._conn.execute(
+                "SELECT url, path, size FROM entries ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if oldest is None:
+                return
+            url, path, size = oldest
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._conn.execute("UPDATE totals SET bytes = bytes - ? WHERE id = 0", (size,))
+            Path(path).unlink(missing_ok=True)
+            self._parsed.pop(url, None)
+
+    def parsed(self, url: str, html: str, parse: Callable[[str], Document]) -> Document:
+        """본문이 이전과 같으면 이미 파싱한 문서를 돌려주고, 아니면 parse(html) 결과를 보관합니다."""
+        digest = hash(html)
+        with self._lock:
+            cached = self._parsed.get(url)
+            if cached and cached[0] == digest:
+                self._parsed.move_to_end(url)
+                return cached[1]
+        document = parse(html)
+        with self._lock:
+            self._parsed[url] = (digest, document)
+            self._parsed.move_to_end(url)
+            while len(self._parsed) > PARSED_CACHE_SIZE:
+                self._parsed.popitem(last=False)
+        return document
+
+    def stats(self) -> Dict[str, int]:
+        """누적 적중(hits)/재검증(revalidated, 304)/미스 횟수, 아낀 바이트, 저장된 압축 본문 크기"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT bytes, hits, revalidated, misses, bytes_saved FROM totals WHERE id = 0"
+            ).fetchone()
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return dict(zip(("bytes", "hits", "revalidated", "misses", "bytes_saved"), row), entries=entries)
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logging.info(
+            f"HTTP 캐시: 적중 {stats['hits']}, 304 {stats['revalidated']}, 미스 {stats['misses']}, "
+            f"아낀 전송량 {stats['bytes_saved'] / 1024:,.0f}KiB, 저장 {stats['entries']}개 {stats['bytes'] / 1024:,.0f}KiB"
+        )
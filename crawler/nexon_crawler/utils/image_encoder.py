@@ -0,0 +1,154 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+import multiprocessing
+import threading
+import io
+import logging
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow가 없으면 원본 이미지를 그대로 업로드합니다
+    Image = None
+
+from config import IMAGE_BYTE_BUDGET, IMAGE_ENCODE_LADDER, IMAGE_ENCODE_SCALES, IMAGE_ENCODE_WORKERS
+
+# 인코딩한 이미지는 원본 옆에 "<id>.fit.<확장자>"로 저장합니다.
+VARIANT_TAG = "fit"
+_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+
+def pillow_available() -> bool:
+    return Image is not None
+
+
+def variant_paths(source: Path) -> List[Path]:
+    """원본 이미지에 대해 만들어질 수 있는 인코딩 결과 경로들"""
+    return [source.with_name(f"{source.stem}.{VARIANT_TAG}.{extension}") for extension in _EXTENSIONS.values()]
+
+
+def _cached_variant(source: Path, budget: int) -> Optional[Path]:
+    source_mtime = source.stat().st_mtime_ns
+    for path in variant_paths(source):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if stat.st_mtime_ns >= source_mtime and stat.st_size <= budget:
+            return path
+    return None
+
+
+def _fit_to_budget(image, budget: int, ladder: Sequence[Tuple[str, int]],
+                   scales: Sequence[float]) -> Tuple[bytes, str]:
+    smallest: Optional[Tuple[bytes, str]] = None
+    for scale in scales:
+        resized = image if scale == 1 else image.resize(
+            (max(1, int(image.width * scale)), max(1, int(image.height * scale))), Image.LANCZOS
+        )
+        for image_format, quality in ladder:
+            options = {"method": 4} if image_format == "WEBP" else {"optimize": True, "progressive": True}
+            buffer = io.BytesIO()
+            resized.save(buffer, format=image_format, quality=quality, **options)
+            data = buffer.getvalue()
+            if len(data) <= budget:
+                return data, image_format
+            if smallest is None or len(data) < len(smallest[0]):
+                smallest = (data, image_format)
+    return smallest
+
+
+def encode_to_budget(source: str, budget: int, ladder: Sequence[Tuple[str, int]],
+                     scales: Sequence[float]) -> str:
+    """
+    이미지를 budget 바이트 안에 들어오도록 인코딩하고 저장 경로를 반환합니다 (프로세스 풀에서 실행).
+
+    크기 비율(scales)마다 (포맷, 품질) 단계(ladder)를 차례로 시도해서 처음으로 budget에 들어오는 결과를 씁니다.
+    끝까지 들어오지 않으면 가장 작은 결과를 씁니다. 이미 인코딩된 결과가 있으면 그대로 반환합니다.
+    """
+    source_path = Path(source)
+    cached = _cached_variant(source_path, budget)
+    if cached:
+        return str(cached)
+
+    with Image.open(source_path) as image:
+        data, image_format = _fit_to_budget(image.convert("RGB"), budget, ladder, scales)
+    # 단색 위주의 페이지는 PNG가 더 작을 수 있으므로, 원본이 예산 안이고 더 작으면 원본을 씁니다.
+    source_size = source_path.stat().st_size
+    if source_size <= budget and source_size <= len(data):
+        return source
+    target = source_path.with_name(f"{source_path.stem}.{VARIANT_TAG}.{_EXTENSIONS[image_format]}")
+    # 이전 포맷으로 만든 결과가 남아 있으면 지웁니다.
+    for path in variant_paths(source_path):
+        if path != target and path.exists():
+            path.unlink()
+    tmp_path = target.with_name(target.name + ".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(target)
+    return str(target)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # 크롬/스레드가 떠 있는 프로세스를 fork하지 않도록 spawn으로 워커를 띄웁니다.
+            _executor = ProcessPoolExecutor(max_workers=IMAGE_ENCODE_WORKERS,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def encode_images(paths: Sequence[str], budget: int = IMAGE_BYTE_BUDGET) -> List[str]:
+    """
+    스크린샷들을 프로세스 풀에서 병렬로 인코딩하고, 입력 순서대로 업로드할 파일 경로를 반환합니다.
+
+    빈 경로(캡처 실패)는 그대로 두고, Pillow가 없거나 인코딩에 실패하면 원본 경로를 반환합니다.
+    """
+    if not any(paths):
+        return list(paths)
+    if not pillow_available():
+        logging.warning("Pillow가 설치되어 있지 않아 원본 이미지를 그대로 업로드합니다")
+        return list(paths)
+
+    try:
+        executor = _get_executor()
+        futures = [
+            executor.submit(encode_to_budget, path, budget, IMAGE_ENCODE_LADDER, IMAGE_ENCODE_SCALES) if path else None
+            for path in paths
+        ]
+    except BrokenProcessPool as e:
+        logging.error(f"이미지 인코딩 프로세스 풀 오류: {str(e)}")
+        shutdown_encoder()
+        return list(paths)
+
+    results = []
+    for path, future in zip(paths, futures):
+        if future is None:
+            results.append(path)
+            continue
+        try:
+            encoded = future.result()
+            logging.info(f"이미지 인코딩: {Path(path).name} {Path(path).stat().st_size:,}B → "
+                         f"{Path(encoded).name} {Path(encoded).stat().st_size:,}B")
+            results.append(encoded)
+        except Exception as e:
+            logging.error(f"이미지 인코딩 중 오류 발생: {str(e)}")
+            results.append(path)
+            # 워커가 죽은 풀은 다시 쓸 수 없으므로 다음 호출에서 새로 만듭니다.
+            if isinstance(e, BrokenProcessPool):
+                shutdown_encoder()
+    return results
+
+
+def shutdown_encoder() -> None:
+    """인코딩 프로세스 풀을 종료합니다. 다음에 사용하면 다시 만듭니다."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
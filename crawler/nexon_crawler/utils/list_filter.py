@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import logging
+
+from crawler.common.list_extract import ListRow
+from crawler.nexon_crawler.utils.parse_event_date import EventDateParser
+
+# 상세 페이지를 받지 않고 건너뛴 이유
+WATERMARK = "watermark"  # 저장된 최신 ID 이하
+SEEN = "seen"            # 최신 ID보다 크지만 이미 처리한 글 (고정글 등 순서가 뒤섞인 글)
+EXPIRED = "expired"      # 목록의 기간으로 보아 이미 끝난 이벤트
+INVALID = "invalid"      # id/제목/날짜가 없거나 이벤트 기간을 읽을 수 없는 행
+
+SKIP_REASON_LABELS: Dict[str, str] = {
+    WATERMARK: "최신 ID 이하",
+    SEEN: "이미 처리",
+    EXPIRED: "종료된 이벤트",
+    INVALID: "목록 정보 부족",
+}
+
+
+class PrefilterResult(NamedTuple):
+    rows: List[ListRow]                                # 상세 페이지를 받아야 하는 행 (목록 순서 유지)
+    skipped: Dict[str, int]                            # 이유별로 건너뛴 행 수
+    periods: Dict[str, Tuple[datetime, datetime]]      # 이벤트 id → (시작, 종료), 이벤트 게시판만
+    settled_ids: List[str]                             # 처리할 필요가 없어 바로 처리 완료로 기록할 글 id (종료/형식 오류)
+
+    @property
+    def skipped_total(self) -> int:
+        return sum(self.skipped.values())
+
+    def describe(self) -> str:
+        details = ", ".join(f"{SKIP_REASON_LABELS[reason]} {count}" for reason, count in self.skipped.items() if count)
+        return f"상세 페이지 요청 {self.skipped_total}개 생략" + (f" ({details})" if details else "")
+
+
+def prefilter_rows(board: str, rows: Iterable[ListRow], watermark: Optional[int] = None,
+                   seen_ids: Iterable[str] = (), now: Optional[datetime] = None) -> PrefilterResult:
+    """
+    목록 행의 정보만으로 상세 페이지(와 스크린샷)가 필요한 행을 고릅니다.
+
+    - 저장된 최신 ID 이하이거나 이미 처리한(seen_ids) 글은 건너뜁니다.
+      최신 ID 이하에서 멈추지 않고 끝까지 보므로 위에 고정된 오래된 글이 있어도 새 글을 놓치지 않습니다.
+    - 이벤트 게시판은 목록의 기간 문자열을 먼저 읽어서 이미 끝난 이벤트는 요청하지 않습니다.
+    """
+    now = now or datetime.now()
+    seen_ids = set(seen_ids)
+    parser = EventDateParser() if board == "event" else None
+    selected: List[ListRow] = []
+    skipped = {WATERMARK: 0, SEEN: 0, EXPIRED: 0, INVALID: 0}
+    periods: Dict[str, Tuple[datetime, datetime]] = {}
+    settled_ids: List[str] = []
+
+    for row in rows:
+        if not row.id or not row.id.isdigit():
+            skipped[INVALID] += 1
+            continue
+        if watermark is not None and int(row.id) <= watermark:
+            skipped[WATERMARK] += 1
+            continue
+        if row.id in seen_ids:
+            skipped[SEEN] += 1
+            continue
+        if not row.title or not row.date:
+            skipped[INVALID] += 1
+            settled_ids.append(row.id)
+            continue
+        if parser is not None:
+            try:
+                start_date, end_date = parser.parse_event_date(row.date)
+            except ValueError as e:
+                logging.warning(f"이벤트 기간을 읽을 수 없어 건너뜁니다: {row.title} ({row.date}) {str(e)}")
+                skipped[INVALID] += 1
+                settled_ids.append(row.id)
+                continue
+            if now > end_date:
+                logging.info(f"종료된 이벤트 건너뛰기: {row.title} (종료일: {end_date})")
+                skipped[EXPIRED] += 1
+                settled_ids.append(row.id)
+                continue
+            periods[row.id] = (start_date, end_date)
+        selected.append(row)
+
+    return PrefilterResult(selected, skipped, periods, settled_ids)
@@ -0,0 +1,236 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Union
+import json
+import sqlite3
+import threading
+import time
+import logging
+
+from config import (
+    OUTBOX_FILE, OUTBOX_MAX_ATTEMPTS, OUTBOX_BACKOFF_BASE, OUTBOX_BACKOFF_MAX,
+    OUTBOX_LEASE, OUTBOX_POLL_INTERVAL, OUTBOX_RETENTION_DAYS
+)
+from crawler.nexon_crawler.utils.discord_dispatcher import DiscordDispatcher
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    key          TEXT PRIMARY KEY,
+    board        TEXT NOT NULL,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'pending',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error   TEXT,
+    created_at   TEXT NOT NULL,
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt);
+"""
+
+PENDING = "pending"
+SENT = "sent"
+DEAD = "dead"
+
+
+class OutboxEntry(NamedTuple):
+    key: str
+    board: str
+    payload: Dict
+    attempts: int
+
+
+class NotificationOutbox:
+    """
+    디스코드 알림 보관함.
+
+    크롤러는 알림을 보관함에 넣은 뒤(커밋된 뒤) 최신 ID를 저장하고, 실제 전송은 drain()이 따로 합니다.
+    - (게시판, 글 id)를 멱등 키로 써서 같은 글은 한 번만 들어가고, 전송에 성공한 알림은 다시 보내지 않습니다.
+    - 실패하면 지수 백오프로 다음 시도 시각을 미루고, OUTBOX_MAX_ATTEMPTS번 실패하면 dead 상태로 옮깁니다.
+    - 꺼내 간 알림은 OUTBOX_LEASE 동안 다른 프로세스의 drain()이 가져가지 않습니다.
+    """
+
+    def __init__(self, path: Union[str, Path] = OUTBOX_FILE, max_attempts: int = OUTBOX_MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        # 크롤러 스레드와 전송 작업 스레드가 함께 쓰므로 잠금으로 보호합니다.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @staticmethod
+    def make_key(board: str, item_id: str) -> str:
+        return f"{board}:{item_id}"
+
+    def enqueue(self, board: str, item_id: str, post: Dict, post_url: str, type: str = None,
+                image_path: str = None, start_date: str = None, end_date: str = None) -> bool:
+        """
+        알림을 보관함에 넣습니다 (DiscordDispatcher.submit과 같은 인자에 게시판/글 id를 더함).
+
+        Returns:
+            새로 넣었으면 True, 같은 키가 이미 있으면 False
+        """
+        payload = {
+            "post": post, "post_url": post_url, "type": type, "image_path": image_path,
+            "start_date": start_date, "end_date": end_date,
+        }
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox (key, board, payload, next_attempt, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.make_key(board, item_id), board, json.dumps(payload, ensure_ascii=False, default=str), now,
+                 datetime.now().strftime("%Y-%m-%d %H:%M:%S"), now),
+            )
+            return cursor.rowcount == 1
+
+    def known_ids(self, board: str, item_ids: Iterable[str]) -> Set[str]:
+        """item_ids 중 이미 보관함에 들어간(보냈거나 보낼 예정인) 글 id"""
+        keys = {self.make_key(board, item_id): item_id for item_id in item_ids}
+        if not keys:
+            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key FROM outbox WHERE key IN ({', '.join('?' * len(keys))})", list(keys)
+            ).fetchall()
+        return {keys[key] for key, in rows}
+
+    def claim_due(self, limit: int = 100) -> List[OutboxEntry]:
+        """보낼 때가 된 알림을 꺼내고, 임대 시간 동안 다른 drain()이 가져가지 않게 표시합니다."""
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT key, board, payload, attempts FROM outbox WHERE status = ? AND next_attempt <= ? "
+                "ORDER BY next_attempt LIMIT ?",
+                (PENDING, now, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE outbox SET next_attempt = ?, updated_at = ? WHERE key = ?",
+                [(now + OUTBOX_LEASE, now, row[0]) for row in rows],
+            )
+        return [OutboxEntry(key, board, json.loads(payload), attempts) for key, board, payload, attempts in rows]
+
+    def mark_sent(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = NULL, updated_at = ? WHERE key = ?",
+                (SENT, time.time(), key),
+            )
+
+    def mark_failed(self, key: str, error: str) -> str:
+        """실패를 기록하고 다음 시도 시각을 정합니다. 바뀐 상태(pending 또는 dead)를 반환합니다."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT attempts FROM outbox WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return DEAD
+            attempts = row[0] + 1
+            status = DEAD if attempts >= self.max_attempts else PENDING
+            delay = min(OUTBOX_BACKOFF_BASE * 2 ** (attempts - 1), OUTBOX_BACKOFF_MAX)
+            self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt = ?, last_error = ?, updated_at = ? "
+                "WHERE key = ?",
+                (status, attempts, now + delay, error, now, key),
+            )
+        return status
+
+    def retry_dead(self) -> int:
+        """dead 상태의 알림을 다시 보낼 수 있게 되돌립니다. 되돌린 개수를 반환합니다."""
+        now = time.time()
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE outbox SET status = ?, attempts = 0, next_attempt = ?, updated_at = ? WHERE status = ?",
+                (PENDING, now, now, DEAD),
+            ).rowcount
+
+    def prune(self, retention_days: int = OUTBOX_RETENTION_DAYS) -> int:
+        """보관 기간이 지난 전송 완료 기록을 지웁니다."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM outbox WHERE status = ? AND updated_at < ?",
+                (SENT, time.time() - retention_days * 86400),
+            ).rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 알림 수"""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return {PENDING: 0, SENT: 0, DEAD: 0, **dict(rows)}
+
+    def drain(self, dispatcher: DiscordDispatcher, timeout: Optional[float] = None) -> Dict[str, int]:
+        """
+        보낼 때가 된 알림을 발송기로 보내고 결과를 기록합니다.
+
+        Returns:
+            이번에 보낸 결과 {"sent": 성공, "retry": 재시도 예정, "dead": 포기}
+        """
+        result = {SENT: 0, "retry": 0, DEAD: 0}
+        with self._drain_lock:
+            entries = self.claim_due()
+            if not entries:
+                return result
+            futures = [(entry, dispatcher.submit(**entry.payload)) for entry in entries]
+            for entry, future in futures:
+                try:
+                    delivered = future.result(timeout)
+                    error = "" if delivered else "webhook delivery failed"
+                except Exception as e:
+                    # 시간 초과 등으로 결과를 모르면 임대가 끝난 뒤 다시 시도합니다 (중복 전송 가능성은 남음).
+                    logging.error(f"알림 전송 결과 확인 실패 ({entry.key}): {str(e)}")
+                    continue
+                if delivered:
+                    self.mark_sent(entry.key)
+                    result[SENT] += 1
+                    continue
+                status = self.mark_failed(entry.key, error)
+                if status == DEAD:
+                    logging.error(f"알림 전송을 {self.max_attempts}번 실패해서 포기합니다: {entry.key}")
+                    result[DEAD] += 1
+                else:
+                    result["retry"] += 1
+        logging.info(f"알림 보관함 전송 결과: {result}")
+        return result
+
+
+class OutboxWorker:
+    """
+    알림 보관함을 주기적으로 비우는 백그라운드 스레드 (데몬/비동기 러너용).
+
+    크롤러는 보관함에 넣기만 하고 wake()로 깨우면, 전송과 재시도는 이 스레드가 크롤링과 별개로 처리합니다.
+    """
+
+    def __init__(self, outbox: NotificationOutbox, dispatcher: DiscordDispatcher,
+                 interval: float = OUTBOX_POLL_INTERVAL):
+        self.outbox = outbox
+        self.dispatcher = dispatcher
+        self.interval = interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="outbox-worker", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        self.outbox.prune()
+        while not self._stop.is_set():
+            try:
+                self.outbox.drain(self.dispatcher)
+            except Exception as e:
+                logging.error(f"알림 보관함 전송 중 오류 발생: {str(e)}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def close(self) -> None:
+        """남은 알림을 한 번 더 보내고 스레드를 종료합니다."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self.outbox.drain(self.dispatcher)
@@ -0,0 +1,138 @@
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+import json
+import threading
+import time
+import logging
+
+from selenium import webdriver
+
+from config import SCREENSHOT_READY_SAMPLES, SCREENSHOT_READY_STATS_FILE
+
+# 한 번의 스크립트 호출로 준비 상태 신호를 모두 읽습니다.
+#   - readyState: 문서 로드 완료 여부
+#   - content: 게시글 본문 컨테이너가 있는지 (selector가 없으면 항상 true)
+#   - pendingImages: 본문 안에서 아직 디코딩되지 않은 이미지 수 (lazy 이미지는 제외)
+#   - resources: 지금까지 로드한 리소스 수 (변화가 멈추면 네트워크가 잠잠하다고 봅니다)
+_READY_SCRIPT = """
+const selector = arguments[0];
+const container = selector ? document.querySelector(selector) : null;
+const images = Array.from((container || document).querySelectorAll('img'))
+    .filter(img => img.loading !== 'lazy');
+return {
+    readyState: document.readyState,
+    content: !selector || container !== null,
+    pendingImages: images.filter(img => !img.complete || (img.currentSrc && img.naturalWidth === 0)).length,
+    resources: performance.getEntriesByType('resource').length
+};
+"""
+
+
+def wait_until_ready(driver: webdriver.Chrome, selector: Optional[str], timeout: float,
+                     network_idle: float = 0.5, poll_interval: float = 0.1) -> Tuple[float, bool]:
+    """
+    페이지가 준비될 때까지 기다립니다.
+
+    문서 로드 완료, 본문 컨테이너 존재, 본문 이미지 디코딩 완료, 그리고 network_idle초 동안
+    새 리소스 요청이 없는 상태를 모두 만족하면 준비된 것으로 봅니다. timeout초가 지나면 그대로 진행합니다.
+
+    Returns:
+        (걸린 시간(초), 준비 완료 여부). 시간 초과면 False
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    resources = -1
+    quiet_since = started
+    while True:
+        now = time.monotonic()
+        try:
+            state = driver.execute_script(_READY_SCRIPT, selector)
+        except Exception as e:
+            logging.debug(f"준비 상태 확인 실패: {str(e)}")
+            state = None
+
+        if state:
+            if state["resources"] != resources:
+                resources = state["resources"]
+                quiet_since = now
+            if (state["readyState"] == "complete" and state["content"] and state["pendingImages"] == 0
+                    and now - quiet_since >= network_idle):
+                return now - started, True
+
+        if now >= deadline:
+            return now - started, False
+        time.sleep(poll_interval)
+
+
+class ReadinessStats:
+    """
+    게시판별 페이지 준비 시간 기록.
+
+    최근 samples개의 준비 시간과 시간 초과 횟수를 보관하고, save()로 JSON 파일에 요약을 남겨
+    대기 시간 설정을 조정할 때 참고할 수 있게 합니다.
+    """
+
+    def __init__(self, path: Path = SCREENSHOT_READY_STATS_FILE, samples: int = SCREENSHOT_READY_SAMPLES):
+        self.path = Path(path)
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._times: Dict[str, Deque[float]] = {}
+        self._timeouts: Dict[str, int] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        for board, entry in data.items():
+            self._times[board] = deque(entry.get("samples", []), maxlen=self.samples)
+            self._timeouts[board] = entry.get("timeouts", 0)
+
+    def record(self, board: str, elapsed: float, ready: bool) -> None:
+        with self._lock:
+            self._times.setdefault(board, deque(maxlen=self.samples)).append(round(elapsed, 3))
+            if not ready:
+                self._timeouts[board] = self._timeouts.get(board, 0) + 1
+
+    def summary(self, board: str) -> Dict:
+        with self._lock:
+            times = sorted(self._times.get(board, ()))
+            timeouts = self._timeouts.get(board, 0)
+        if not times:
+            return {"count": 0, "timeouts": timeouts}
+        return {
+            "count": len(times),
+            "timeouts": timeouts,
+            "avg": round(sum(times) / len(times), 3),
+            "p50": times[len(times) // 2],
+            "p95": times[min(len(times) - 1, int(len(times) * 0.95))],
+            "max": times[-1],
+        }
+
+    def save(self) -> None:
+        with self._lock:
+            boards = list(self._times)
+        data = {board: {**self.summary(board), "samples": list(self._times[board])} for board in boards}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logging.error(f"준비 시간 통계 저장 중 오류 발생: {str(e)}")
+
+
+# 스크린샷 준비 시간 통계 (처음 쓸 때 만들어서, import만 한 곳은 상태를 공유하지 않습니다)
+_ready_stats: Optional[ReadinessStats] = None
+_ready_stats_lock = threading.Lock()
+
+
+def get_ready_stats() -> ReadinessStats:
+    global _ready_stats
+    # 스크린샷 스레드들이 동시에 처음 호출할 수 있으므로 잠금 안에서 만듭니다.
+    with _ready_stats_lock:
+        if _ready_stats is None:
+            _ready_stats = ReadinessStats()
+        return _ready_stats
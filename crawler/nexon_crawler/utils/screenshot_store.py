@@ -0,0 +1,169 @@
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Union
+import hashlib
+import sqlite3
+import threading
+import time
+import logging
+
+from config import SCREENSHOT_STORE_DIR, SCREENSHOT_STORE_MAX_BYTES, SCREENSHOT_STORE_MAX_ITEMS
+from crawler.nexon_crawler.utils.image_encoder import variant_paths
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    refs INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS items (
+    board       TEXT NOT NULL,
+    item_id     TEXT NOT NULL,
+    hash        TEXT NOT NULL REFERENCES blobs (hash),
+    captured_at TEXT NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (board, item_id)
+);
+CREATE INDEX IF NOT EXISTS idx_items_last_access ON items (last_access);
+
+CREATE TABLE IF NOT EXISTS totals (
+    id    INTEGER PRIMARY KEY CHECK (id = 0),
+    items INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, items, bytes) VALUES (0, 0, 0);
+"""
+
+
+class ScreenshotStore:
+    """
+    세 넥슨 크롤러가 함께 쓰는 스크린샷 저장소.
+
+    (게시판, 글 id) → 이미지 파일을 SQLite 인덱스로 관리합니다.
+    - 이미지는 내용 해시 이름으로 한 번만 저장하고, 같은 이미지는 여러 글이 함께 참조합니다.
+    - 전체 글 수와 바이트 합계를 totals 행에 유지해서 폴더를 훑지 않고도 예산 초과를 바로 알 수 있습니다.
+    - 예산을 넘으면 마지막으로 사용한 시각 인덱스에서 가장 오래된 글부터 지웁니다 (LRU).
+    """
+
+    def __init__(self, root: Union[str, Path] = SCREENSHOT_STORE_DIR,
+                 max_bytes: int = SCREENSHOT_STORE_MAX_BYTES, max_items: int = SCREENSHOT_STORE_MAX_ITEMS):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.staging_dir = self.root / "staging"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        # 브라우저 풀의 캡처 스레드들이 함께 쓰므로 잠금으로 보호합니다.
+        self._conn = sqlite3.connect(self.root / "index.db", check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def staging_path(self, board: str, item_id: str) -> Path:
+        """캡처를 잠시 저장할 경로 (put()이 저장소로 옮깁니다)"""
+        return self.staging_dir / f"{board}_{item_id}.png"
+
+    def get(self, board: str, item_id: str) -> Optional[str]:
+        """저장된 스크린샷 경로를 반환하고 사용 시각을 갱신합니다. 없으면 None"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT blobs.path FROM items JOIN blobs USING (hash) WHERE board = ? AND item_id = ?",
+                (board, item_id),
+            ).fetchone()
+            if row is None:
+                return None
+            if not Path(row[0]).exists():
+                # 파일이 밖에서 지워졌으면 인덱스에서도 빼고 다시 캡처하게 합니다.
+                self._remove_item(board, item_id)
+                return None
+            self._conn.execute(
+                "UPDATE items SET last_access = ? WHERE board = ? AND item_id = ?", (time.time(), board, item_id)
+            )
+            return row[0]
+
+    def put(self, board: str, item_id: str, source: Union[str, Path]) -> str:
+        """
+        캡처한 파일을 저장소로 옮기고 저장된 경로를 반환합니다.
+
+        같은 내용의 이미지가 이미 있으면 새 파일은 지우고 기존 파일을 함께 참조합니다.
+        """
+        source = Path(source)
+        data = source.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        blob_path = self.blob_dir / f"{digest}{source.suffix}"
+        now = time.time()
+        with self._lock, self._conn:
+            # 같은 글을 다시 넣으면 이전 이미지 참조를 먼저 해제합니다.
+            self._remove_item(board, item_id)
+            blob = self._conn.execute("SELECT path FROM blobs WHERE hash = ?", (digest,)).fetchone()
+            if blob and Path(blob[0]).exists():
+                source.unlink()
+                self._conn.execute("UPDATE blobs SET refs = refs + 1 WHERE hash = ?", (digest,))
+                logging.info(f"같은 스크린샷이 이미 있어 재사용합니다: {board}/{item_id}")
+            else:
+                source.replace(blob_path)
+                if blob:
+                    # 인덱스에는 있는데 파일만 없어진 경우 (크기는 이미 합계에 들어 있음)
+                    self._conn.execute("UPDATE blobs SET path = ?, refs = refs + 1 WHERE hash = ?", (str(blob_path), digest))
+                else:
+                    self._conn.execute(
+                        "INSERT INTO blobs (hash, path, size, refs) VALUES (?, ?, ?, 1)", (digest, str(blob_path), len(data))
+                    )
+                    self._conn.execute("UPDATE totals SET bytes = bytes + ? WHERE id = 0", (len(data),))
+            self._conn.execute(
+                "INSERT INTO items (board, item_id, hash, captured_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (board, item_id, digest, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), now),
+            )
+            self._conn.execute("UPDATE totals SET items = items + 1 WHERE id = 0")
+            return str(blob_path)
+
+    def _remove_item(self, board: str, item_id: str) -> None:
+        """글 하나를 인덱스에서 빼고, 더 이상 참조하지 않는 이미지 파일을 지웁니다. 잠금/트랜잭션 안에서 호출합니다."""
+        row = self._conn.execute(
+            "SELECT hash FROM items WHERE board = ? AND item_id = ?", (board, item_id)
+        ).fetchone()
+        if row is None:
+            return
+        digest = row[0]
+        self._conn.execute("DELETE FROM items WHERE board = ? AND item_id = ?", (board, item_id))
+        self._conn.execute("UPDATE totals SET items = items - 1 WHERE id = 0")
+        self._conn.execute("UPDATE blobs SET refs = refs - 1 WHERE hash = ?", (digest,))
+        blob = self._conn.execute("SELECT path, size FROM blobs WHERE hash = ? AND refs <= 0", (digest,)).fetchone()
+        if blob is None:
+            return
+        path, size = Path(blob[0]), blob[1]
+        self._conn.execute("DELETE FROM blobs WHERE hash = ?", (digest,))
+        self._conn.execute("UPDATE totals SET bytes = bytes - ? WHERE id = 0", (size,))
+        # 업로드용으로 인코딩한 이미지도 함께 삭제
+        for file in [path, *variant_paths(path)]:
+            file.unlink(missing_ok=True)
+
+    def totals(self) -> tuple:
+        """(글 수, 이미지 바이트 합계)"""
+        with self._lock:
+            return self._conn.execute("SELECT items, bytes FROM totals WHERE id = 0").fetchone()
+
+    def evict(self) -> int:
+        """바이트/개수 예산을 넘는 동안 가장 오래 사용하지 않은 글부터 지웁니다. 지운 글 수를 반환합니다."""
+        evicted = 0
+        with self._lock, self._conn:
+            while True:
+                items, total_bytes = self._conn.execute("SELECT items, bytes FROM totals WHERE id = 0").fetchone()
+                if items <= self.max_items and total_bytes <= self.max_bytes:
+                    break
+                oldest = self._conn.execute(
+                    "SELECT board, item_id FROM items ORDER BY last_access LIMIT 1"
+                ).fetchone()
+                if oldest is None:
+                    break
+                self._remove_item(*oldest)
+                evicted += 1
+        if evicted:
+            logging.info(f"오래된 스크린샷 {evicted}개 삭제")
+        return evicted
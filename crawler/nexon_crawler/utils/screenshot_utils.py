@@ -1,42 +1,226 @@
+from concurrent.futures import ThreadPoolExecutor
+import base64
+from contextlib import contextmanager
 from pathlib import Path
-import time
+from typing import Iterator, List, Optional, Tuple
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 import logging
 
+from config import (
+    SCREENSHOT_POOL_SIZE, SCREENSHOT_RECYCLE_AFTER,
+    SCREENSHOT_READY_TIMEOUT, SCREENSHOT_NETWORK_IDLE, SCREENSHOT_READY_SELECTORS,
+    SCREENSHOT_CAPTURE_MODE, SCREENSHOT_HEIGHT_RATIO
+)
+from crawler.nexon_crawler.utils.page_ready import wait_until_ready, get_ready_stats
+from crawler.nexon_crawler.utils.screenshot_store import ScreenshotStore
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+def _chromedriver_path() -> str:
+    """크롬드라이버 경로를 한 번만 확인합니다 (여러 스레드가 동시에 내려받지 않도록)."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
 def setup_webdriver() -> webdriver.Chrome:
     """웹드라이버 설정을 초기화하고 반환합니다."""
     chrome_options = Options()
     chrome_options.add_argument('--headless')
     chrome_options.add_argument('--no-sandbox')
     chrome_options.add_argument('--disable-dev-shm-usage')
-    return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
+    return webdriver.Chrome(service=Service(_chromedriver_path()), options=chrome_options)
 
-def cleanup_old_screenshots(folder_path: Path, max_files: int = 10) -> None:
-    logging.info(f"cleanup_old_screenshots: {folder_path}")
-    try:
-        # 폴더 내 모든 이미지 파일 가져오기
-        image_files = list(folder_path.glob('*.png'))
-        
-        # 파일 개수가 max_files를 초과하는 경우
-        if len(image_files) > max_files:
-            # 파일명에서 ID 추출하여 정렬
-            sorted_files = sorted(image_files, key=lambda x: int(x.stem.split('_')[-1]))
-            
-            # 삭제할 파일 개수 계산
-            files_to_delete = len(sorted_files) - max_files
-            
-            # 가장 오래된 파일부터 삭제
-            for file in sorted_files[:files_to_delete]:
-                file.unlink()
-                logging.info(f"오래된 이미지 파일 삭제: {file}")
-                
-    except Exception as e:
-        logging.error(f"이미지 파일 정리 중 오류 발생: {str(e)}")
+class _PooledBrowser:
+    def __init__(self, driver: webdriver.Chrome):
+        self.driver = driver
+        self.captures = 0
+
+    def is_healthy(self) -> bool:
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def quit(self) -> None:
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logging.error(f"웹드라이버 종료 중 오류 발생: {str(e)}")
 
-def save_screenshot(driver: webdriver.Chrome, url: str, save_path: Path, wait_time: int = 2, capture_height_ratio: float = 0.5) -> str:
+class BrowserPool:
+    """
+    재사용하는 헤드리스 크롬 풀.
+
+    - 크롬은 처음 필요할 때 띄우고, 최대 size개까지만 동시에 실행합니다.
+    - 꺼낼 때마다 상태를 확인해서 응답하지 않는 크롬은 새로 띄웁니다.
+    - max_captures번 사용한 크롬은 메모리 누수를 막기 위해 종료하고 새로 띄웁니다.
+    - close() 후에도 다시 사용하면 새로 띄우므로, 데몬은 쉬는 시간에 close()만 호출하면 됩니다.
+    - 찍은 이미지는 ScreenshotStore에 넣고, 이미 저장된 글은 크롬을 빌리지 않고 바로 반환합니다.
+    """
+
+    def __init__(self, size: int = SCREENSHOT_POOL_SIZE, max_captures: int = SCREENSHOT_RECYCLE_AFTER,
+                 store: Optional[ScreenshotStore] = None):
+        self.size = size
+        self._store = store
+        self.max_captures = max_captures
+        # 쉬고 있는 크롬 (마지막에 반납한 것부터 꺼냄)과 실행 중인 크롬 수.
+        # 크롬이 반납되거나 종료되어 자리가 나면 기다리는 스레드를 깨웁니다.
+        self._idle: List[_PooledBrowser] = []
+        self._created = 0
+        self._available = threading.Condition()
+
+    @property
+    def active(self) -> int:
+        """현재 실행 중인 크롬 수"""
+        with self._available:
+            return self._created
+
+    def _checkout(self) -> _PooledBrowser:
+        with self._available:
+            while not self._idle and self._created >= self.size:
+                self._available.wait()
+            if self._idle:
+                browser = self._idle.pop()
+            else:
+                # 새로 띄울 자리를 먼저 잡아 둡니다 (크롬 시작은 잠금 밖에서).
+                self._created += 1
+                browser = None
+
+        if browser is not None:
+            if browser.is_healthy():
+                return browser
+            logging.warning("응답하지 않는 크롬을 다시 시작합니다")
+            browser.quit()
+        try:
+            logging.info("헤드리스 크롬 시작")
+            return _PooledBrowser(setup_webdriver())
+        except Exception:
+            self._release_slot()
+            raise
+
+    def _release_slot(self) -> None:
+        """크롬 하나가 종료되어 생긴 자리를 기다리는 스레드에게 넘깁니다."""
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _checkin(self, browser: _PooledBrowser) -> None:
+        browser.captures += 1
+        if browser.captures >= self.max_captures:
+            logging.info(f"크롬을 {browser.captures}회 사용해서 재시작합니다")
+            browser.quit()
+            self._release_slot()
+            return
+        with self._available:
+            self._idle.append(browser)
+            self._available.notify()
+
+    @contextmanager
+    def acquire(self) -> Iterator[webdriver.Chrome]:
+        """풀에서 크롬 하나를 빌려 줍니다. 모두 사용 중이면 반납될 때까지 기다립니다."""
+        browser = self._checkout()
+        try:
+            yield browser.driver
+        finally:
+            self._checkin(browser)
+
+    @property
+    def store(self) -> ScreenshotStore:
+        if self._store is None:
+            self._store = ScreenshotStore()
+        return self._store
+
+    def capture(self, url: str, item_id: str, board: str) -> str:
+        """글 하나의 스크린샷 경로를 반환합니다. 저장소에 있으면 크롬을 빌리지 않고 바로 반환합니다."""
+        cached = self.store.get(board, item_id)
+        if cached:
+            logging.info(f"이미지가 이미 존재합니다: {cached}")
+            return cached
+        staging_path = self.store.staging_path(board, item_id)
+        try:
+            with self.acquire() as driver:
+                saved = save_screenshot(driver, url, staging_path, board=board)
+            return self.store.put(board, item_id, staging_path) if saved else ""
+        except Exception as e:
+            logging.error(f"스크린샷 저장 중 오류 발생: {str(e)}")
+            return ""
+
+    def capture_batch(self, jobs: List[Tuple[str, str]], board: str) -> List[str]:
+        """(URL, 글 id) 목록의 스크린샷을 병렬로 찍고, 입력 순서대로 저장 경로를 반환합니다."""
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.size, len(jobs))) as executor:
+            results = list(executor.map(lambda job: self.capture(*job, board=board), jobs))
+        ready_stats = get_ready_stats()
+        logging.info(f"[{board}] 페이지 준비 시간: {ready_stats.summary(board)}")
+        ready_stats.save()
+        # 병렬로 찍는 동안 지우지 않도록 정리는 배치가 끝난 뒤 한 번만 합니다.
+        self.store.evict()
+        return results
+
+    def close(self) -> None:
+        """쉬고 있는 크롬을 모두 종료합니다."""
+        with self._available:
+            idle, self._idle = self._idle, []
+        for browser in idle:
+            browser.quit()
+            self._release_slot()
+
+# 캡처 영역 계산에 필요한 값을 한 번에 읽습니다 (문서 크기와 본문 요소의 페이지 기준 위치).
+_CLIP_SCRIPT = """
+const selector = arguments[0];
+const root = document.documentElement;
+const element = selector ? document.querySelector(selector) : null;
+const rect = element ? element.getBoundingClientRect() : null;
+return {
+    width: root.clientWidth,
+    height: Math.max(document.body.scrollHeight, document.body.offsetHeight, root.clientHeight, root.scrollHeight, root.offsetHeight),
+    element: rect && {x: rect.left + window.scrollX, y: rect.top + window.scrollY, width: rect.width, height: rect.height}
+};
+"""
+
+def _capture_clip(driver: webdriver.Chrome, save_path: Path, capture_height_ratio: float, selector: Optional[str]) -> None:
+    """창 크기를 바꾸지 않고 DevTools의 Page.captureScreenshot으로 지정한 영역만 한 번에 캡처합니다."""
+    metrics = driver.execute_script(_CLIP_SCRIPT, selector)
+    element = metrics.get("element")
+    if element and element["width"] > 0 and element["height"] > 0:
+        clip = element
+    else:
+        clip = {"x": 0, "y": 0, "width": metrics["width"], "height": max(1, int(metrics["height"] * capture_height_ratio))}
+    result = driver.execute_cdp_cmd("Page.captureScreenshot", {
+        "format": "png",
+        "captureBeyondViewport": True,
+        "clip": {**clip, "scale": 1},
+    })
+    save_path.write_bytes(base64.b64decode(result["data"]))
+
+def _capture_resize(driver: webdriver.Chrome, save_path: Path, capture_height_ratio: float) -> None:
+    """창 높이를 페이지 높이의 일부로 바꿔 캡처한 뒤 되돌립니다 (CDP를 쓸 수 없는 드라이버용)."""
+    # 페이지의 전체 높이 계산
+    total_height = driver.execute_script("return Math.max( document.body.scrollHeight, document.body.offsetHeight, document.documentElement.clientHeight, document.documentElement.scrollHeight, document.documentElement.offsetHeight );")
+    
+    # 현재 창 크기 가져오기
+    window_size = driver.get_window_size()
+    
+    # 전체 높이의 capture_height_ratio만큼 창 크기 조정 
+    capture_height = int(total_height * capture_height_ratio)
+    driver.set_window_size(window_size['width'], capture_height)
+    
+    # 스크린샷 저장
+    driver.save_screenshot(str(save_path))
+    
+    # 원래 창 크기로 복원
+    driver.set_window_size(window_size['width'], window_size['height'])
+
+def save_screenshot(driver: webdriver.Chrome, url: str, save_path: Path, wait_time: float = SCREENSHOT_READY_TIMEOUT, capture_height_ratio: float = SCREENSHOT_HEIGHT_RATIO, board: str = "", capture_mode: str = SCREENSHOT_CAPTURE_MODE) -> str:
     """
     웹페이지의 스크린샷을 저장합니다.
     
@@ -44,7 +228,9 @@ def save_screenshot(driver: webdriver.Chrome, url: str, save_path: Path, wait_ti
         driver: Selenium WebDriver 인스턴스
         url: 스크린샷을 찍을 웹페이지 URL
         save_path: 스크린샷을 저장할 경로
-        wait_time: 페이지 로딩 대기 시간 (초)
+        wait_time: 페이지 준비를 기다리는 최대 시간 (초). 준비되면 바로 진행합니다
+        board: 게시판 이름 (본문 컨테이너 선택과 준비 시간 기록에 사용)
+        capture_mode: clip(페이지 상단 영역) | element(본문 요소 영역) | resize(창 크기 조절)
     
     Returns:
         str: 저장된 스크린샷의 경로. 실패시 빈 문자열 반환
@@ -60,27 +246,18 @@ def save_screenshot(driver: webdriver.Chrome, url: str, save_path: Path, wait_ti
         
         # 페이지 로드
         driver.get(url)
-        time.sleep(wait_time)
-        
-        # 페이지의 전체 높이 계산
-        total_height = driver.execute_script("return Math.max( document.body.scrollHeight, document.body.offsetHeight, document.documentElement.clientHeight, document.documentElement.scrollHeight, document.documentElement.offsetHeight );")
-        
-        # 현재 창 크기 가져오기
-        window_size = driver.get_window_size()
-        
-        # 전체 높이의 50%로 창 크기 조정 
-        # TODO: 0.5 변수로 추가
-        capture_height = int(total_height * capture_height_ratio)
-        driver.set_window_size(window_size['width'], capture_height)
-        
-        # 스크린샷 저장
-        driver.save_screenshot(str(save_path))
-        
-        # 원래 창 크기로 복원
-        driver.set_window_size(window_size['width'], window_size['height'])
+        elapsed, ready = wait_until_ready(driver, SCREENSHOT_READY_SELECTORS.get(board), wait_time, SCREENSHOT_NETWORK_IDLE)
+        if board:
+            get_ready_stats().record(board, elapsed, ready)
+        if not ready:
+            logging.warning(f"페이지 준비 시간 초과 ({elapsed:.1f}초), 그대로 캡처합니다: {url}")
         
-        # 이미지 파일 정리 실행
-        cleanup_old_screenshots(save_path.parent)
+        # 스크린샷 저장 (CDP를 지원하면 창 크기를 바꾸지 않고 영역만 캡처)
+        if capture_mode != "resize" and hasattr(driver, "execute_cdp_cmd"):
+            selector = SCREENSHOT_READY_SELECTORS.get(board) if capture_mode == "element" else None
+            _capture_clip(driver, save_path, capture_height_ratio, selector)
+        else:
+            _capture_resize(driver, save_path, capture_height_ratio)
         
         return str(save_path)
     except Exception as e:
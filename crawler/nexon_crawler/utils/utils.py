@@ -3,13 +3,63 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import requests
-from bs4 import BeautifulSoup
+import time
 from time import sleep
 
 from config import (
-    SLEEP_TIME, MAX_RETRIES, USER_AGENT,
+    SLEEP_TIME, MAX_RETRIES, USER_AGENT, HTML_PARSER, REQUEST_TIMEOUT,
+    HTTP_POOL_SIZE, HTTP2_ENABLED, HTTP2_HOSTS,
+    RATE_INITIAL, RATE_MIN, RATE_MAX, RATE_BURST, RETRY_MAX_DELAY, CRAWL_DEADLINE,
+    BREAKER_THRESHOLD, BREAKER_COOLDOWN,
     OUTPUT_DIR, DEBUG_DIR, LOG_FORMAT, LOG_LEVEL
 )
+from crawler.common.html_parser import Document, parse_html
+from crawler.nexon_crawler.utils.http_cache import HttpCache
+from crawler.nexon_crawler.utils.event_index import EventIndex
+from crawler.nexon_crawler.utils.crawl_state import CrawlStateStore
+from crawler.common.transport import Timeout, create_session
+from crawler.common.rate_limit import (
+    AdaptiveHostLimiter, RetryPolicy, BlockedResponse, CircuitOpenError, DeadlineExceeded,
+    ERROR, THROTTLED, BLOCKED, classify_response, parse_retry_after
+)
+
+# 세 넥슨 크롤러, 프로브, 비동기 러너가 함께 쓰는 호스트별 속도 조절기와 재시도 정책
+rate_limiter = AdaptiveHostLimiter(
+    initial_rate=RATE_INITIAL, min_rate=RATE_MIN, max_rate=RATE_MAX, burst=RATE_BURST,
+    breaker_threshold=BREAKER_THRESHOLD, breaker_cooldown=BREAKER_COOLDOWN
+)
+retry_policy = RetryPolicy(
+    max_attempts=MAX_RETRIES, base_delay=SLEEP_TIME * 2, max_delay=RETRY_MAX_DELAY, budget=CRAWL_DEADLINE
+)
+# 목록/상세 페이지 HTTP 캐시 (처음 사용할 때 엽니다)
+_http_cache: Optional[HttpCache] = None
+
+
+def get_http_cache() -> HttpCache:
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = HttpCache()
+    return _http_cache
+
+# 이벤트 기간 색인 (이벤트 크롤러가 채우고, 데몬/비동기 러너가 종료 임박 알림에 씁니다)
+_event_index: Optional[EventIndex] = None
+
+
+def get_event_index() -> EventIndex:
+    global _event_index
+    if _event_index is None:
+        _event_index = EventIndex()
+    return _event_index
+
+# 게시판별 크롤링 상태 (최신 ID, 처리한 글 id, 마지막 확인 시각)
+_crawl_state: Optional[CrawlStateStore] = None
+
+
+def get_crawl_state() -> CrawlStateStore:
+    global _crawl_state
+    if _crawl_state is None:
+        _crawl_state = CrawlStateStore()
+    return _crawl_state
 
 def setup_logging() -> logging.Logger:
     """로깅 설정을 초기화하고 로거를 반환합니다."""
@@ -43,53 +93,83 @@ def save_json_file(file_path: Path, data: List[Dict[str, Any]]) -> None:
     except Exception as e:
         logging.error(f"JSON 파일 저장 중 오류 발생: {str(e)}")
 
-def get_page_content(url: str, session: requests.Session) -> Optional[BeautifulSoup]:
-    """웹 페이지를 가져와서 BeautifulSoup 객체로 반환합니다."""
-    for i in range(MAX_RETRIES):
+def fetch_response(url: str, session: requests.Session, timeout: Timeout = REQUEST_TIMEOUT,
+                   deadline: Optional[float] = None, **kwargs) -> requests.Response:
+    """
+    공유 속도 조절기를 거쳐 요청을 한 번 보내고, 응답 시간과 결과를 속도 조절기에 반영합니다.
+
+    Raises:
+        BlockedResponse: 429/503/403 또는 차단 페이지
+        CircuitOpenError, DeadlineExceeded: 속도 조절기가 요청을 막았을 때
+        requests.RequestException: 연결 오류, 그 밖의 HTTP 오류
+    """
+    rate_limiter.acquire(url, deadline)
+    started = time.monotonic()
+    try:
+        response = session.get(url, timeout=timeout, **kwargs)
+    except requests.RequestException:
+        rate_limiter.record(url, ERROR)
+        raise
+    outcome = classify_response(response.status_code, response.text if response.ok else "")
+    rate_limiter.record(url, outcome, time.monotonic() - started, parse_retry_after(response.headers.get("Retry-After")))
+    if outcome in (THROTTLED, BLOCKED):
+        raise BlockedResponse(f"요청 제한/차단 응답 ({response.status_code}): {url}", outcome)
+    response.raise_for_status()
+    return response
+
+def fetch_html(url: str, session: requests.Session, timeout: Timeout = REQUEST_TIMEOUT,
+               deadline: Optional[float] = None) -> str:
+    """
+    HTTP 캐시를 거쳐 HTML을 한 번 가져옵니다 (재시도 없음).
+
+    TTL 안이면 요청하지 않고, 아니면 조건부 요청을 보내서 304면 저장된 본문을 씁니다.
+    """
+    cache = get_http_cache()
+    cached = cache.lookup(url)
+    if cached and cache.is_fresh(cached):
+        return cache.read(cached)
+    response = fetch_response(url, session, timeout, deadline, headers=cache.conditional_headers(cached))
+    if response.status_code == 304 and cached:
+        return cache.read(cached, revalidated=True)
+    cache.store(url, response)
+    return response.text
+
+def get_page_html(url: str, session: requests.Session, deadline: Optional[float] = None) -> Optional[str]:
+    """웹 페이지를 가져와서 HTML 문자열로 반환합니다. deadline(time.monotonic 기준)이 지나면 재시도하지 않습니다."""
+    for i in range(retry_policy.max_attempts):
         try:
-            response = session.get(url)
-            response.raise_for_status()
-            sleep(SLEEP_TIME)
-            return BeautifulSoup(response.text, "html.parser")
+            return fetch_html(url, session, deadline=deadline)
+        except (CircuitOpenError, DeadlineExceeded) as e:
+            logging.error(f"페이지 로드 중단: {str(e)}")
+            return None
         except Exception as e:
-            logging.error(f"페이지 로드 실패 (시도 {i+1}/{MAX_RETRIES}): {str(e)}")
-            if i == MAX_RETRIES - 1:
+            logging.error(f"페이지 로드 실패 (시도 {i+1}/{retry_policy.max_attempts}): {str(e)}")
+            delay = retry_policy.next_delay(i, deadline)
+            if delay is None:
                 return None
-            sleep(SLEEP_TIME * 2)
+            sleep(delay)
+
+def get_page_content(url: str, session: requests.Session, deadline: Optional[float] = None) -> Optional[Document]:
+    """웹 페이지를 가져와서 파싱된 문서 객체로 반환합니다."""
+    html = get_page_html(url, session, deadline)
+    if not html:
+        return None
+    # 304/TTL 적중으로 본문이 같으면 이전에 파싱한 문서를 그대로 씁니다.
+    return get_http_cache().parsed(url, html, lambda page: parse_html(page, HTML_PARSER))
 
 def setup_session() -> requests.Session:
-    """requests 세션을 설정하고 반환합니다."""
-    session = requests.Session()
-    session.headers.update({
+    """
+    requests 세션을 설정하고 반환합니다 (연결 풀, 기본 타임아웃, br/gzip, 가능하면 HTTP/2).
+
+    fetch_html이 조건부 요청으로 캐시를 재검증하므로 Cache-Control: no-cache는 보내지 않습니다.
+    """
+    return create_session({
         'User-Agent': USER_AGENT,
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8',
         'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
         'Connection': 'keep-alive',
-        'Cache-Control': 'no-cache'
-    })
-    return session
+    }, pool_size=HTTP_POOL_SIZE, timeout=REQUEST_TIMEOUT, http2_hosts=HTTP2_HOSTS, http2=HTTP2_ENABLED)
 
 def save_current_items(file_url: str, items: List[Dict]) -> None:
     """현재 아이템들을 JSON 파일로 저장합니다."""
     save_json_file(file_url, items)
-
-def load_latest_id(file_path: Path, crawler_type: str) -> Optional[str]:
-    """크롤러별 최신 ID를 로드합니다."""
-    try:
-        if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get(crawler_type)
-        return None
-    except Exception as e:
-        logging.error(f"최신 ID 로드 중 오류 발생: {str(e)}")
-        return None
-
-def save_latest_id(file_path: Path, crawler_type: str, latest_id: str) -> None:
-    """크롤러별 최신 ID를 저장합니다."""
-    try:
-        data = {crawler_type: latest_id}
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        logging.error(f"최신 ID 저장 중 오류 발생: {str(e)}") 
\ No newline at end of file
@@ -0,0 +1,168 @@
+import http.server
+import os
+import random
+import threading
+import unicodedata
+
+import pytest
+
+from crawler.dc_crawler.filter import badword_filter
+from crawler.dc_crawler.filter.badword_filter import BadWordFilter
+from crawler.dc_crawler.filter.badword_index import BadWordIndex
+from crawler.dc_crawler.filter.dataset_cache import MaliciousDatasetCache, normalize_phrase
+
+DATASET = "text,label\n나쁜   말,0\n좋은 말,1\n\"욕설\n문구\",0\n나쁜   말,0\n"
+
+
+def write_dataset(path, content=DATASET):
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+class _DatasetHandler(http.server.BaseHTTPRequestHandler):
+    """ETag가 같으면 304를 돌려주는 데이터셋 서버 흉내"""
+    body = DATASET.encode("utf-8")
+    etag = '"v1"'
+    requests = []
+
+    def do_GET(self):
+        cls = type(self)
+        cls.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == cls.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("ETag", cls.etag)
+        self.send_header("Content-Length", str(len(cls.body)))
+        self.end_headers()
+        self.wfile.write(cls.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def dataset_server():
+    _DatasetHandler.requests = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _DatasetHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/dataset.csv"
+    server.shutdown()
+    server.server_close()
+
+
+def test_local_file_source_keeps_only_normalized_malicious_phrases(tmp_path):
+    source = write_dataset(tmp_path / "dataset.csv")
+    cache = MaliciousDatasetCache(str(source), tmp_path / "cache")
+    assert cache.load() == ["나쁜 말", "욕설 문구"]
+    version = cache.cached_version()
+    assert version
+
+    # 캐시가 있으면 원본이 바뀌어도 revalidate 전까지는 캐시를 씁니다.
+    write_dataset(source, "text,label\n새 욕설,0\n")
+    os.utime(source, ns=(0, 0))
+    assert cache.load() == ["나쁜 말", "욕설 문구"]
+    assert cache.load(revalidate=True) == ["새 욕설"]
+    assert cache.cached_version() != version
+
+
+def test_remote_source_revalidates_with_304(tmp_path, dataset_server):
+    cache = MaliciousDatasetCache(dataset_server, tmp_path / "cache")
+    assert cache.load() == ["나쁜 말", "욕설 문구"]
+    version = cache.cached_version()
+
+    assert cache.load() == ["나쁜 말", "욕설 문구"]
+    assert _DatasetHandler.requests == [None]
+
+    assert cache.load(revalidate=True) == ["나쁜 말", "욕설 문구"]
+    assert _DatasetHandler.requests == [None, '"v1"']
+    assert cache.cached_version() == version
+
+
+def test_remote_failure_keeps_existing_cache(tmp_path, dataset_server, monkeypatch):
+    cache = MaliciousDatasetCache(dataset_server, tmp_path / "cache")
+    cache.load()
+    version = cache.cached_version()
+
+    # 형식이 깨진 새 데이터셋을 받으면 갱신에 실패하고 기존 캐시를 그대로 씁니다.
+    monkeypatch.setattr(_DatasetHandler, "etag", '"v2"')
+    monkeypatch.setattr(_DatasetHandler, "body", b"broken")
+    assert cache.load(revalidate=True) == ["나쁜 말", "욕설 문구"]
+    assert cache.cached_version() == version
+
+
+def test_filter_rebuilds_index_only_when_dataset_version_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(badword_filter, "DATASET_CACHE_DIR", str(tmp_path / "cache"))
+    source = write_dataset(tmp_path / "dataset.csv")
+    index_path = str(tmp_path / "index.pkl")
+
+    first = BadWordFilter(index_path=index_path, dataset_source=str(source))
+    assert first.contains_bad_word("정말 나쁜 말이네")
+    built = []
+    monkeypatch.setattr(badword_filter, "BadWordIndex", _recording(built))
+
+    # 같은 버전이면 저장된 인덱스를 그대로 읽습니다.
+    second = BadWordFilter(index_path=index_path, dataset_source=str(source))
+    assert second.index.version == first.index.version
+    assert built == []
+
+    # 데이터셋이 바뀌면 새 버전으로 다시 빌드합니다.
+    write_dataset(source, "text,label\n새 욕설,0\n")
+    os.utime(source, ns=(0, 0))
+    third = BadWordFilter(index_path=index_path, dataset_source=str(source), revalidate=True)
+    assert len(built) == 1
+    assert third.index.version != first.index.version
+    assert third.contains_bad_word("새 욕설")
+    assert not third.contains_bad_word("정말 나쁜 말이네")
+
+
+def _recording(built):
+    class RecordingIndex(BadWordIndex):
+        def __init__(self, *args, **kwargs):
+            built.append(args)
+            super().__init__(*args, **kwargs)
+
+    # 저장된 파일은 BadWordIndex이므로 로드는 원래 클래스 기준으로 검사합니다.
+    RecordingIndex.load = BadWordIndex.load
+    return RecordingIndex
+
+
+def _brute_force(phrases, text):
+    text = normalize_phrase(text)
+    if not text:
+        return set()
+    return {phrase for phrase in phrases if phrase in text or text in phrase}
+
+
+def test_index_matches_brute_force():
+    rng = random.Random(7)
+    alphabet = "가나다라 ab"
+    phrases = list(dict.fromkeys(
+        normalize_phrase("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 6)))) for _ in range(300)
+    ))
+    phrases = [phrase for phrase in phrases if phrase]
+    index = BadWordIndex(phrases)
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet + "\n") for _ in range(rng.randint(0, 20)))
+        expected = _brute_force(phrases, text)
+        assert set(index.find(text)) == expected, text
+        assert index.contains(text) == bool(expected), text
+
+
+def test_index_normalizes_post_text_like_dataset_phrases():
+    index = BadWordIndex([normalize_phrase("나쁜   말")])
+    text = unicodedata.normalize("NFD", "정말 나쁜\n 말이다")
+    assert index.find(text) == ["나쁜 말"]
+    assert index.contains(text)
+    assert not index.contains("  \n ")
+    assert index.find(None) == []
+
+
+def test_saved_index_round_trip(tmp_path):
+    index = BadWordIndex(["나쁜 말", "욕설"], version="v1")
+    index.save(tmp_path / "index.pkl")
+    loaded = BadWordIndex.load(tmp_path / "index.pkl")
+    assert loaded.version == "v1"
+    assert set(loaded.find("욕설이 섞인 나쁜 말")) == {"나쁜 말", "욕설"}
@@ -0,0 +1,155 @@
+import http.server
+import threading
+from pathlib import Path
+
+import pytest
+import requests
+
+from crawler.common.list_extract import extract_dc_rows
+from crawler.common.rate_limit import CircuitOpenError
+from crawler.dc_crawler import fetcher as fetcher_module
+from crawler.dc_crawler.fetcher import (
+    BotCheckDetected, FallbackFetcher, FixtureFetcher, HostRateLimiter, HttpFetcher, SeleniumFetcher, create_fetcher
+)
+
+FIXTURE = Path(__file__).resolve().parents[3] / "debug_first_page.html"
+FIXTURE_BYTES = FIXTURE.read_bytes()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """/list는 저장된 DC 목록 페이지를 (charset 없이), /blocked는 429를, /error는 500을 돌려줍니다."""
+
+    def do_GET(self):
+        if self.path == "/list":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(FIXTURE_BYTES)))
+            self.end_headers()
+            self.wfile.write(FIXTURE_BYTES)
+        elif self.path == "/blocked":
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def server_url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_fetcher():
+    fetcher = HttpFetcher(rate_limiter=HostRateLimiter(min_interval=0))
+    yield fetcher
+    fetcher.close()
+
+
+class FakeDriver:
+    def __init__(self):
+        self.visited = []
+        self.page_source = FIXTURE_BYTES.decode("utf-8")
+        self.quit_called = False
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def get_cookies(self):
+        return [{"name": "ci_c", "value": "passed", "domain": "127.0.0.1", "path": "/"}]
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeSeleniumFetcher(SeleniumFetcher):
+    def __init__(self):
+        super().__init__()
+        self.started = 0
+
+    def _setup_driver(self):
+        self.started += 1
+        return FakeDriver()
+
+
+@pytest.fixture(autouse=True)
+def no_selenium_sleep(monkeypatch):
+    monkeypatch.setattr(fetcher_module, "SLEEP_TIME", 0)
+
+
+def test_http_fetcher_reads_fixture_page(server_url, http_fetcher):
+    html = http_fetcher.fetch(f"{server_url}/list")
+    # charset이 없는 응답도 UTF-8로 읽습니다.
+    assert html == FIXTURE_BYTES.decode("utf-8")
+    rows = extract_dc_rows(html)
+    assert rows and all(row.id for row in rows)
+
+
+def test_http_fetcher_raises_on_throttle_and_server_error(server_url, http_fetcher):
+    with pytest.raises(BotCheckDetected):
+        http_fetcher.fetch(f"{server_url}/blocked")
+    with pytest.raises(requests.HTTPError):
+        http_fetcher.fetch(f"{server_url}/error")
+
+
+def test_fallback_uses_http_when_not_blocked(server_url, http_fetcher):
+    selenium = FakeSeleniumFetcher()
+    fetcher = FallbackFetcher(primary=http_fetcher, fallback=selenium)
+    assert fetcher.fetch(f"{server_url}/list") == FIXTURE_BYTES.decode("utf-8")
+    assert selenium.started == 0
+
+
+def test_fallback_retries_blocked_page_with_selenium_and_shares_cookies(server_url, http_fetcher):
+    selenium = FakeSeleniumFetcher()
+    fetcher = FallbackFetcher(primary=http_fetcher, fallback=selenium)
+    html = fetcher.fetch(f"{server_url}/blocked")
+    assert extract_dc_rows(html)
+    assert selenium.driver.visited == [f"{server_url}/blocked"]
+    assert http_fetcher.session.cookies.get("ci_c") == "passed"
+
+
+def test_fallback_used_while_circuit_is_open(http_fetcher):
+    def circuit_open(url):
+        raise CircuitOpenError("open")
+
+    selenium = FakeSeleniumFetcher()
+    http_fetcher.fetch = circuit_open
+    assert FallbackFetcher(primary=http_fetcher, fallback=selenium).fetch("http://127.0.0.1:9/list")
+    assert selenium.started == 1
+
+
+def test_fetchers_share_one_selenium_instance(server_url):
+    selenium = FakeSeleniumFetcher()
+    limiter = HostRateLimiter(min_interval=0)
+    fetchers = [create_fetcher("http", limiter, fallback=selenium) for _ in range(3)]
+    threads = [threading.Thread(target=fetcher.fetch, args=(f"{server_url}/blocked",)) for fetcher in fetchers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert selenium.started == 1
+    assert len(selenium.driver.visited) == 3
+
+    # 넘겨받은 크롬은 닫지 않습니다 (닫는 것은 넘겨준 쪽이 맡음).
+    for fetcher in fetchers:
+        fetcher.close()
+    assert not selenium.driver.quit_called
+    assert create_fetcher("selenium", fallback=selenium) is selenium
+    selenium.close()
+
+
+def test_fixture_fetcher():
+    assert FixtureFetcher(FIXTURE).fetch("https://gall.dcinside.com/any") == FIXTURE_BYTES.decode("utf-8")
+    fetcher = FixtureFetcher({"https://gall.dcinside.com/list": FIXTURE})
+    assert extract_dc_rows(fetcher.fetch("https://gall.dcinside.com/list"))
+    assert fetcher.fetch("https://gall.dcinside.com/other") is None
@@ -0,0 +1,47 @@
+import sqlite3
+
+import pytest
+
+from crawler.dc_crawler.post_store import PostStore
+
+POST = ("101", "제목", "본문", "2024-01-01 00:00:00")
+
+
+@pytest.fixture
+def store(tmp_path):
+    flushed = []
+    store = PostStore(str(tmp_path / "posts.db"), batch_size=10, on_flush=flushed.extend)
+    store.flushed = flushed
+    yield store
+    store.close()
+
+
+def test_flush_writes_batch_and_calls_on_flush(store):
+    store.add_post(POST)
+    assert store.flush() == 1
+    assert store.count() == 1
+    assert store.flushed == [POST]
+
+
+def test_failed_flush_keeps_batch_for_retry(store, monkeypatch):
+    store.add_post(POST)
+
+    def locked(posts):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(store, "upsert_posts", locked)
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+    assert store.flushed == []
+
+    # 실패한 배치는 새로 들어온 게시글보다 앞에 남아 있다가 다음 flush에서 저장됩니다.
+    store.add_post(("102", "다음 글", "본문", "2024-01-01 00:01:00"))
+    monkeypatch.undo()
+    assert store.flush() == 2
+    assert [post[0] for post in store.flushed] == ["101", "102"]
+
+
+def test_non_numeric_ids_are_skipped(store):
+    assert store.upsert_posts([POST, ("공지", "제목", "본문", "2024-01-01 00:00:00")]) == 1
+    assert store.upsert_replies([("101", "r1", "댓글", "01.01 00:00"), ("", "r2", "댓글", "01.01 00:00")]) == 1
+    assert not store.has_post("공지")
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+# 넥슨 크롤러 모듈은 nexon_crawler/config.py를 `config`로 import하므로 그 디렉토리를 파이썬 경로 맨 앞에 둡니다.
+# DC 테스트가 먼저 실행되어 다른 config가 올라와 있으면 내려서 다시 읽게 합니다.
+CRAWLER_DIR = Path(__file__).resolve().parent.parent.parent
+CONFIG_DIR = CRAWLER_DIR / "nexon_crawler"
+
+if str(CRAWLER_DIR.parent) not in sys.path:
+    sys.path.append(str(CRAWLER_DIR.parent))
+if str(CONFIG_DIR) in sys.path:
+    sys.path.remove(str(CONFIG_DIR))
+sys.path.insert(0, str(CONFIG_DIR))
+_config = sys.modules.get("config")
+if _config is not None and Path(_config.__file__).parent != CONFIG_DIR:
+    del sys.modules["config"]
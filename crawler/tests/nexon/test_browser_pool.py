@@ -0,0 +1,102 @@
+import threading
+
+import pytest
+
+from crawler.nexon_crawler.utils import screenshot_utils
+from crawler.nexon_crawler.utils.screenshot_utils import BrowserPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def execute_script(self, script, *args):
+        return 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    created = []
+
+    def setup_webdriver():
+        driver = FakeDriver()
+        created.append(driver)
+        return driver
+
+    monkeypatch.setattr(screenshot_utils, "setup_webdriver", setup_webdriver)
+    return created
+
+
+def test_reuses_idle_browser(drivers):
+    pool = BrowserPool(size=2, max_captures=10)
+    with pool.acquire() as first:
+        pass
+    with pool.acquire() as second:
+        pass
+    assert first is second
+    assert len(drivers) == 1
+    assert pool.active == 1
+
+
+def test_recycles_after_max_captures(drivers):
+    pool = BrowserPool(size=1, max_captures=2)
+    for _ in range(4):
+        with pool.acquire():
+            pass
+    assert len(drivers) == 2
+    assert all(driver.quit_called for driver in drivers)
+    assert pool.active == 0
+
+
+def test_waiter_wakes_when_all_held_browsers_are_recycled(drivers):
+    # 크롬 2개를 잡은 스레드가 모두 max_captures에 도달해 종료하면, 기다리던 세 번째 스레드가 새 크롬을 받아야 합니다.
+    pool = BrowserPool(size=2, max_captures=1)
+    holding = threading.Barrier(3)
+    release = threading.Event()
+    waiter_done = threading.Event()
+
+    def holder():
+        with pool.acquire():
+            holding.wait()
+            release.wait()
+
+    def waiter():
+        holding.wait()
+        with pool.acquire():
+            pass
+        waiter_done.set()
+
+    threads = [threading.Thread(target=target, daemon=True) for target in (holder, holder, waiter)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    assert waiter_done.wait(5), "반납된 자리를 기다리던 스레드가 깨어나지 않았습니다"
+    for thread in threads:
+        thread.join(5)
+    assert len(drivers) == 3
+    assert pool.active == 0
+
+
+def test_failed_start_frees_slot_for_waiter(drivers, monkeypatch):
+    pool = BrowserPool(size=1, max_captures=10)
+
+    def broken():
+        raise RuntimeError("chrome failed")
+
+    monkeypatch.setattr(screenshot_utils, "setup_webdriver", broken)
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            pass
+    assert pool.active == 0
+
+
+def test_close_quits_idle_browsers(drivers):
+    pool = BrowserPool(size=2, max_captures=10)
+    with pool.acquire():
+        pass
+    pool.close()
+    assert drivers[0].quit_called
+    assert pool.active == 0
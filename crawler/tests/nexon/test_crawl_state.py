@@ -0,0 +1,27 @@
+from crawler.nexon_crawler.utils.crawl_state import CrawlStateStore
+
+
+def test_poll_meta_update_does_not_overwrite_other_boards(tmp_path):
+    path = tmp_path / "crawl_state.db"
+    daemon, probe = CrawlStateStore(path), CrawlStateStore(path)
+    try:
+        # 두 프로세스가 각자 읽어 둔 뒤 서로 다른 게시판을 저장해도 둘 다 남아야 합니다.
+        daemon_meta = daemon.get_poll_meta("alpha")
+        probe_meta = probe.get_poll_meta("beta")
+        daemon.update_poll_meta("alpha", {**daemon_meta, "etag": "a1"})
+        probe.update_poll_meta("beta", {**probe_meta, "etag": "b1"})
+        assert daemon.get_poll_meta("alpha") == {"etag": "a1"}
+        assert daemon.get_poll_meta("beta") == {"etag": "b1"}
+    finally:
+        daemon.close()
+        probe.close()
+
+
+def test_poll_meta_update_merges_keys(tmp_path):
+    store = CrawlStateStore(tmp_path / "crawl_state.db")
+    try:
+        assert store.get_poll_meta("alpha") == {}
+        store.update_poll_meta("alpha", {"etag": "a1", "list_hash": "h1"})
+        assert store.update_poll_meta("alpha", {"etag": "a2"}) == {"etag": "a2", "list_hash": "h1"}
+    finally:
+        store.close()
@@ -0,0 +1,134 @@
+import http.server
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from crawler.nexon_crawler.utils.discord_dispatcher import (
+    MAX_EMBED_TOTAL, MAX_EMBEDS_PER_MESSAGE, DiscordDispatcher, Notification, embed_length
+)
+
+
+class _Webhook(http.server.BaseHTTPRequestHandler):
+    """디스코드 웹훅 흉내: responses에 넣은 (상태 코드, 헤더)를 차례로 돌려주고, 다 쓰면 204를 돌려줍니다."""
+    responses = []
+    received = []
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        cls = type(self)
+        with cls.lock:
+            cls.received.append((time.monotonic(), body))
+            status, headers = cls.responses.pop(0) if cls.responses else (204, {})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_url():
+    _Webhook.responses = []
+    _Webhook.received = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Webhook)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/webhook"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def dispatcher(webhook_url):
+    dispatcher = DiscordDispatcher(webhook_url, batch_window=0.05, digest_threshold=1000, max_retries=2)
+    yield dispatcher
+    dispatcher.close()
+
+
+def notification(title="제목", description="", image_path=None):
+    embed = {"title": title, "description": description, "url": "https://example.com/1", "fields": []}
+    return Notification(embed, image_path, Future())
+
+
+def post(index):
+    return {"title": f"글 {index}", "content": "본문"}
+
+
+def test_pack_limits_embeds_per_message(dispatcher):
+    messages = dispatcher._pack([notification() for _ in range(25)])
+    assert [len(message) for message in messages] == [10, 10, 5]
+
+
+def test_pack_limits_files_and_upload_bytes(dispatcher, tmp_path):
+    images = []
+    for index in range(12):
+        path = tmp_path / f"{index}.png"
+        path.write_bytes(b"x" * 60)
+        images.append(str(path))
+    assert [len(message) for message in dispatcher._pack([notification(image_path=path) for path in images])] == [10, 2]
+
+    dispatcher.max_upload_bytes = 100
+    # 같은 이미지를 쓰는 알림은 파일 하나로 셉니다.
+    batch = [notification(image_path=images[0]), notification(image_path=images[0]), notification(image_path=images[1])]
+    assert [len(message) for message in dispatcher._pack(batch)] == [2, 1]
+
+
+def test_pack_limits_total_embed_characters(dispatcher):
+    messages = dispatcher._pack([notification(description="가" * 2000) for _ in range(7)])
+    assert [len(message) for message in messages] == [2, 2, 2, 1]
+    for message in messages:
+        assert sum(embed_length(n.embed) for n in message) <= MAX_EMBED_TOTAL
+
+
+def test_digest_messages_respect_embed_and_character_limits(dispatcher):
+    batch = [notification(title="제" * 200) for _ in range(300)]
+    messages = dispatcher._digest_messages(batch)
+    included = [n for _, notifications in messages for n in notifications]
+    assert len(included) == len(batch) and {id(n) for n in included} == {id(n) for n in batch}
+    for embeds, _ in messages:
+        assert len(embeds) <= MAX_EMBEDS_PER_MESSAGE
+        assert sum(embed_length(embed) for embed in embeds) <= MAX_EMBED_TOTAL
+
+
+def test_batches_notifications_into_one_request(dispatcher):
+    futures = [dispatcher.submit(post(index), f"https://example.com/{index}", "공지사항") for index in range(3)]
+    assert [future.result(5) for future in futures] == [True, True, True]
+    assert len(_Webhook.received) == 1
+
+
+def test_waits_for_retry_after_on_429(dispatcher):
+    _Webhook.responses = [(429, {"Retry-After": "0.3"})]
+    future = dispatcher.submit(post(1), "https://example.com/1", "공지사항")
+    assert future.result(5) is True
+    (first, _), (second, _) = _Webhook.received
+    assert second - first >= 0.3
+    assert dispatcher.stats["rate_limited"] == 1
+
+
+def test_futures_resolve_false_on_rejected_request(dispatcher):
+    _Webhook.responses = [(400, {})]
+    future = dispatcher.submit(post(1), "https://example.com/1", "공지사항")
+    assert future.result(5) is False
+    assert dispatcher.stats["failed"] == 1
+
+
+def test_futures_resolve_false_when_retries_run_out(dispatcher):
+    _Webhook.responses = [(429, {"Retry-After": "0"}), (429, {"Retry-After": "0"})]
+    future = dispatcher.submit(post(1), "https://example.com/1", "공지사항")
+    assert future.result(5) is False
+
+
+def test_futures_resolve_false_when_dispatch_raises(dispatcher, tmp_path):
+    image = tmp_path / "gone.png"
+    image.write_bytes(b"png")
+    dispatcher.batch_window = 0.3
+    future = dispatcher.submit(post(1), "https://example.com/1", "공지사항", image_path=str(image))
+    # 묶는 동안 이미지가 지워지면 전송 준비에서 예외가 나도 Future는 실패로 끝나야 합니다.
+    image.unlink()
+    assert future.result(5) is False
+    assert dispatcher.flush(5)
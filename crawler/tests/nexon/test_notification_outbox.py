@@ -0,0 +1,102 @@
+import sqlite3
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from crawler.nexon_crawler.utils import notification_outbox
+from crawler.nexon_crawler.utils.notification_outbox import DEAD, PENDING, SENT, NotificationOutbox
+
+POST = {"id": "1", "title": "제목", "content": "본문"}
+
+
+class FakeDispatcher:
+    """submit()한 알림을 기록하고, delivered에 정한 결과를 바로 돌려줍니다."""
+
+    def __init__(self, delivered=True):
+        self.delivered = delivered
+        self.submitted = []
+
+    def submit(self, **payload):
+        self.submitted.append(payload)
+        future = Future()
+        future.set_result(self.delivered)
+        return future
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = NotificationOutbox(tmp_path / "outbox.db", max_attempts=3)
+    yield outbox
+    outbox.close()
+
+
+def next_attempt(outbox, key):
+    with sqlite3.connect(outbox.path) as conn:
+        return conn.execute("SELECT next_attempt FROM outbox WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_enqueue_is_idempotent(outbox):
+    assert outbox.enqueue("notice", "1", POST, "https://example.com/1", "공지사항") is True
+    assert outbox.enqueue("notice", "1", POST, "https://example.com/1", "공지사항") is False
+    # 다른 게시판의 같은 id는 다른 알림입니다.
+    assert outbox.enqueue("event", "1", POST, "https://example.com/1", "이벤트") is True
+    assert outbox.counts() == {PENDING: 2, SENT: 0, DEAD: 0}
+    assert outbox.known_ids("notice", ["1", "2"]) == {"1"}
+
+
+def test_drain_marks_sent_and_does_not_resend(outbox):
+    outbox.enqueue("notice", "1", POST, "https://example.com/1", "공지사항")
+    dispatcher = FakeDispatcher()
+    assert outbox.drain(dispatcher) == {SENT: 1, "retry": 0, DEAD: 0}
+    assert outbox.drain(dispatcher) == {SENT: 0, "retry": 0, DEAD: 0}
+    assert len(dispatcher.submitted) == 1
+    assert dispatcher.submitted[0]["post_url"] == "https://example.com/1"
+
+
+def test_backoff_schedule(outbox, monkeypatch):
+    monkeypatch.setattr(notification_outbox, "OUTBOX_BACKOFF_BASE", 10)
+    monkeypatch.setattr(notification_outbox, "OUTBOX_BACKOFF_MAX", 25)
+    outbox.max_attempts = 10
+    outbox.enqueue("notice", "1", POST, "https://example.com/1")
+    key = outbox.make_key("notice", "1")
+    delays = []
+    for _ in range(4):
+        before = time.time()
+        assert outbox.mark_failed(key, "boom") == PENDING
+        delays.append(round(next_attempt(outbox, key) - before))
+    # 10초부터 두 배씩 늘어나고 최대 25초에서 멈춥니다.
+    assert delays == [10, 20, 25, 25]
+
+
+def test_failed_drain_retries_later_then_goes_dead(outbox, monkeypatch):
+    monkeypatch.setattr(notification_outbox, "OUTBOX_BACKOFF_BASE", 0)
+    outbox.enqueue("notice", "1", POST, "https://example.com/1")
+    dispatcher = FakeDispatcher(delivered=False)
+    assert outbox.drain(dispatcher)["retry"] == 1
+    assert outbox.drain(dispatcher)["retry"] == 1
+    assert outbox.drain(dispatcher)[DEAD] == 1
+    assert outbox.counts() == {PENDING: 0, SENT: 0, DEAD: 1}
+    # dead 상태는 더 이상 꺼내지 않습니다.
+    assert outbox.drain(dispatcher) == {SENT: 0, "retry": 0, DEAD: 0}
+    assert len(dispatcher.submitted) == 3
+
+
+def test_retry_dead_requeues_with_fresh_attempts(outbox, monkeypatch):
+    monkeypatch.setattr(notification_outbox, "OUTBOX_BACKOFF_BASE", 0)
+    outbox.enqueue("notice", "1", POST, "https://example.com/1")
+    key = outbox.make_key("notice", "1")
+    for _ in range(3):
+        outbox.mark_failed(key, "boom")
+    assert outbox.counts()[DEAD] == 1
+
+    assert outbox.retry_dead() == 1
+    assert outbox.counts() == {PENDING: 1, SENT: 0, DEAD: 0}
+    assert outbox.drain(FakeDispatcher()) == {SENT: 1, "retry": 0, DEAD: 0}
+
+
+def test_claimed_entries_are_leased(outbox):
+    outbox.enqueue("notice", "1", POST, "https://example.com/1")
+    assert len(outbox.claim_due()) == 1
+    # 임대 시간 동안 다른 drain()이 같은 알림을 가져가지 않습니다.
+    assert outbox.claim_due() == []